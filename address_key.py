@@ -0,0 +1,84 @@
+import re
+from collections import namedtuple
+
+from b_column_parser import STREET_TYPES
+
+# Разобранный адрес столбца O: улица по справочнику STREET_TYPES, дом, корпус, квартира
+Address = namedtuple('Address', ['street', 'house', 'building', 'flat'])
+
+# Типы улиц, которые ставит extract_address перед названием ("ул. Бутлерова 11-2-45")
+STREET_TYPE_RE = re.compile(
+    r'^(?:' + '|'.join(map(re.escape, sorted(set(STREET_TYPES.values()), key=len, reverse=True))) + r')\s+'
+)
+
+# Номер дома в конце адреса: части через дефис, первая начинается с цифры ("11-2-45", "6Д-31")
+HOUSE_RE = re.compile(r'\s+(\d[\dА-Яа-яЁё/]*(?:-[\dА-Яа-яЁё/]+)*)$')
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _street_form(name):
+    """Название улицы для сравнения: без учета регистра, "ё" и лишних пробелов"""
+    return WHITESPACE_RE.sub(' ', name).strip().casefold().replace('ё', 'е')
+
+
+# Названия улиц справочника по форме для сравнения ("непокоренных" -> "Непокорённых")
+STREET_NAMES = {_street_form(name): name for name in STREET_TYPES}
+
+
+def parse_address(text):
+    """
+    Разбирает стандартизированный адрес столбца O ("ул. Бутлерова 11-2-45")
+
+    Номер дома разбирается по числу частей: "дом", "дом-квартира",
+    "дом-корпус-квартира"; в "дом-корпус-литера-квартира" литера остается в корпусе.
+    Двухчастный номер всегда считается домом и квартирой: extract_address
+    записывает "дом-корпус" без квартиры так же, как "дом-квартира"
+
+    Args:
+        text (str): Адрес (тип улицы необязателен)
+
+    Returns:
+        Address: Улица (название по справочнику или None, если улицы нет в справочнике),
+                 дом, корпус и квартира (None, если не указаны); None для пустого текста
+    """
+    if not text or not str(text).strip():
+        return None
+
+    text = WHITESPACE_RE.sub(' ', str(text)).strip()
+
+    house = building = flat = None
+    house_match = HOUSE_RE.search(text)
+    if house_match:
+        parts = house_match.group(1).upper().replace('Ё', 'Е').split('-')
+        house = parts[0]
+        if len(parts) == 2:
+            flat = parts[1]
+        elif len(parts) > 2:
+            building = '-'.join(parts[1:-1])
+            flat = parts[-1]
+        text = text[:house_match.start()]
+
+    street = STREET_NAMES.get(_street_form(STREET_TYPE_RE.sub('', text)))
+    return Address(street, house, building, flat)
+
+
+def address_key(text, address, street_id):
+    """
+    Канонический ключ адреса: "улица:дом:корпус:квартира" ("12:11:2:45", "12:30::85")
+
+    Одинаковые адреса в разном написании ("ул. Бутлерова 11-2-45", "бутлерова 11-2-45")
+    получают один ключ. Адрес с улицей не из справочника сравнивается по тексту
+    целиком: ключ - ":" и текст без учета регистра
+
+    Args:
+        text (str): Адрес столбца O
+        address (Address): Результат parse_address(text)
+        street_id (int): Идентификатор улицы в таблице streets (None - улицы нет в справочнике)
+
+    Returns:
+        str: Ключ адреса
+    """
+    if street_id is None:
+        return ':' + _street_form(str(text))
+    return ':'.join([str(street_id)] + [part or '' for part in address[1:]])
@@ -0,0 +1,455 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from b_column_parser import ImprovedAddressProcessor, process_column_b
+from database_manager import DatabaseManager
+from docx_to_excel_processor import DocxToExcelProcessor
+from pipeline_metrics import PipelineMetrics
+
+# Заголовок таблицы реестра (как в исходных документах)
+HEADER = [
+    "", "Поставлен на учет", "№\nл/д", "Ф.И.О. осужденного", "Дата рождения",
+    "Когда, каким судом осужден(а), \n статья УК РФ, срок наказания",
+    "Возложенные обязанности", "Окончание  ИС", "примечание"
+]
+
+MALE_SURNAMES = [
+    "Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов",
+    "Новиков", "Федоров", "Морозов", "Волков", "Алексеев", "Лебедев", "Семенов", "Егоров",
+    "Павлов", "Козлов", "Степанов", "Николаев", "Орлов", "Андреев", "Макаров", "Никитин"
+]
+MALE_NAMES = [
+    "Александр", "Дмитрий", "Максим", "Сергей", "Андрей", "Алексей", "Артем", "Илья",
+    "Кирилл", "Михаил", "Никита", "Матвей", "Роман", "Егор", "Арсений", "Иван", "Денис"
+]
+FEMALE_NAMES = [
+    "Анастасия", "Мария", "Анна", "Виктория", "Екатерина", "Наталья", "Марина", "Полина",
+    "Дарья", "Алина", "Ксения", "Елена", "Ольга", "Татьяна", "Юлия", "Александра"
+]
+FATHER_NAMES = [
+    "Александр", "Дмитрий", "Сергей", "Андрей", "Алексей", "Михаил", "Иван", "Владимир",
+    "Николай", "Виктор", "Петр", "Геннадий", "Борис", "Юрий", "Олег", "Игорь"
+]
+FOREIGN_SURNAMES = ["Мамедов", "Алиев", "Гасанов", "Гусейнов", "Рахимов", "Каримов", "Юсупов"]
+FOREIGN_NAMES = ["Эльчин", "Рашид", "Фарид", "Исабек", "Тимур", "Бахтияр", "Шахзод"]
+FOREIGN_FATHER_NAMES = ["Рашид", "Маратбек", "Ильхам", "Вагиф", "Таджи", "Акрам"]
+
+COURTS = [
+    "Калининским р/с г. СПб", "Московским р/с г.СПб", "Выборгским р/с СПб", "Невским р/с г. СПб",
+    "Приморским районным судом Санкт-Петербурга", "Красногвардейским р/с г. СПБ",
+    "Выборгским г/с г. ЛО", "Всеволожским р/с ЛО", "Мировым судьей судебного участка № 45 СПб",
+    "Калининским районным судом г. Санкт-Петербурга"
+]
+ARTICLES = ["158", "159", "161", "162", "228", "228.1", "264.1", "111", "112", "119", "318", "30 ч.3, 158"]
+SENTENCES = [
+    "к {years} г. л/св. условно с ИС {probation} год",
+    "к {years} г {months} мес. лишения свободы условно с испытательным сроком {probation} года",
+    "к {years} г. л/с, условно с ИС {probation} г.",
+    "к 240 ч. обязательных работ с лишением права управлять ТС {probation} г {months} мес.",
+    "к {months} месяцам лишения свободы  условно с испытательным сроком {probation} год",
+    "к 1 г. ограничения свободы"
+]
+DUTIES = [
+    "- не менять ПМЖ, регистрации",
+    "- не менять место работы",
+    "- являться на регистрацию в УИИ не реже 1 раза в мес. в установленные дни",
+    "- не уходить из дома с 22.00 до 06.00",
+    "- не выезжать за пределы г. СПб без уведомления УИИ",
+    "- 1 р. в месяц являться на регистрацию в указанный орган;",
+    "- пройти курс лечения от наркомании",
+    "- не менять м/ж без уведомления УИИ",
+    "- проживать по м/ж в период ИС;",
+    "Интернет",
+    "Выход из дома",
+    "раб",
+    "н/р"
+]
+NOTES = ["справка 3 кв. +", "справка 2 кв. +", "", "", "розыск", "ЗЗД"]
+OTHER_INFO = ["Гражданка Таджикистана", "Гражданство РФ", "Зарег и прож", "Н/С", "тел.", ""]
+
+
+class SyntheticRegisterGenerator:
+    """
+    Генератор синтетических реестров осужденных в формате DOCX
+    с содержимым столбцов, приближенным к реальным документам
+    """
+
+    def __init__(self, seed=42):
+        self.random = random.Random(seed)
+        self.streets = list(ImprovedAddressProcessor().street_types.items())
+
+    def _date(self, start_year, end_year):
+        """Случайная дата в интервале лет"""
+        start = date(start_year, 1, 1)
+        days = (date(end_year, 12, 31) - start).days
+        return start + timedelta(days=self.random.randint(0, days))
+
+    def _format_date(self, value):
+        """Дата в одном из встречающихся в реестрах форматов"""
+        variant = self.random.random()
+        if variant < 0.45:
+            return value.strftime("%d.%m.%Y")
+        if variant < 0.8:
+            return value.strftime("%d.%m.%y")
+        if variant < 0.88:
+            return value.strftime("%d%m.%y")
+        if variant < 0.94:
+            return value.strftime("%d. %m. %Y")
+        return value.strftime("%d/%m/%Y")
+
+    def full_name(self):
+        """ФИО, в том числе слитное, со скобками или с окончанием 'оглы/кызы'"""
+        rnd = self.random
+        variant = rnd.random()
+
+        if variant < 0.08:
+            surname = rnd.choice(FOREIGN_SURNAMES)
+            father = rnd.choice(FOREIGN_FATHER_NAMES)
+            if rnd.random() < 0.5:
+                return f"{surname} {rnd.choice(FOREIGN_NAMES)} {father} оглы"
+            return f"{surname}а {rnd.choice(FEMALE_NAMES)} {father} кызы"
+
+        female = rnd.random() < 0.3
+        surname = rnd.choice(MALE_SURNAMES)
+        father = rnd.choice(FATHER_NAMES)
+        if female:
+            surname += "а"
+            name = rnd.choice(FEMALE_NAMES)
+            patronymic = father + ("овна" if not father.endswith(("й", "ь")) else "евна")
+        else:
+            name = rnd.choice(MALE_NAMES)
+            patronymic = father + ("ович" if not father.endswith(("й", "ь")) else "евич")
+        patronymic = patronymic.replace("йе", "е").replace("ье", "е")
+
+        if variant < 0.12:
+            maiden = rnd.choice(MALE_SURNAMES) + ("а" if female else "")
+            return f"{surname} ({maiden}) {name} {patronymic}"
+        if variant < 0.3:
+            return f"{surname} {name}{patronymic}"
+        if variant < 0.35:
+            return f"{surname}{name}{patronymic}"
+        if variant < 0.45:
+            return f"{surname} {name}\n {patronymic}"
+        return f"{surname} {name} {patronymic}"
+
+    def address(self):
+        """Адрес в Санкт-Петербурге с улицей из словаря street_types"""
+        rnd = self.random
+        street, street_type = rnd.choice(self.streets)
+        house = rnd.randint(1, 150)
+        building = rnd.randint(1, 6)
+        flat = rnd.randint(1, 500)
+        letter = rnd.choice("АБВ")
+
+        house_variants = [
+            f"{house}-{building}-{flat}",
+            f"{house}-{flat}",
+            f"д. {house}, корп. {building}, кв. {flat}",
+            f"д. {house}{letter} кв. {flat}",
+            f"д. {house} к. {building} кв. {flat}",
+            f"{house}- {letter}-{flat}",
+            f"{house}-{letter.lower()}-{flat}",
+            f"{house} лит. {letter} кв. {flat}",
+            f"д. {house}/{building} кв. {flat}",
+            f"{house}"
+        ]
+        house_text = rnd.choice(house_variants)
+
+        city = rnd.choice(["СПб, ", "г. СПб, ", "СПБ, ", "г.СПб ", ""])
+        if rnd.random() < 0.15:
+            return f"{city}{street} {street_type} {house_text}"
+        return f"{city}{street_type} {street} {house_text}"
+
+    def phone(self):
+        """Телефон в одном из распространенных форматов (или пусто)"""
+        rnd = self.random
+        digits = "9" + "".join(str(rnd.randint(0, 9)) for _ in range(9))
+        variant = rnd.random()
+        if variant < 0.3:
+            return ""
+        if variant < 0.55:
+            return f"8-{digits[:3]}-{digits[3:6]}-{digits[6:8]}-{digits[8:]}"
+        if variant < 0.7:
+            return f"+7 ({digits[:3]}) {digits[3:6]}-{digits[6:8]}-{digits[8:]}"
+        if variant < 0.85:
+            return f"8{digits}"
+        return f"тел. 8 {digits[:3]} {digits[3:6]} {digits[6:8]} {digits[8:]}"
+
+    def person_cell(self):
+        """Ячейка с ФИО, адресом, телефоном и прочей информацией"""
+        parts = [self.full_name(), self.address()]
+        phone = self.phone()
+        if phone:
+            parts.append(phone)
+        other = self.random.choice(OTHER_INFO)
+        if other:
+            parts.append(other)
+        return "\n".join(parts)
+
+    def court_cell(self, decision_date):
+        """Ячейка с информацией о приговоре"""
+        rnd = self.random
+        sentence = rnd.choice(SENTENCES).format(
+            years=rnd.randint(1, 6), months=rnd.randint(1, 11), probation=rnd.randint(1, 4)
+        )
+        separator = rnd.choice([" ", " ", "", "  "])
+        return (f"{self._format_date(decision_date)}{separator}{rnd.choice(COURTS)} "
+                f"по ст. {rnd.choice(ARTICLES)} ч.{rnd.randint(1, 4)} УК РФ {sentence}")
+
+    def duties_cell(self):
+        """Ячейка со списком возложенных обязанностей"""
+        count = self.random.randint(1, 4)
+        return "\n".join(self.random.sample(DUTIES, count))
+
+    def end_date_cell(self, end_date):
+        """Ячейка с датой окончания испытательного срока"""
+        variant = self.random.random()
+        text = self._format_date(end_date)
+        if variant < 0.2:
+            return "\n" + text
+        if variant < 0.3:
+            extended = end_date + timedelta(days=30)
+            return f"{text} {self._format_date(extended)}"
+        if variant < 0.38:
+            return f"{text} продлен ИС на 1 мес."
+        if variant < 0.42:
+            return "снят с учета"
+        return text
+
+    def row(self, index):
+        """Одна строка реестра (9 столбцов)"""
+        rnd = self.random
+        decision_date = self._date(2019, 2025)
+        start_date = decision_date + timedelta(days=rnd.randint(10, 90))
+        end_date = decision_date + timedelta(days=365 * rnd.randint(1, 4))
+        court = self.court_cell(decision_date)
+        duties = self.duties_cell()
+
+        # Иногда столбцы приговора и обязанностей перепутаны местами
+        if rnd.random() < 0.05:
+            court, duties = duties, court
+
+        return [
+            f"{index}." if rnd.random() < 0.5 else "",
+            self._format_date(start_date),
+            f"{rnd.randint(1, 400)}/{start_date:%y}",
+            self.person_cell(),
+            self._format_date(self._date(1960, 2006)),
+            court,
+            duties,
+            self.end_date_cell(end_date),
+            rnd.choice(NOTES)
+        ]
+
+    def generate_rows(self, rows):
+        """Генерирует заданное количество строк реестра"""
+        return [self.row(index + 1) for index in range(rows)]
+
+    def generate_docx(self, docx_path, rows, rows_per_table=1000):
+        """
+        Создает DOCX-файл с реестром заданного размера
+
+        Args:
+            docx_path (str): Путь для сохранения
+            rows (int): Количество строк реестра
+            rows_per_table (int): Количество строк в одной таблице документа
+
+        Returns:
+            int: Количество созданных таблиц
+        """
+        document = Document()
+        table_count = 0
+
+        for offset in range(0, rows, rows_per_table):
+            table_rows = [HEADER] + [self.row(offset + index + 1)
+                                     for index in range(min(rows_per_table, rows - offset))]
+            table = document.add_table(rows=0, cols=len(HEADER))
+            # Строки добавляются напрямую в XML: python-docx слишком медленный для 100k+ строк
+            for values in table_rows:
+                table._tbl.append(_table_row_xml(values))
+            table_count += 1
+            document.add_paragraph()
+
+        document.save(docx_path)
+        return table_count
+
+
+def _table_row_xml(values):
+    """Формирует XML строки таблицы, каждая строка текста ячейки - отдельный абзац"""
+    cells = []
+    for value in values:
+        paragraphs = "".join(
+            f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+            for line in value.split("\n")
+        )
+        cells.append(f"<w:tc>{paragraphs}</w:tc>")
+    return parse_xml(f"<w:tr {nsdecls('w')}>{''.join(cells)}</w:tr>")
+
+
+def _git_revision():
+    """Текущая ревизия git (если доступна)"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(rows, seed=42, rows_per_table=1000, work_dir=None):
+    """
+    Прогоняет полный конвейер обработки на синтетическом реестре
+
+    Args:
+        rows (int): Количество строк реестра
+        seed (int): Зерно генератора (для воспроизводимости)
+        rows_per_table (int): Количество строк в одной таблице документа
+        work_dir (str): Каталог для файлов (по умолчанию временный)
+
+    Returns:
+        dict: Результат замера (время каждого этапа и детализация форматтеров)
+    """
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = stack.enter_context(tempfile.TemporaryDirectory())
+
+        docx_path = os.path.join(work_dir, f"register_{rows}.docx")
+        excel_path = os.path.join(work_dir, f"register_{rows}.xlsx")
+        db_path = os.path.join(work_dir, f"register_{rows}.db")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+        phases = {}
+        processor = DocxToExcelProcessor()
+
+        start = time.perf_counter()
+        SyntheticRegisterGenerator(seed).generate_docx(docx_path, rows, rows_per_table)
+        phases['generate'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tables, rows_deleted = processor.project_tables(processor.extract_tables(docx_path))
+        phases['docx_read'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        processor.save_tables(tables, excel_path)
+        phases['xlsx_write'] = time.perf_counter() - start
+
+        metrics = PipelineMetrics()
+        start = time.perf_counter()
+        processor.process_excel_file(excel_path, metrics, rows_deleted=rows_deleted)
+        phases['formatters'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_column_b(excel_path)
+        phases['address_parsing'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        imported = DatabaseManager(db_path).import_from_excel(excel_path)
+        phases['db_import'] = time.perf_counter() - start
+
+    pipeline_time = sum(value for name, value in phases.items() if name != 'generate')
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'rows': rows,
+        'seed': seed,
+        'rows_per_table': rows_per_table,
+        'imported': imported,
+        'phases': phases,
+        'pipeline_time': pipeline_time,
+        'rows_per_sec': rows / pipeline_time if pipeline_time > 0 else None,
+        'formatter_stages': {
+            name: summary['wall_time'] for name, summary in metrics.report()['stages'].items()
+        }
+    }
+
+
+def load_results(results_path):
+    """Загружает сохраненные результаты замеров"""
+    if not os.path.exists(results_path):
+        return []
+
+    with open(results_path, encoding='utf-8') as results_file:
+        return [json.loads(line) for line in results_file if line.strip()]
+
+
+def save_result(results_path, result):
+    """Дописывает результат замера в файл (JSON Lines)"""
+    with open(results_path, 'a', encoding='utf-8') as results_file:
+        results_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def format_comparison(result, previous, threshold=0.2):
+    """
+    Сравнивает результат с предыдущим замером того же размера
+
+    Args:
+        result (dict): Текущий результат
+        previous (dict): Предыдущий результат (или None)
+        threshold (float): Относительное замедление, считающееся регрессией
+
+    Returns:
+        str: Текстовый отчет
+    """
+    lines = [f"Строк: {result['rows']}, ревизия: {result['revision']}, "
+             f"скорость: {result['rows_per_sec']:.0f} строк/с"]
+
+    for name, value in result['phases'].items():
+        line = f"  {name:<16} {value:8.3f} с"
+        if previous and previous['phases'].get(name):
+            old_value = previous['phases'][name]
+            change = (value - old_value) / old_value
+            line += f"  (было {old_value:.3f} с, {change:+.0%})"
+            if change > threshold and name != 'generate':
+                line += "  <-- РЕГРЕССИЯ"
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер производительности конвейера на синтетических реестрах")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000],
+                        help="размеры реестров (например, 1000 10000 200000)")
+    parser.add_argument("--seed", type=int, default=42, help="зерно генератора")
+    parser.add_argument("--rows-per-table", type=int, default=1000, help="строк в одной таблице DOCX")
+    parser.add_argument("--results", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                          "benchmark_results.jsonl"),
+                        help="файл для накопления результатов (JSON Lines)")
+    parser.add_argument("--keep-files", metavar="DIR", help="сохранить сгенерированные файлы в каталоге")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="допустимое замедление относительно прошлого замера (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    history = load_results(args.results)
+
+    for rows in args.rows:
+        result = run_benchmark(rows, args.seed, args.rows_per_table, args.keep_files)
+        previous = next((item for item in reversed(history)
+                         if item['rows'] == rows and item['seed'] == args.seed), None)
+        print(format_comparison(result, previous, args.threshold))
+        save_result(args.results, result)
+        history.append(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,108 @@
 import re
+from collections import namedtuple
+from functools import lru_cache
+
+from rule_gates import apply_rule_groups, rule_group
+
+# Слово столбца B, классифицированное один раз:
+#   text - слово как в тексте, bare - без знаков препинания после букв;
+#   address_marker - начало адреса (дальше слитные имена не разделяются);
+#   stop_word - конец ФИО при переносе в столбец N;
+#   foreign_suffix - частица иностранного отчества ("оглы", "кызы");
+#   patronymic - окончание отчества ("-вич", "-вна")
+# Фамилия и имя определяются позицией слова среди слов ФИО
+NameToken = namedtuple('NameToken', ['text', 'bare', 'address_marker', 'stop_word', 'foreign_suffix', 'patronymic'])
+
+# Признаки начала адреса, после которых слитные имена не разделяются
+ADDRESS_MARKERS = frozenset(['СПб', 'г.', 'г.СПб', 'г. СПб', 'пр.', 'ул.', 'д.', 'р-н', 'обл.', 'респ.'])
+
+# Стоп-слова, которые указывают на конец имени (сравниваются со словом без знаков препинания)
+NAME_STOP_WORDS = ADDRESS_MARKERS | frozenset(['Гражданский', 'кв.', 'лит.'])
+
+# Слова после отчества, при которых оно переносится в столбец N
+PATRONYMIC_STOP_WORDS = frozenset(['СПб', 'г.', 'г.СПб', 'г. СПб', 'пр.', 'ул.', 'д.'])
+
+# Специальные окончания для иностранных имен
+FOREIGN_NAME_SUFFIXES = ('Оглы', 'Кизи', 'Кызы', 'оглы', 'кизи', 'кызы', 'угли', 'Угли')
+
+# Типичные окончания отчеств по длине окончания
+PATRONYMIC_ENDINGS = {
+    2: frozenset(['ич']),
+    3: frozenset(['вич', 'вна']),
+    4: frozenset(['ична', 'овна', 'евна', 'ович', 'евич']),
+}
+
+# Заглавная буква внутри слова - признак слитного написания ("ИвановИван")
+INNER_CAPITAL_RE = re.compile(r'[А-ЯЁA-Z]')
+
+# Знаки препинания после букв не учитываются при сравнении слов
+TRAILING_PUNCTUATION_RE = re.compile(r'([а-яА-ЯёЁa-zA-Z])[,;:.!?]+')
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Варианты написания СПб (после схлопывания пробелов); группа пропускается без признака в тексте
+SPB_RULE_GROUPS = (
+    # "С П Б" -> "г. СПб"
+    rule_group(('С П Б',), [(r'С\s+П\s+Б', 'г. СПб')]),
+    # "г. Санкт-Петербург" -> "г. СПб"
+    rule_group(('Санкт-Петербург',), [
+        (r'г\.\s*Санкт-Петербург', 'г. СПб'),
+        (r'Санкт-Петербург', 'г. СПб'),
+    ]),
+)
+
+
+@lru_cache(maxsize=8192)
+def _classify_word(word):
+    """Классифицирует слово (результат кэшируется: ФИО и адреса повторяются)"""
+    bare = TRAILING_PUNCTUATION_RE.sub(r'\1', word)
+    lower = word.lower()
+    patronymic = any(
+        len(word) > length + 1 and lower[-length:] in endings
+        for length, endings in PATRONYMIC_ENDINGS.items()
+    )
+    return NameToken(
+        text=word,
+        bare=bare,
+        address_marker=word in ADDRESS_MARKERS,
+        stop_word=bare in NAME_STOP_WORDS,
+        foreign_suffix=bare.endswith(FOREIGN_NAME_SUFFIXES),
+        patronymic=patronymic
+    )
+
+
+def _split_word(word):
+    """Разделяет слитное слово по заглавным буквам: "ИвановИван" -> ("Иванов", "Иван")"""
+    if len(word) > 1 and INNER_CAPITAL_RE.search(word, 1) and "СПб" not in word:
+        capitals = [0] + [index for index in range(1, len(word)) if word[index].isupper()]
+        return [word[start:end] for start, end in zip(capitals, capitals[1:] + [len(word)])]
+    return [word]
+
+
+def tokenize_name(text, split_joined=True):
+    """
+    Разбивает текст столбца B на слова и классифицирует каждое один раз
+
+    Args:
+        text (str): Текст ячейки
+        split_joined (bool): Разделять слитные имена до начала адреса
+
+    Returns:
+        list: Слова (NameToken) в порядке следования
+    """
+    tokens = []
+    for word in text.split():
+        if split_joined and word in ADDRESS_MARKERS:
+            split_joined = False
+        for part in (_split_word(word) if split_joined else (word,)):
+            tokens.append(_classify_word(part))
+    return tokens
+
+
+def _find_word(text, word):
+    """Позиция первого вхождения слова в начале текста или после пробела"""
+    return re.search(r'(?:^|\s)' + re.escape(word), text)
+
 
 class ColumnBFormatter:
     """
@@ -20,7 +124,8 @@ class ColumnBFormatter:
             'cells_processed': 0,
             'names_split': 0,
             'names_moved': 0,
-            'names_formatted': 0  # Для совместимости
+            'names_formatted': 0,  # Для совместимости
+            'rules_skipped': 0
         }
         
         # Определяем, с какой строки начать (обязательно с 1, чтобы обработать первую строку)
@@ -38,8 +143,10 @@ class ColumnBFormatter:
                         stats['names_moved'] += 1
                         continue
                 
-                # Разделяем слитные имена (например, "ЖумановИсабекМаратбекович")
-                formatted_text = self._split_joined_names(original_text)
+                # Разделяем слитные имена (например, "ЖумановИсабекМаратбекович");
+                # те же слова используются при переносе имени
+                tokens = tokenize_name(original_text)
+                formatted_text = ' '.join(token.text for token in tokens)
                 
                 if formatted_text != original_text:
                     cell.value = formatted_text
@@ -48,12 +155,12 @@ class ColumnBFormatter:
                     stats['names_formatted'] += 1
                 
                 # Перенос имени в столбец N
-                if self._move_name_to_column_n(sheet, row, cell.value):
+                if self._move_name_to_column_n(sheet, row, cell.value, tokens):
                     stats['names_moved'] += 1
                 
                 # Нормализация форматирования СПб
                 if cell.value:
-                    cell.value = self._normalize_spb_formatting(str(cell.value))
+                    cell.value = self._normalize_spb_formatting(str(cell.value), stats)
                     
                 # Удаление "г. СПб" из текста (включая первую строку)
                 if cell.value:
@@ -72,62 +179,22 @@ class ColumnBFormatter:
             str: Текст с разделенными именами
         """
         # Удаляем лишние пробелы
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_RE.sub(' ', text).strip()
         
         # Пропускаем пустой текст
         if not text:
             return text
-            
-        # Разбиваем текст на слова
+        
+        # Слова до первого признака адреса разделяются по заглавным буквам (кроме содержащих СПб);
+        # классификация слов (tokenize_name) здесь не нужна
         words = text.split()
         result_words = []
-        
-        # Стоп-слова, после которых прекращаем обработку
-        stop_words = ['СПб', 'г.', 'г.СПб', 'г. СПб', 'пр.', 'ул.', 'д.', 'р-н', 'обл.', 'респ.']
-        
-        # Слова, которые не нужно разделять
-        preserve_words = ['СПб']
-        
-        # Обрабатываем слова до встречи со стоп-словом
-        for i, word in enumerate(words):
-            # Если встретили стоп-слово, добавляем его и все последующие слова без изменений
-            if word in stop_words:
-                result_words.append(word)
-                # Добавляем все оставшиеся слова без обработки
-                result_words.extend(words[i+1:])
+        for index, word in enumerate(words):
+            if word in ADDRESS_MARKERS:
+                result_words.extend(words[index:])
                 break
-                
-            # Сохраняем слова из списка preserve_words без изменений
-            if word in preserve_words:
-                result_words.append(word)
-                continue
-                
-            # Проверяем, есть ли внутри слова заглавные буквы (не в начале)
-            if len(word) > 1 and re.search(r'[А-ЯЁA-Z]', word[1:]):
-                # Если слово содержит "СПб", добавляем его как есть
-                if "СПб" in word:
-                    result_words.append(word)
-                    continue
-                    
-                # Находим все позиции заглавных букв
-                capitals = [0] + [i for i in range(1, len(word)) if word[i].isupper()]
-                
-                # Если нашли заглавные буквы внутри слова
-                if len(capitals) > 1:
-                    # Разделяем слово по позициям заглавных букв
-                    split_words = []
-                    for j in range(len(capitals)):
-                        start = capitals[j]
-                        end = capitals[j+1] if j+1 < len(capitals) else len(word)
-                        split_words.append(word[start:end])
-                    
-                    # Добавляем разделенные слова
-                    result_words.extend(split_words)
-                    continue
-            
-            # Если слово не нужно разделять, добавляем как есть
-            result_words.append(word)
-            
+            result_words.extend(_split_word(word))
+        
         return ' '.join(result_words)
     
     def _check_for_patronymic(self, sheet, row):
@@ -144,46 +211,27 @@ class ColumnBFormatter:
         if not cell_b.value:
             return
             
-        text = str(cell_b.value).strip()
-        words = text.split()
+        tokens = tokenize_name(str(cell_b.value), split_joined=False)
         
-        if not words:
+        if not tokens:
             return
-            
-        # Проверяем первое слово на признаки отчества
-        first_word = words[0]
-        
-        # Типичные окончания отчеств
-        patronymic_endings = ['вич', 'вна', 'ич', 'ична', 'ична', 'овна', 'евна', 'ович', 'евич']
-        
-        is_patronymic = False
         
-        # Проверяем, содержит ли первое слово типичные окончания отчеств
-        for ending in patronymic_endings:
-            if first_word.lower().endswith(ending) and len(first_word) > len(ending) + 1:
-                is_patronymic = True
-                break
-                
-        # Если первое слово - отчество
-        if is_patronymic:
-            # Проверяем, не является ли следующее слово "СПб" или "г."
-            stop_words = ['СПб', 'г.', 'г.СПб', 'г. СПб', 'пр.', 'ул.', 'д.']
+        # Если первое слово - отчество, а за ним идет начало адреса,
+        # переносим только отчество в столбец N
+        if tokens[0].patronymic and len(tokens) > 1 and tokens[1].text in PATRONYMIC_STOP_WORDS:
+            patronymic = tokens[0].text
             
-            if len(words) > 1 and any(words[1] == stop_word for stop_word in stop_words):
-                # Переносим только отчество в столбец N
-                patronymic = first_word
-                
-                # Добавляем отчество в столбец N
-                if cell_n.value:
-                    cell_n.value = str(cell_n.value) + ' ' + patronymic
-                else:
-                    cell_n.value = patronymic
-                
-                # Удаляем отчество из столбца B
-                remaining_text = ' '.join(words[1:]).strip()
-                cell_b.value = remaining_text if remaining_text else None
+            # Добавляем отчество в столбец N
+            if cell_n.value:
+                cell_n.value = str(cell_n.value) + ' ' + patronymic
+            else:
+                cell_n.value = patronymic
+            
+            # Удаляем отчество из столбца B
+            remaining_text = ' '.join(token.text for token in tokens[1:]).strip()
+            cell_b.value = remaining_text if remaining_text else None
     
-    def _move_name_to_column_n(self, sheet, row, name_text):
+    def _move_name_to_column_n(self, sheet, row, name_text, tokens=None):
         """
         Переносит имя в столбец N и удаляет только имя из B, оставляя остальной текст
         
@@ -191,6 +239,7 @@ class ColumnBFormatter:
             sheet: Лист Excel
             row (int): Номер строки
             name_text (str): Текст имени
+            tokens (list): Слова текста (tokenize_name); если не переданы, текст разбивается здесь
             
         Returns:
             bool: True если имя было перенесено, False в противном случае
@@ -203,64 +252,36 @@ class ColumnBFormatter:
         if not name_text:
             return False
             
-        name_text = str(name_text).strip()
-        
-        # Удаляем запятые и другие знаки препинания из текста для корректного разделения на слова
         # Сохраняем оригинальный текст для последующего удаления из столбца B
-        original_text = name_text
-        processed_text = re.sub(r'([а-яА-ЯёЁa-zA-Z])[,;:.!?]+', r'\1', name_text)
+        original_text = str(name_text).strip()
         
-        # Разбиваем текст на слова
-        words = processed_text.split()
+        # Слова сравниваются без знаков препинания (поле bare)
+        if tokens is None:
+            tokens = tokenize_name(original_text, split_joined=False)
         
         # Если текст пустой после разбиения, выходим
-        if not words:
+        if not tokens:
             return False
         
-        # Стоп-слова, которые указывают на конец имени
-        stop_words = ['СПб', 'г.', 'г.СПб', 'г. СПб', 'пр.', 'ул.', 'д.', 'р-н', 'обл.', 'респ.', 'Гражданский', 'кв.', 'лит.']
-        
         # Проверяем, начинается ли текст со стоп-слова
-        if words[0] in stop_words:
+        if tokens[0].stop_word:
             return False
         
-        # Специальные окончания для иностранных имен
-        foreign_name_endings = ['Оглы', 'Кизи', 'Кызы', 'оглы', 'кизи', 'кызы', 'угли', 'Угли']
-        
         # Определяем максимальное количество слов для проверки
-        # По умолчанию - 3 слова (фамилия, имя, отчество)
-        max_words = min(len(words), 3)
-        
-        # Проверка на наличие специального окончания
-        has_foreign_ending = False
-        
-        # Проверяем все слова на наличие иностранных окончаний
-        for i, word in enumerate(words):
-            if i >= len(words):
-                break
-                
-            # Проверяем, является ли слово иностранным окончанием или содержит его
-            for ending in foreign_name_endings:
-                if word == ending or word.endswith(ending):
-                    has_foreign_ending = True
-                    # Если окончание находится в 4-м слове, увеличиваем max_words до 4
-                    if i == 3:
-                        max_words = 4
-                    # Если окончание находится в 5-м слове, увеличиваем max_words до 5
-                    elif i == 4:
-                        max_words = 5
-                    break
-                    
-            if has_foreign_ending:
-                break
+        # По умолчанию - 3 слова (фамилия, имя, отчество); если первое иностранное
+        # окончание находится в 4-м или 5-м слове - до него включительно
+        max_words = min(len(tokens), 3)
+        foreign_index = next((index for index, token in enumerate(tokens) if token.foreign_suffix), None)
+        if foreign_index in (3, 4):
+            max_words = foreign_index + 1
         
         # Берем слова до первого стоп-слова, но не более max_words
         name_parts = []
-        for i in range(min(max_words, len(words))):
+        for token in tokens[:max_words]:
             # Если встретили стоп-слово, останавливаемся
-            if words[i] in stop_words:
+            if token.stop_word:
                 break
-            name_parts.append(words[i])
+            name_parts.append(token.bare)
         
         # Если не нашли имени, выходим
         if not name_parts:
@@ -283,30 +304,24 @@ class ColumnBFormatter:
         
         # Удаляем имя из столбца B и оставляем остальной текст
         # Ищем первое стоп-слово после имени
-        for i, word in enumerate(words):
-            if i >= len(name_parts):
-                if word in stop_words:
-                    # Находим это стоп-слово в оригинальном тексте
-                    pattern = r'(?:^|\s)' + re.escape(word)
-                    match = re.search(pattern, remaining_text)
-                    if match:
-                        # Оставляем текст начиная с этого стоп-слова
-                        remaining_text = remaining_text[match.start():].strip()
-                        break
+        for token in tokens[len(name_parts):]:
+            if token.stop_word:
+                # Находим это стоп-слово в оригинальном тексте
+                match = _find_word(remaining_text, token.bare)
+                if match:
+                    # Оставляем текст начиная с этого стоп-слова
+                    remaining_text = remaining_text[match.start():].strip()
+                    break
         
         # Если не нашли стоп-слов, удаляем имя другим способом
         if remaining_text == original_text:
-            # Определяем, сколько слов мы взяли для имени
-            name_word_count = len(name_parts)
-            
             # Собираем оставшиеся слова
-            remaining_words = words[name_word_count:]
+            remaining_words = [token.bare for token in tokens[len(name_parts):]]
             
             # Преобразуем обратно в текст
             if remaining_words:
                 # Ищем первое оставшееся слово в оригинальном тексте
-                pattern = r'(?:^|\s)' + re.escape(remaining_words[0])
-                match = re.search(pattern, remaining_text)
+                match = _find_word(remaining_text, remaining_words[0])
                 if match:
                     # Оставляем текст начиная с первого оставшегося слова
                     remaining_text = remaining_text[match.start():].strip()
@@ -321,12 +336,13 @@ class ColumnBFormatter:
         
         return True
     
-    def _normalize_spb_formatting(self, text):
+    def _normalize_spb_formatting(self, text, stats=None):
         """
         Нормализует различные варианты написания СПб
         
         Args:
             text (str): Исходный текст
+            stats (dict): Статистика (счетчик пропущенных правил rules_skipped)
             
         Returns:
             str: Текст с нормализованным форматированием СПб
@@ -338,11 +354,8 @@ class ColumnBFormatter:
         text = re.sub(r'\s+', ' ', text).strip()
         
         # 1. "С П Б" -> "г. СПб"
-        text = re.sub(r'С\s+П\s+Б', 'г. СПб', text)
-        
         # 2. "г. Санкт-Петербург" -> "г. СПб"
-        text = re.sub(r'г\.\s*Санкт-Петербург', 'г. СПб', text)
-        text = re.sub(r'Санкт-Петербург', 'г. СПб', text)
+        text = apply_rule_groups(text, SPB_RULE_GROUPS, stats)
         
         # 3. "СПб" (без префикса "г.") -> "г. СПб"
         # Проверяем, что перед "СПб" нет "г."
@@ -373,60 +386,35 @@ class ColumnBFormatter:
         original_text = text
         
         # Удаляем лишние пробелы
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_RE.sub(' ', text).strip()
         
         # Добавляем пробел после закрывающей скобки, если за ней сразу идет буква
         # Например: "(Науменко)Наталья" -> "(Науменко) Наталья"
         text = re.sub(r'\)([а-яА-ЯёЁa-zA-Z])', r') \1', text)
         
-        # Убираем запятые и другие знаки препинания для корректного разделения на слова
-        processed_text = re.sub(r'([а-яА-ЯёЁa-zA-Z])[,;:.!?]+', r'\1', text)
-        
-        # Стоп-слова, которые указывают на конец имени
-        stop_words = ['СПб', 'г.', 'г.СПб', 'г. СПб', 'пр.', 'ул.', 'д.', 'р-н', 'обл.', 'респ.', 'Гражданский', 'кв.', 'лит.']
-        
-        # Разбиваем текст на слова
-        words = processed_text.split()
+        # Слитные имена здесь не разделяются; слова сравниваются без знаков препинания
+        tokens = tokenize_name(text, split_joined=False)
         
         # Проверяем, начинается ли текст со стоп-слова
-        if not words or words[0] in stop_words:
+        if not tokens or tokens[0].stop_word:
             return False
         
-        # Специальные окончания для иностранных имен
-        foreign_name_endings = ['Оглы', 'Кизи', 'Кызы', 'оглы', 'кизи', 'кызы', 'угли', 'Угли']
-        
-        # Проверяем наличие иностранных окончаний
-        has_foreign_ending = False
-        for i, word in enumerate(words):
-            if i >= len(words) or i > 4:  # Проверяем только первые 5 слов
-                break
-                
-            for ending in foreign_name_endings:
-                if word == ending or word.endswith(ending):
-                    has_foreign_ending = True
-                    if i == 4:  # Если окончание в 5-м слове
-                        words = words[:5] + words[5:]
-                    break
-            
-            if has_foreign_ending:
-                break
+        # Проверяем наличие иностранных окончаний (только в первых 5 словах)
+        has_foreign_ending = any(token.foreign_suffix for token in tokens[:5])
         
         # Находим, где заканчивается ФИО и начинается адрес
-        name_end_idx = -1
-        for i, word in enumerate(words):
-            if word in stop_words:
-                name_end_idx = i
-                break
+        name_end_idx = next((index for index, token in enumerate(tokens) if token.stop_word), -1)
         
         # Если не нашли стоп-слов, берем максимум 4 слова для имени
         # Или 5 слов, если 4-е или 5-е слово - иностранное окончание
         if name_end_idx == -1:
-            if has_foreign_ending and len(words) >= 5:
+            if has_foreign_ending and len(tokens) >= 5:
                 name_end_idx = 5
             else:
-                name_end_idx = min(4, len(words))
+                name_end_idx = min(4, len(tokens))
         
         # Берем слова для имени
+        words = [token.bare for token in tokens]
         name_parts = words[:name_end_idx]
         remaining_words = words[name_end_idx:]
         
@@ -455,8 +443,7 @@ class ColumnBFormatter:
         # Если есть оставшиеся слова, находим первое в оригинальном тексте
         if remaining_words:
             # Ищем первое оставшееся слово в оригинальном тексте
-            pattern = r'(?:^|\s)' + re.escape(remaining_words[0])
-            match = re.search(pattern, remaining_text)
+            match = _find_word(remaining_text, remaining_words[0])
             if match:
                 # Оставляем текст начиная с первого оставшегося слова
                 remaining_text = remaining_text[match.start():].strip()
@@ -1,5 +1,115 @@
 import re
 from datetime import datetime
+from rule_gates import PART_DIGITS, apply_rule_groups, rule_group
+
+# Группы правил замены с признаками: группа пропускается, если в тексте нет ни одного признака.
+# Правила проверяются после схлопывания пробелов, поэтому \s в тексте - только пробел
+
+# Пробелы в датах ("30. 01. 2025" -> "30.01.2025")
+SPACED_DATE_RULE_GROUPS = (
+    rule_group(('. ',), [(r'(\d+)\.\s+(\d+)\.\s+(\d+)', r'\1.\2.\3')], chars='0123456789'),
+)
+
+# Написание "г. СПб" и "ЛО"
+SPB_RULE_GROUPS = (
+    # "СПБ" -> "СПб"
+    rule_group(('СПБ',), [(r'СПБ', 'СПб')]),
+    # "Санкт-Петербург" и "Санкт-Петербурга" -> "СПб"
+    rule_group(('Санкт-Петербург',), [
+        (r'Санкт-Петербурга', 'СПб'),
+        (r'Санкт-Петербург', 'СПб'),
+    ]),
+    # "Ленинградская область" и "Ленинградской области" -> "ЛО"
+    rule_group(('Ленинградск',), [
+        (r'Ленинградской\s+области', 'ЛО'),
+        (r'Ленинградская\s+область', 'ЛО'),
+    ]),
+    # Различные варианты написания "г. СПб"
+    rule_group(('СПб',), [
+        (r'р/с\s*г\.\s*СПб', 'р/с г. СПб'),  # р/с г.СПб -> р/с г. СПб
+        (r'р/с\s*г\s*СПб', 'р/с г. СПб'),  # р/с гСПб -> р/с г. СПб
+        (r'г\.\s*СПб', 'г. СПб'),  # г.СПб -> г. СПб
+        (r'г\s*СПб', 'г. СПб'),  # гСПб -> г. СПб
+        (r'(?<!г\.\s)СПб', 'г. СПб'),  # СПб -> г. СПб (если перед ним нет "г.")
+        # Добавляем пробел перед "г. СПб", если его нет
+        (r'([^\s])г\.\s*СПб', r'\1 г. СПб'),
+    ]),
+)
+
+# Специальные термины (р/с, УК РФ)
+SPECIAL_TERM_RULE_GROUPS = (
+    rule_group(('р/с',), [
+        (r'([^\s])р/с', r'\1 р/с'),  # Добавляем пробел перед р/с
+        (r'р/с([^\s])', r'р/с \1'),  # Добавляем пробел после р/с
+        (r'([^\s])р/с', r'\1 р/с'),
+        (r'р/с([^\s])', r'р/с \1'),
+    ]),
+    rule_group(('УК',), [
+        (r'([^\s])УК\s*РФ', r'\1 УК РФ'),  # Добавляем пробел перед УК РФ
+        (r'УК\s*РФ([^\s])', r'УК РФ \1'),  # Добавляем пробел после УК РФ
+        (r'УК\s+РФ', r'УК РФ'),  # Нормализуем пробел между УК и РФ
+    ]),
+)
+
+# Дополнительные правила форматирования
+ADDITIONAL_RULE_GROUPS = (
+    # Нормализация "ст."
+    rule_group(('ст',), [
+        (r'ст:', 'ст.'),
+        (r'ст\s', 'ст. '),
+    ]),
+    # Добавление пробела перед "ч."
+    rule_group(('ч.',), [(r'([^\s])ч\.', r'\1 ч.')]),
+    # Нормализация "№"
+    rule_group(('№',), [
+        (r'([^\s])№', r'\1 №'),
+        (r'№([^\s])', r'№ \1'),
+    ]),
+    # Двойные запятые
+    rule_group((',',), [(r',\s*,', ',')]),
+    # Нормализация "год/года"
+    rule_group(('Год',), [
+        (r'Года', 'года'),
+        (r'Год', 'год'),
+    ]),
+    # Части статей "ч. 1" - "ч. 6": нужны "ч" и цифра части
+    rule_group(('ч',), [
+        # Нормализация написания частей статей без точки
+        (r'ч([1-6])', r'ч. \1'),
+        # Нормализация написания частей статей с пробелом без точки
+        (r'ч\s+([1-6])', r'ч. \1'),
+        # Добавление пробелов до и после "ч. N"
+        (r'([^\s])ч\.\s*1', r'\1 ч. 1'),
+        (r'ч\.\s*1([^\s])', r'ч. 1 \1'),
+        (r'([^\s])ч\.\s*2', r'\1 ч. 2'),
+        (r'ч\.\s*2([^\s])', r'ч. 2 \1'),
+        (r'([^\s])ч\.\s*3', r'\1 ч. 3'),
+        (r'ч\.\s*3([^\s])', r'ч. 3 \1'),
+        (r'([^\s])ч\.\s*4', r'\1 ч. 4'),
+        (r'ч\.\s*4([^\s])', r'ч. 4 \1'),
+        (r'([^\s])ч\.\s*5', r'\1 ч. 5'),
+        (r'ч\.\s*5([^\s])', r'ч. 5 \1'),
+        (r'([^\s])ч\.\s*6', r'\1 ч. 6'),
+        (r'ч\.\s*6([^\s])', r'ч. 6 \1'),
+        # Добавление точки после "п" в конструкциях "ч. N п"
+        (r'ч\.\s*1\s+п(?!\.)', r'ч. 1 п.'),
+        (r'ч\.\s*2\s+п(?!\.)', r'ч. 2 п.'),
+        (r'ч\.\s*3\s+п(?!\.)', r'ч. 3 п.'),
+        (r'ч\.\s*4\s+п(?!\.)', r'ч. 4 п.'),
+        (r'ч\.\s*5\s+п(?!\.)', r'ч. 5 п.'),
+        (r'ч\.\s*6\s+п(?!\.)', r'ч. 6 п.'),
+    ], chars=PART_DIGITS),
+)
+
+# Завершающие исправления после расстановки знаков препинания
+FINAL_RULE_GROUPS = (
+    # Заменяем "; ." на "."
+    rule_group((';',), [(r';\s*\.', '.')]),
+    # Заменяем "СПбским" на "СПб"
+    rule_group(('спбским',), [(r'СПбским', 'СПб')], flags=re.IGNORECASE),
+    # Убираем лишнее "г. СПб" в конструкции "г. СПб г/с г. СПб"
+    rule_group(('г/с',), [(r'г\.\s*СПб\s+г/с\s+г\.\s*СПб', 'г/с г. СПб')]),
+)
 
 class ColumnIFormatter:
     """
@@ -7,13 +117,13 @@ class ColumnIFormatter:
     """
     
     def __init__(self):
-        # Паттерны для поиска дат в разных форматах
-        self.date_patterns = [
+        # Паттерны для поиска дат в разных форматах (применяются по очереди)
+        self.date_patterns = [re.compile(pattern) for pattern in (
             r'(\d{1,2})\.(\d{1,2})\.(\d{2,4})',  # ДД.ММ.ГГГГ
             r'(\d{1,2})/(\d{1,2})/(\d{2,4})',    # ДД/ММ/ГГГГ
             r'(\d{1,2})-(\d{1,2})-(\d{2,4})',    # ДД-ММ-ГГГГ
             r'(\d{1,2})\s+(\d{1,2})\s+(\d{2,4})'  # ДД ММ ГГГГ
-        ]
+        )]
         
         # Паттерны для поиска судов
         self.court_patterns = [
@@ -24,6 +134,10 @@ class ColumnIFormatter:
             r'([А-Яа-я\s]+краевой\s+суд)',
             r'([А-Яа-я\s]+республиканский\s+суд)'
         ]
+        # Все паттерны судов содержат "суд"
+        self.court_rule_groups = (
+            rule_group(('суд',), [(pattern, self._capitalize_court_name) for pattern in self.court_patterns]),
+        )
     
     def _remove_unwanted_symbols(self, text):
         """
@@ -68,69 +182,18 @@ class ColumnIFormatter:
         
         return text.strip()
 
-    def _normalize_additional_rules(self, text):
+    def _normalize_additional_rules(self, text, stats=None):
         """
         Применяет дополнительные правила форматирования
         
         Args:
             text (str): Исходный текст
+            stats (dict): Статистика (счетчик пропущенных правил rules_skipped)
             
         Returns:
             str: Текст с примененными правилами форматирования
         """
-        # Паттерны для поиска и замены
-        patterns = [
-            # Нормализация "ст."
-            (r'ст:', 'ст.'),
-            (r'ст\s', 'ст. '),
-            
-            # Добавление пробела перед "ч."
-            (r'([^\s])ч\.', r'\1 ч.'),
-            
-            # Нормализация "№"
-            (r'([^\s])№', r'\1 №'),
-            (r'№([^\s])', r'№ \1'),
-            
-            # Двойные запятые
-            (r',\s*,', ','),
-            
-            # Нормализация "год/года"
-            (r'Года', 'года'),
-            (r'Год', 'год'),
-            
-            # Нормализация написания частей статей без точки
-            (r'ч([1-6])', r'ч. \1'),
-            # Нормализация написания частей статей с пробелом без точки
-            (r'ч\s+([1-6])', r'ч. \1'),
-            
-            # Добавление пробелов до и после "ч. N"
-            (r'([^\s])ч\.\s*1', r'\1 ч. 1'),
-            (r'ч\.\s*1([^\s])', r'ч. 1 \1'),
-            (r'([^\s])ч\.\s*2', r'\1 ч. 2'),
-            (r'ч\.\s*2([^\s])', r'ч. 2 \1'),
-            (r'([^\s])ч\.\s*3', r'\1 ч. 3'),
-            (r'ч\.\s*3([^\s])', r'ч. 3 \1'),
-            (r'([^\s])ч\.\s*4', r'\1 ч. 4'),
-            (r'ч\.\s*4([^\s])', r'ч. 4 \1'),
-            (r'([^\s])ч\.\s*5', r'\1 ч. 5'),
-            (r'ч\.\s*5([^\s])', r'ч. 5 \1'),
-            (r'([^\s])ч\.\s*6', r'\1 ч. 6'),
-            (r'ч\.\s*6([^\s])', r'ч. 6 \1'),
-            
-            # Добавление точки после "п" в конструкциях "ч. N п"
-            (r'ч\.\s*1\s+п(?!\.)', r'ч. 1 п.'),
-            (r'ч\.\s*2\s+п(?!\.)', r'ч. 2 п.'),
-            (r'ч\.\s*3\s+п(?!\.)', r'ч. 3 п.'),
-            (r'ч\.\s*4\s+п(?!\.)', r'ч. 4 п.'),
-            (r'ч\.\s*5\s+п(?!\.)', r'ч. 5 п.'),
-            (r'ч\.\s*6\s+п(?!\.)', r'ч. 6 п.')
-        ]
-        
-        # Применяем все паттерны
-        for pattern, replacement in patterns:
-            text = re.sub(pattern, replacement, text)
-        
-        return text
+        return apply_rule_groups(text, ADDITIONAL_RULE_GROUPS, stats)
 
     def _normalize_court_abbreviation(self, text):
         """
@@ -144,12 +207,15 @@ class ColumnIFormatter:
         """
         return re.sub(r'районным\s+судом', 'р/с', text)
 
-    def format_text(self, text):
+    def format_text(self, text, stats=None):
         """
         Форматирует текст в столбце I
         
+        Группы правил, признаков которых нет в тексте, пропускаются
+        
         Args:
             text (str): Исходный текст
+            stats (dict): Статистика (счетчик пропущенных правил rules_skipped)
             
         Returns:
             str: Отформатированный текст
@@ -164,22 +230,22 @@ class ColumnIFormatter:
         text = re.sub(r'\s+', ' ', text).strip()
         
         # Удаляем пробелы в датах (например, "30. 01. 2025" -> "30.01.2025")
-        text = re.sub(r'(\d+)\.\s+(\d+)\.\s+(\d+)', r'\1.\2.\3', text)
+        text = apply_rule_groups(text, SPACED_DATE_RULE_GROUPS, stats)
         
         # Нормализуем даты в разных форматах
         text = self._normalize_dates(text)
         
         # Нормализуем написание "г. СПб"
-        text = self._normalize_spb(text)
+        text = self._normalize_spb(text, stats)
         
         # Нормализуем написание специальных терминов
-        text = self._normalize_special_terms(text)
+        text = self._normalize_special_terms(text, stats)
         
         # Применяем дополнительные правила форматирования
-        text = self._normalize_additional_rules(text)
+        text = self._normalize_additional_rules(text, stats)
         
         # Форматируем названия судов
-        text = self._format_court_names(text)
+        text = self._format_court_names(text, stats)
         
         # Добавляем пробелы после знаков препинания
         text = re.sub(r'([.,;:])(?!\s)', r'\1 ', text)
@@ -200,14 +266,8 @@ class ColumnIFormatter:
         text = re.sub(r'\.\s+\.', '.', text)
         text = re.sub(r'\.\.', '.', text)
         
-        # Заменяем "; ." на "."
-        text = re.sub(r';\s*\.', '.', text)
-        
-        # В самом конце заменяем "СПбским" на "СПб"
-        text = re.sub(r'СПбским', 'СПб', text, flags=re.IGNORECASE)
-        
-        # Убираем лишнее "г. СПб" в конструкции "г. СПб г/с г. СПб"
-        text = re.sub(r'г\.\s*СПб\s+г/с\s+г\.\s*СПб', 'г/с г. СПб', text)
+        # Заменяем "; ." на "."; "СПбским" на "СПб"; "г. СПб г/с г. СПб" на "г/с г. СПб"
+        text = apply_rule_groups(text, FINAL_RULE_GROUPS, stats)
         
         return text
     
@@ -216,7 +276,7 @@ class ColumnIFormatter:
         Нормализует все даты в тексте к формату ДД.ММ.ГГГГ
         """
         for pattern in self.date_patterns:
-            text = re.sub(pattern, self._format_date, text)
+            text = pattern.sub(self._format_date, text)
         return text
     
     def _format_date(self, match):
@@ -235,13 +295,11 @@ class ColumnIFormatter:
         
         return f"{day}.{month}.{year}"
     
-    def _format_court_names(self, text):
+    def _format_court_names(self, text, stats=None):
         """
         Форматирует названия судов
         """
-        for pattern in self.court_patterns:
-            text = re.sub(pattern, self._capitalize_court_name, text)
-        return text
+        return apply_rule_groups(text, self.court_rule_groups, stats)
     
     def _capitalize_court_name(self, match):
         """
@@ -249,76 +307,31 @@ class ColumnIFormatter:
         """
         return match.group(1)
     
-    def _normalize_spb(self, text):
+    def _normalize_spb(self, text, stats=None):
         """
         Нормализует написание "г. СПб" в тексте
         
         Args:
             text (str): Исходный текст
+            stats (dict): Статистика (счетчик пропущенных правил rules_skipped)
             
         Returns:
             str: Текст с нормализованным написанием "г. СПб"
         """
-        # Заменяем "СПБ" на "СПб"
-        text = re.sub(r'СПБ', 'СПб', text)
-        
-        # Заменяем "Санкт-Петербург" и "Санкт-Петербурга" на "СПб"
-        text = re.sub(r'Санкт-Петербурга', 'СПб', text)
-        text = re.sub(r'Санкт-Петербург', 'СПб', text)
-        
-        # Заменяем "Ленинградская область" и "Ленинградской области" на "ЛО"
-        text = re.sub(r'Ленинградской\s+области', 'ЛО', text)
-        text = re.sub(r'Ленинградская\s+область', 'ЛО', text)
-        
-        # Паттерны для поиска различных вариантов написания
-        patterns = [
-            (r'р/с\s*г\.\s*СПб', 'р/с г. СПб'),  # р/с г.СПб -> р/с г. СПб
-            (r'р/с\s*г\s*СПб', 'р/с г. СПб'),  # р/с гСПб -> р/с г. СПб
-            (r'г\.\s*СПб', 'г. СПб'),  # г.СПб -> г. СПб
-            (r'г\s*СПб', 'г. СПб'),  # гСПб -> г. СПб
-            (r'(?<!г\.\s)СПб', 'г. СПб'),  # СПб -> г. СПб (если перед ним нет "г.")
-        ]
-        
-        # Применяем все паттерны
-        for pattern, replacement in patterns:
-            text = re.sub(pattern, replacement, text)
-        
-        # Добавляем пробел перед "г. СПб", если его нет
-        text = re.sub(r'([^\s])г\.\s*СПб', r'\1 г. СПб', text)
-        
-        return text
+        return apply_rule_groups(text, SPB_RULE_GROUPS, stats)
     
-    def _normalize_special_terms(self, text):
+    def _normalize_special_terms(self, text, stats=None):
         """
         Нормализует написание специальных терминов (р/с, р/с, УК РФ)
         
         Args:
             text (str): Исходный текст
+            stats (dict): Статистика (счетчик пропущенных правил rules_skipped)
             
         Returns:
             str: Текст с нормализованным написанием специальных терминов
         """
-        # Паттерны для поиска и замены
-        patterns = [
-            # р/с
-            (r'([^\s])р/с', r'\1 р/с'),  # Добавляем пробел перед р/с
-            (r'р/с([^\s])', r'р/с \1'),  # Добавляем пробел после р/с
-            
-            # р/с
-            (r'([^\s])р/с', r'\1 р/с'),  # Добавляем пробел перед р/с
-            (r'р/с([^\s])', r'р/с \1'),  # Добавляем пробел после р/с
-            
-            # УК РФ
-            (r'([^\s])УК\s*РФ', r'\1 УК РФ'),  # Добавляем пробел перед УК РФ
-            (r'УК\s*РФ([^\s])', r'УК РФ \1'),  # Добавляем пробел после УК РФ
-            (r'УК\s+РФ', r'УК РФ'),  # Нормализуем пробел между УК и РФ
-        ]
-        
-        # Применяем все паттерны
-        for pattern, replacement in patterns:
-            text = re.sub(pattern, replacement, text)
-        
-        return text
+        return apply_rule_groups(text, SPECIAL_TERM_RULE_GROUPS, stats)
     
     def process_excel_column(self, sheet, column_index=9):
         """
@@ -334,14 +347,15 @@ class ColumnIFormatter:
         stats = {
             'cells_processed': 0,
             'dates_normalized': 0,
-            'courts_formatted': 0
+            'courts_formatted': 0,
+            'rules_skipped': 0
         }
         
         for row in range(1, sheet.max_row + 1):
             cell = sheet.cell(row=row, column=column_index)
             if cell.value:
                 original_text = str(cell.value)
-                formatted_text = self.format_text(original_text)
+                formatted_text = self.format_text(original_text, stats)
                 
                 if formatted_text != original_text:
                     cell.value = formatted_text
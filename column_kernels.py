@@ -0,0 +1,131 @@
+import re
+
+from b_column_parser import PHONE_PATTERN, OTHER_INFO_PHRASES
+
+# pandas - необязательная зависимость: без нее форматтеры работают построчно
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+PANDAS_AVAILABLE = pd is not None
+
+
+def require_pandas():
+    """Проверяет наличие pandas перед запуском векторных операций"""
+    if not PANDAS_AVAILABLE:
+        raise ImportError("Для векторной обработки столбцов требуется pandas (pip install pandas)")
+
+
+def _none_if_missing(series):
+    """Заменяет пропуски (NaN/NA) на None, как в построчных версиях"""
+    series = series.astype(object)
+    return series.where(series.notna(), None)
+
+
+def as_text(series):
+    """
+    Приводит столбец к строкам: пустые значения (NaN/None) становятся пустой строкой
+
+    Args:
+        series (pd.Series): Исходный столбец
+
+    Returns:
+        pd.Series: Столбец строк
+    """
+    return series.where(series.notna(), '').astype(str)
+
+
+def collapse_whitespace(series):
+    """Заменяет последовательности пробельных символов одним пробелом и обрезает края"""
+    return series.str.replace(r'\s+', ' ', regex=True).str.strip()
+
+
+def join_spaced_dates(series):
+    """Удаляет пробелы в датах: "30. 01. 2025" -> "30.01.2025" """
+    return series.str.replace(r'(\d{1,2})\.\s+(\d{1,2})\.\s+(\d{2,4})', r'\1.\2.\3', regex=True)
+
+
+def space_punctuation(series):
+    """Ставит пробел после знаков препинания и убирает пробелы перед ними"""
+    series = series.str.replace(r'([.,;:])(?!\s)', r'\1 ', regex=True)
+    return series.str.replace(r'\s+([.,;:])', r'\1', regex=True)
+
+
+def normalize_spb_suffix(series):
+    """Заменяет "СПбским" на "СПб" (без учета регистра)"""
+    return series.str.replace(r'СПбским', 'СПб', flags=re.IGNORECASE, regex=True)
+
+
+def ensure_trailing_dot(series):
+    """Добавляет точку в конце непустого текста, если он не заканчивается на . ! ?"""
+    needs_dot = (series != '') & ~series.str.contains(r'[.!?]\Z', regex=True)
+    return series.where(~needs_dot, series + '.')
+
+
+def capitalize_first(series):
+    """Делает первую букву заглавной, не меняя остальной текст"""
+    return series.str[:1].str.upper() + series.str[1:]
+
+
+def extract_phones(series):
+    """
+    Извлекает телефоны из всего столбца за один проход регулярного выражения
+
+    Args:
+        series (pd.Series): Столбец строк
+
+    Returns:
+        pd.DataFrame: Столбцы phone (только цифры, None если не найден)
+                      и phone_text (исходный текст телефона)
+    """
+    found = series.str.extract(PHONE_PATTERN)
+    digits = found['digits'].str.replace(r'\D', '', regex=True)
+    phone = found['prefix'].fillna('') + digits
+
+    return pd.DataFrame({
+        'phone': _none_if_missing(phone),
+        'phone_text': _none_if_missing(found['phone_text'])
+    }, index=series.index)
+
+
+def remove_fragments(series, fragments):
+    """
+    Удаляет из каждой строки свой фрагмент текста (телефон, адрес)
+
+    Построчная операция: у каждой строки своя подстрока для удаления
+
+    Args:
+        series (pd.Series): Столбец строк
+        fragments (pd.Series): Удаляемые фрагменты (None - строка не меняется)
+
+    Returns:
+        pd.Series: Столбец без фрагментов
+    """
+    return pd.Series(
+        [text.replace(fragment, '') if fragment else text for text, fragment in zip(series, fragments)],
+        index=series.index, dtype=object
+    )
+
+
+def clean_other_info(series):
+    """
+    Векторная версия ImprovedAddressProcessor.clean_other_info для целого столбца
+
+    Args:
+        series (pd.Series): Столбец строк
+
+    Returns:
+        pd.Series: Очищенный текст (None, если ничего не осталось)
+    """
+    text = collapse_whitespace(as_text(series))
+
+    # Фразы удаляются по очереди, как в последовательной версии
+    for phrase in OTHER_INFO_PHRASES:
+        text = text.str.replace(phrase, '', regex=True)
+
+    text = text.str.replace(r'[,-]+', '', regex=True)
+    text = text.str.replace(r'^\s*[,-]\s*', '', regex=True)
+    text = text.str.replace(r'\s*[,-]\s*$', '', regex=True).str.strip()
+
+    return _none_if_missing(text.where(text != ''))
@@ -1,4 +1,53 @@
 import re
+from rule_gates import apply_rule_groups, rule_group
+
+# Группы правил замены с признаками: группа пропускается, если в тексте нет ни одного признака.
+# Правила проверяются после схлопывания пробелов, поэтому \s в тексте - только пробел
+SPECIAL_TERM_RULE_GROUPS = (
+    # "ПМЖ" и "ПЖМ" -> "постоянное место жительства"
+    rule_group(('пмж', 'пжм'), [
+        (r'ПМЖ', 'постоянное место жительства'),
+        (r'ПЖМ', 'постоянное место жительства'),
+    ], flags=re.IGNORECASE),
+    rule_group((' р.', ' м.', '/мес'), [
+        # Замена " р." на " раз"
+        (r'\sр\.', ' раз'),
+        # Замена " м." на " мес."
+        (r'\sм\.', ' мес.'),
+        # Замена "1 /мес" на "1 раз в мес"
+        (r'(\d+)\s*/мес', r'\1 раз в мес'),
+    ]),
+    rule_group(('м/ж', ' мж', ' уии'), [
+        # Замена "м/ж" на "мест. жительства"
+        (r'м/ж', 'мест. жительства'),
+        # Замена " мж" на " место жительства"
+        (r'\sмж', ' место жительства'),
+        # Замена " уии" на " УИИ"
+        (r'\sуии', ' УИИ'),
+    ], flags=re.IGNORECASE),
+    # Замена специальных слов на полные формулировки
+    rule_group(('интернет', 'выход из дома', 'общение', 'связь'), [
+        (r'\bИнтернет\b', 'запрет на использование интернета'),
+        (r'\bВыход из дома\b', 'ограничение на выход из дома'),
+        (r'\bОбщение\b', 'запрет на общение с определёнными лицами'),
+        (r'\bСвязь\b', 'запрет на использование средств связи'),
+    ], flags=re.IGNORECASE),
+)
+
+# Дефисы: правила срабатывают только при наличии "-"
+HYPHEN_RULE_GROUPS = (
+    rule_group(('-',), [
+        # Добавляем пробел после "-" если его нет
+        (r'-(?!\s)', '- '),
+        # Добавляем ";" перед пробелом и "-" если перед пробелом нет "," или ";"
+        (r'(?<![,;])\s+-', '; -'),
+    ]),
+)
+
+# Заменяем "; ." на "."
+SEMICOLON_RULE_GROUPS = (
+    rule_group((';',), [(r';\s*\.', '.')]),
+)
 
 class ColumnLFormatter:
     """
@@ -17,14 +66,15 @@ class ColumnLFormatter:
             dict: Статистика обработки
         """
         stats = {
-            'cells_processed': 0
+            'cells_processed': 0,
+            'rules_skipped': 0
         }
         
         for row in range(1, sheet.max_row + 1):
             cell = sheet.cell(row=row, column=column_index)
             if cell.value:
                 original_text = str(cell.value)
-                formatted_text = self.format_text(original_text)
+                formatted_text = self.format_text(original_text, stats)
                 
                 if formatted_text != original_text:
                     cell.value = formatted_text
@@ -44,52 +94,20 @@ class ColumnLFormatter:
         
         return stats
     
-    def _normalize_special_terms(self, text):
+    def _normalize_special_terms(self, text, stats=None):
         """
         Нормализует специальные термины в тексте
         
         Args:
             text (str): Исходный текст
+            stats (dict): Статистика (счетчик пропущенных правил rules_skipped)
             
         Returns:
             str: Текст с нормализованными терминами
         """
-        # Замена специальных терминов
-        text = re.sub(r'ПМЖ', 'постоянное место жительства', text, flags=re.IGNORECASE)
-        text = re.sub(r'ПЖМ', 'постоянное место жительства', text, flags=re.IGNORECASE)
-        
-        # Замена " р." на " раз"
-        text = re.sub(r'\sр\.', ' раз', text)
-        
-        # Замена " м." на " мес."
-        text = re.sub(r'\sм\.', ' мес.', text)
+        return apply_rule_groups(text, SPECIAL_TERM_RULE_GROUPS, stats)
         
-        # Замена "1 /мес" на "1 раз в мес"
-        text = re.sub(r'(\d+)\s*/мес', r'\1 раз в мес', text)
-        
-        # Замена "м/ж" на "мест. жительства"
-        text = re.sub(r'м/ж', 'мест. жительства', text, flags=re.IGNORECASE)
-        
-        # Замена " мж" на " место жительства"
-        text = re.sub(r'\sмж', ' место жительства', text, flags=re.IGNORECASE)
-        
-        # Замена " уии" на " УИИ"
-        text = re.sub(r'\sуии', ' УИИ', text, flags=re.IGNORECASE)
-        
-        # Замена специальных слов на полные формулировки
-        replacements = {
-            'Интернет': 'запрет на использование интернета',
-            'Выход из дома': 'ограничение на выход из дома',
-            'Общение': 'запрет на общение с определёнными лицами',
-            'Связь': 'запрет на использование средств связи'
-        }
-        
-        for old, new in replacements.items():
-            text = re.sub(rf'\b{old}\b', new, text, flags=re.IGNORECASE)
-        
-        return text
-        
-    def _process_hyphens(self, text):
+    def _process_hyphens(self, text, stats=None):
         """
         Обрабатывает дефисы в тексте:
         1. Если после "-" нет пробела, добавляет его
@@ -99,15 +117,13 @@ class ColumnLFormatter:
         
         Args:
             text (str): Исходный текст
+            stats (dict): Статистика (счетчик пропущенных правил rules_skipped)
             
         Returns:
             str: Текст с обработанными дефисами
         """
-        # Добавляем пробел после "-" если его нет
-        text = re.sub(r'-(?!\s)', '- ', text)
-        
-        # Добавляем ";" перед пробелом и "-" если перед пробелом нет "," или ";"
-        text = re.sub(r'(?<![,;])\s+-', '; -', text)
+        # Пробел после "-" и ";" перед " -"
+        text = apply_rule_groups(text, HYPHEN_RULE_GROUPS, stats)
         
         # Убираем все "- " (дефис с пробелом)
         text = text.replace('- ', '')
@@ -117,12 +133,15 @@ class ColumnLFormatter:
         
         return text
 
-    def format_text(self, text):
+    def format_text(self, text, stats=None):
         """
         Форматирует текст в столбце L
         
+        Группы правил, признаков которых нет в тексте, пропускаются
+        
         Args:
             text (str): Исходный текст
+            stats (dict): Статистика (счетчик пропущенных правил rules_skipped)
             
         Returns:
             str: Отформатированный текст
@@ -134,10 +153,10 @@ class ColumnLFormatter:
         text = re.sub(r'\s+', ' ', text).strip()
         
         # Нормализуем специальные термины
-        text = self._normalize_special_terms(text)
+        text = self._normalize_special_terms(text, stats)
         
         # Обрабатываем дефисы
-        text = self._process_hyphens(text)
+        text = self._process_hyphens(text, stats)
         
         # Добавляем пробелы после знаков препинания
         text = re.sub(r'([.,;:])(?!\s)', r'\1 ', text)
@@ -154,7 +173,7 @@ class ColumnLFormatter:
             text = text[0].upper() + text[1:]
             
         # Заменяем "; ." на "."
-        text = re.sub(r';\s*\.', '.', text)
+        text = apply_rule_groups(text, SEMICOLON_RULE_GROUPS, stats)
         
         # В самом конце заменяем ". ." на "."
         text = re.sub(r'\.\s*\.', '.', text)
@@ -0,0 +1,274 @@
+import re
+from collections import namedtuple
+
+from date_tokenizer import DATE_TOKENIZER
+
+# Статья УК в приговоре: номер ("228", "228.1"), часть и пункты ("а,г")
+Article = namedtuple('Article', ['article', 'part', 'point'])
+
+# Начало перечня статей: "по ст. 158", "по 158", "ст. 158", "ч. 3 ст. 159", "п. «в» ч. 2 ст. 158"
+ARTICLES_START_RE = re.compile(
+    r'\bпо\s+(?=ст|ч\.|п\.|\d)|\bст\.?\s*(?=\d)|\bч\.\s*\d+\s*,?\s*ст\b|\bп\.\s*[«"»]',
+    re.IGNORECASE
+)
+
+# Конец перечня статей: "УК РФ", назначенное наказание ("к 3 г.") или текст после запятой/точки
+ARTICLES_END_RE = re.compile(r'ук\s*рф|\bук\b|\s[кК]\s+\d|[,.]\s*[а-яё]{3,}', re.IGNORECASE)
+
+# Элементы перечня статей
+ARTICLE_TOKEN_RE = re.compile(r'''
+    (?P<marker>\bст\b\.?|\bс\.)                                             # ст. (с. - опечатка)
+    |\bч\.?\s*(?P<part>\d+)                                                  # ч. 3
+    |\bп\.\s*[«"»]?\s*(?P<point>[а-яёa-z](?:\s*,\s*[а-яё])*|[а-яё]{1,3})\b\s*[»"]?   # п. «а, г», п. бв
+    |[«"]\s*(?P<quoted>[а-яё](?:\s*,\s*[а-яё])*)\s*[»"]                     # «г» без "п."
+    |(?P<episodes>\(\s*\d+\s*(?:эп|прест)[^)]*\))                            # (2 эп.), (4 прест)
+    |(?P<number>\d+(?:\s*\.\s*\d+)?)                                         # 158, 264. 1
+    |(?P<separator>[,;])
+''', re.IGNORECASE | re.VERBOSE)
+
+POINT_LETTER_RE = re.compile(r'[а-яёa-z]', re.IGNORECASE)
+
+# Назначенное наказание: "к 3 г. 6 мес. л/св", "к штрафу", "в виде л/св.", "сроком на 8 месяцев ИР"
+SENTENCE_START_RE = re.compile(r'\s(?:[кК]|в\s+виде|сроком\s+на)\s+')
+
+# Срок: годы и (или) месяцы
+TERM_RE = re.compile(
+    r'(?:(?P<years>\d+)\s*(?:год[а-яё]*|лет|г(?![а-яё])|л(?![а-яё/]))\.?)?\s*'
+    r'(?:(?P<months>\d+)\s*(?:мес[а-яё]*|м(?![а-яё]))\.?)?',
+    re.IGNORECASE
+)
+
+# Испытательный срок при условном осуждении
+PROBATION_RE = re.compile(r'(?:\bИС\b|испытательн[а-яё]*\s+срок[а-яё]*)[\s\-–]*', re.IGNORECASE)
+
+# Условное осуждение: "условно", "усл."
+CONDITIONAL_RE = re.compile(r'усл(?:овн|\.|\b|[,\s])', re.IGNORECASE)
+
+# Виды наказания (проверяются по порядку; дополнительное лишение права - последним)
+PUNISHMENT_PATTERNS = (
+    ('лишение свободы', re.compile(r'л\s*[/.]\s*с|лиш[а-яё]*\.?\s*св|лишени[а-яё]*\s+свободы', re.IGNORECASE)),
+    ('исправительные работы', re.compile(r'\bИР\b|исправительн[а-яё]*\s+работ', re.IGNORECASE)),
+    ('обязательные работы', re.compile(r'\bОР\b|обязательн[а-яё]*\s+работ', re.IGNORECASE)),
+    ('принудительные работы', re.compile(r'принуд[а-яё]*\.?\s*работ', re.IGNORECASE)),
+    ('ограничение свободы', re.compile(r'\bОС\b|ограничени[а-яё]*\s+свободы', re.IGNORECASE)),
+    ('штраф', re.compile(r'штраф', re.IGNORECASE)),
+    ('лишение права', re.compile(r'лишени[а-яё]*\s+права', re.IGNORECASE)),
+)
+
+# Слова перед названием суда, которые не входят в название
+COURT_PREFIX_RE = re.compile(r'^(?:\s|[,.]|осужден[а-яё]*|приговор[а-яё]*|года|г\.|от\b)+', re.IGNORECASE)
+COURT_SUFFIX_RE = re.compile(r'(?:\s|[,.]|\bот|\bпо)+$', re.IGNORECASE)
+
+# Мировые судьи: "МССУ № 56", "Мировым судьей судебного участка № 160"
+MAGISTRATE_RE = re.compile(r'мссу|миров[а-яё]*\s+суд[а-яё]*', re.IGNORECASE)
+MAGISTRATE_NUMBER_RE = re.compile(r'№\s*(\d+)')
+
+# Тип суда: районный или городской
+COURT_TYPES = (
+    ('р/с', re.compile(r'р\s*/\s*с\b|\bрс\b|районн[а-яё]*\s+(?:суд|города)', re.IGNORECASE)),
+    ('г/с', re.compile(r'г\s*/\s*с\b|городск[а-яё]*\s+суд|\bгор\.\s*суд', re.IGNORECASE)),
+)
+
+# Сокращения названий судов, принятые в реестре
+COURT_ALIASES = {
+    'крс': 'калининский р/с',
+}
+
+# Окончания названия суда (прилагательного) в косвенных падежах и сокращения ("Калининск.")
+COURT_ADJECTIVE_ENDINGS = (
+    (re.compile(r'(?<=ск|цк)(?:им|ого|ому|ом)?$'), 'ий'),
+    (re.compile(r'(?<=н)(?:ым|ого|ому|ом)$'), 'ый'),
+)
+COURT_WORD_RE = re.compile(r'[а-яё-]+')
+
+
+def iso_date(token):
+    """
+    Дата в формате ГГГГ-ММ-ДД (для сортировки и поиска по диапазону)
+
+    Args:
+        token (DateToken): Найденная дата
+
+    Returns:
+        str: Дата или None, если год записан не четырьмя цифрами
+    """
+    if token is None or len(token.year) != 4:
+        return None
+    return f"{token.year}-{int(token.month):02d}-{int(token.day):02d}"
+
+
+def _nominative(word):
+    """Название суда в именительном падеже: "калининским" -> "калининский" """
+    for pattern, ending in COURT_ADJECTIVE_ENDINGS:
+        if pattern.search(word):
+            return pattern.sub(ending, word, count=1)
+    return word
+
+
+def court_key(court_name):
+    """
+    Нормализованный ключ суда для поиска: "калининский р/с", "мссу № 56"
+
+    Название приводится к именительному падежу ("Калининским районным судом" ->
+    "калининский р/с"), место нахождения суда в ключ не входит
+
+    Args:
+        court_name (str): Название суда в тексте приговора
+
+    Returns:
+        str: Ключ или None, если суд не распознан
+    """
+    if not court_name:
+        return None
+
+    text = court_name.lower().replace('ё', 'е')
+
+    if MAGISTRATE_RE.search(text):
+        number = MAGISTRATE_NUMBER_RE.search(text)
+        return f"мссу № {number.group(1)}" if number else "мссу"
+
+    words = COURT_WORD_RE.findall(text)
+    if words and words[0] in COURT_ALIASES:
+        return COURT_ALIASES[words[0]]
+
+    for court_type, pattern in COURT_TYPES:
+        match = pattern.search(text)
+        if match:
+            # Название суда - слово перед типом суда
+            words = COURT_WORD_RE.findall(text[:match.start()])
+            if not words:
+                return court_type
+            return f"{_nominative(words[-1])} {court_type}"
+
+    return None
+
+
+def _point(text):
+    """Пункты статьи в виде "а,г" """
+    return ','.join(POINT_LETTER_RE.findall(text.lower().replace('ё', 'е'))) or None
+
+
+def parse_articles(text):
+    """
+    Разбирает перечень статей УК
+
+    Поддерживаются обе формы записи: "ст. 158 ч. 3 п. «г»" и "п. «г» ч. 3 ст. 158".
+    Часть и пункт после номера статьи относятся к ней, если их не отделяет запятая;
+    иначе они относятся к следующей статье
+
+    Args:
+        text (str): Перечень статей (например, "ст. 158 ч. 3 п. «г», 159 ч. 1")
+
+    Returns:
+        list: Статьи (Article) в порядке следования
+    """
+    articles = []
+    current = None
+    pending = {}
+    separated = False
+
+    for match in ARTICLE_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'number':
+            current = {'article': re.sub(r'\s+', '', match.group('number')),
+                       'part': pending.get('part'), 'point': pending.get('point')}
+            articles.append(current)
+            pending = {}
+            separated = False
+        elif kind in ('part', 'point', 'quoted'):
+            field = 'part' if kind == 'part' else 'point'
+            value = int(match.group('part')) if kind == 'part' else _point(match.group(kind))
+            if current is not None and not separated and current[field] is None:
+                current[field] = value
+            else:
+                pending[field] = value
+        elif kind == 'separator':
+            separated = True
+
+    return [Article(item['article'], item['part'], item['point']) for item in articles]
+
+
+def parse_term(text):
+    """
+    Разбирает срок в начале текста ("3 г. 6 мес.", "11 месяцам", "5лет")
+
+    Returns:
+        int: Срок в месяцах или None, если срок не найден
+    """
+    match = TERM_RE.match(text)
+    if not match or not (match.group('years') or match.group('months')):
+        return None
+    return int(match.group('years') or 0) * 12 + int(match.group('months') or 0)
+
+
+def parse_court_decision(text):
+    """
+    Разбирает информацию о приговоре (столбец K): дата, суд, статьи и наказание
+
+    Разбирается первый приговор в тексте; последующие постановления
+    (продление испытательного срока и т.п.) не учитываются
+
+    Args:
+        text (str): Информация о суде и наказании
+
+    Returns:
+        dict: decision_date (ГГГГ-ММ-ДД), court_name, court_key, articles (список Article),
+              punishment, term_months, conditional, probation_months;
+              None для пустого текста
+    """
+    if not text or not str(text).strip():
+        return None
+
+    text = str(text)
+    result = {
+        'decision_date': None,
+        'court_name': None,
+        'court_key': None,
+        'articles': [],
+        'punishment': None,
+        'term_months': None,
+        'conditional': False,
+        'probation_months': None
+    }
+
+    # Перечень статей и наказание; название суда - в тексте перед ними
+    start = ARTICLES_START_RE.search(text)
+    sentence = SENTENCE_START_RE.search(text, start.end() if start else 0)
+    bounds = [match.start() for match in (start, sentence) if match]
+    head_end = min(bounds) if bounds else len(text)
+
+    # Дата приговора - первая дата в тексте
+    date = DATE_TOKENIZER.earliest_date(text)
+    result['decision_date'] = iso_date(date)
+
+    # Суд - текст перед перечнем статей без дат и служебных слов
+    head = DATE_TOKENIZER.pattern.sub(' ', text[:head_end])
+    court_name = COURT_SUFFIX_RE.sub('', COURT_PREFIX_RE.sub('', head.strip()))
+    court_name = re.sub(r'\s+', ' ', court_name).strip(' ,.')
+    result['court_name'] = court_name or None
+    result['court_key'] = court_key(court_name)
+
+    if start:
+        rest = text[start.end():]
+        end = ARTICLES_END_RE.search(rest)
+        result['articles'] = parse_articles(rest[:end.start()] if end else rest)
+
+    # Наказание: срок и вид
+    if sentence:
+        sentence_text = text[sentence.end():]
+        # Последующие постановления начинаются с даты
+        next_date = DATE_TOKENIZER.earliest_date(sentence_text)
+        if next_date:
+            sentence_text = sentence_text[:next_date.span[0]]
+
+        result['term_months'] = parse_term(sentence_text)
+        result['punishment'] = next(
+            (name for name, pattern in PUNISHMENT_PATTERNS if pattern.search(sentence_text)), None
+        )
+        probation = PROBATION_RE.search(sentence_text)
+        if probation:
+            result['probation_months'] = parse_term(sentence_text[probation.end():])
+        # Испытательный срок назначается только при условном осуждении
+        result['conditional'] = bool(CONDITIONAL_RE.search(sentence_text) or probation)
+
+    return result
@@ -1,5 +1,45 @@
 import sqlite3
 from datetime import datetime
+import openpyxl
+from name_index import (name_keys, candidate_tiers, rank_candidates, name_similarity, SURNAME_INITIAL_KEY,
+                        WORD_TIER_MIN_MATCHES, WORD_TIER_CANDIDATES)
+from court_parser import parse_court_decision, court_key
+from restriction_parser import RESTRICTION_TYPES, parse_restrictions
+from address_key import parse_address, address_key
+from phone_number import normalize_phone, phone_prefix_range
+from b_column_parser import STREET_TYPES
+
+# Столбцы обработанного Excel-файла (номер столбца, начиная с 1) для полей таблицы convicts
+EXCEL_COLUMNS = {
+    'start_date': 1,      # A
+    'birth_date': 3,      # C
+    'end_date': 6,        # F
+    'other_info_g': 7,    # G
+    'other_info_h': 8,    # H
+    'court_info': 11,     # K
+    'restrictions': 12,   # L
+    'full_name': 14,      # N
+    'address': 15,        # O
+    'phone': 16,          # P
+    'other_info_q': 17,   # Q
+    'dislocation': 18     # R
+}
+
+# Столбцы, добавленные в таблицу convicts после первой версии схемы.
+# Добавляются в конец таблицы, чтобы не сдвигать номера существующих столбцов
+CONVICT_MIGRATIONS = (
+    ('dislocation', 'TEXT'),   # R: дислокация (из файла дислокации)
+    ('address_id', 'INTEGER'), # адрес в таблице addresses (канонический ключ столбца O)
+    ('phone_number', 'INTEGER'), # P: телефон в формате E.164 (79211234567), см. phone_number
+)
+
+INSERT_CONVICT_SQL = '''
+INSERT INTO convicts (
+    start_date, birth_date, end_date, court_info,
+    restrictions, full_name, address, phone, other_info_g, other_info_h, other_info_q,
+    dislocation, phone_number
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
 
 class DatabaseManager:
     def __init__(self, db_path="convicts.db"):
@@ -43,14 +83,269 @@ class DatabaseManager:
         )
         ''')
         
+        # Нечеткий индекс ФИО: фонетические ключи (см. name_index.name_keys)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS name_keys (
+            key TEXT NOT NULL,
+            convict_id INTEGER NOT NULL,
+            PRIMARY KEY (key, convict_id)
+        ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_name_keys_convict ON name_keys (convict_id)')
+        
+        # Разобранные приговоры (столбец K, см. court_parser.parse_court_decision)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS court_decisions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            convict_id INTEGER NOT NULL,
+            decision_date TEXT,        -- ГГГГ-ММ-ДД
+            court_name TEXT,           -- название суда как в тексте
+            court_key TEXT,            -- нормализованное название: "калининский р/с", "мссу № 56"
+            punishment TEXT,           -- вид наказания
+            term_months INTEGER,       -- срок наказания в месяцах
+            conditional BOOLEAN,       -- условное осуждение
+            probation_months INTEGER,  -- испытательный срок в месяцах
+            FOREIGN KEY (convict_id) REFERENCES convicts (id)
+        )
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS court_articles (
+            decision_id INTEGER NOT NULL,
+            article TEXT NOT NULL,     -- номер статьи УК: "158", "228.1"
+            part INTEGER,
+            point TEXT,                -- пункты через запятую: "а,г"
+            FOREIGN KEY (decision_id) REFERENCES court_decisions (id)
+        )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_court_decisions_convict ON court_decisions (convict_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_court_decisions_court ON court_decisions (court_key, decision_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_court_decisions_date ON court_decisions (decision_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_court_articles_article ON court_articles (article, part)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_court_articles_decision ON court_articles (decision_id)')
+        
+        # Справочник видов обязанностей (столбец L, см. restriction_parser.RESTRICTION_TYPES)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS restriction_types (
+            id INTEGER PRIMARY KEY,
+            code TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL
+        )
+        ''')
+        cursor.executemany(
+            'INSERT OR IGNORE INTO restriction_types (id, code, name) VALUES (?, ?, ?)',
+            [(index, code, name) for index, (code, name, _) in enumerate(RESTRICTION_TYPES, 1)]
+        )
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS convict_restrictions (
+            type_id INTEGER NOT NULL,
+            convict_id INTEGER NOT NULL,
+            PRIMARY KEY (type_id, convict_id),
+            FOREIGN KEY (type_id) REFERENCES restriction_types (id),
+            FOREIGN KEY (convict_id) REFERENCES convicts (id)
+        ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_convict_restrictions_convict ON convict_restrictions (convict_id)')
+        
+        # Справочник улиц (b_column_parser.STREET_TYPES) и адреса с каноническим ключом
+        # (столбец O, см. address_key): одинаковые адреса хранятся один раз
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS streets (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,     -- название по справочнику: "Бутлерова"
+            street_type TEXT NOT NULL      -- "ул.", "пр.", "наб." и т.д.
+        )
+        ''')
+        # Новые улицы справочника получают следующие идентификаторы, существующие не меняются
+        cursor.executemany(
+            'INSERT OR IGNORE INTO streets (name, street_type) VALUES (?, ?)',
+            list(STREET_TYPES.items())
+        )
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS addresses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            address_key TEXT NOT NULL UNIQUE,  -- "улица:дом:корпус:квартира", см. address_key.address_key
+            street_id INTEGER,                 -- NULL, если улицы нет в справочнике
+            house TEXT,
+            building TEXT,
+            flat TEXT,
+            address TEXT,                      -- адрес как в первой записи
+            FOREIGN KEY (street_id) REFERENCES streets (id)
+        )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_addresses_street ON addresses (street_id, house)')
+        
+        self._migrate(cursor)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_convicts_address ON convicts (address_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_convicts_phone ON convicts (phone_number)')
+        
+        # Последний id convicts, обработанный каждым проходом разбора (_update_*):
+        # записи, которые разобрать не удалось, повторно не просматриваются
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS parse_progress (
+            name TEXT PRIMARY KEY,         -- проход: "court_decisions" и т.д.
+            last_id INTEGER NOT NULL
+        )
+        ''')
+        # Проходы, которых еще нет в parse_progress (новая база или база, созданная до
+        # появления прохода): для них уже импортированные записи разбираются один раз ниже.
+        # Дальше проходы выполняются при добавлении записей (add_convict, import_workbook)
+        applied = {name for (name,) in cursor.execute('SELECT name FROM parse_progress')}
+        
+        # В базе, созданной ранее, разобранными считаются записи до последней найденной
+        cursor.execute('''
+        INSERT OR IGNORE INTO parse_progress (name, last_id)
+        SELECT 'name_keys', IFNULL(MAX(convict_id), 0) FROM name_keys
+        ''')
+        cursor.execute('''
+        INSERT OR IGNORE INTO parse_progress (name, last_id)
+        SELECT 'court_decisions', IFNULL(MAX(convict_id), 0) FROM court_decisions
+        ''')
+        cursor.execute('''
+        INSERT OR IGNORE INTO parse_progress (name, last_id)
+        SELECT 'restrictions', IFNULL(MAX(convict_id), 0) FROM convict_restrictions
+        ''')
+        cursor.execute('''
+        INSERT OR IGNORE INTO parse_progress (name, last_id)
+        SELECT 'addresses', IFNULL(MAX(id), 0) FROM convicts WHERE address_id IS NOT NULL
+        ''')
+        cursor.execute('''
+        INSERT OR IGNORE INTO parse_progress (name, last_id)
+        SELECT 'phone_numbers', IFNULL(MAX(id), 0) FROM convicts WHERE phone_number IS NOT NULL
+        ''')
+        
+        backfills = (
+            ('phone_numbers', self._update_phone_numbers),
+            ('name_keys', self._update_name_keys),
+            ('court_decisions', self._update_court_decisions),
+            ('restrictions', self._update_restrictions),
+            ('addresses', self._update_addresses),
+        )
+        for name, update in backfills:
+            if name not in applied:
+                update(cursor)
+        
         conn.commit()
         conn.close()
     
-    def add_convict(self, data):
-        """Добавление нового осужденного в базу данных"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _migrate(self, cursor):
+        """Добавляет в таблицу convicts столбцы, которых нет в базе, созданной ранее"""
+        existing = {row[1] for row in cursor.execute('PRAGMA table_info(convicts)')}
+        
+        for column, column_type in CONVICT_MIGRATIONS:
+            if column not in existing:
+                cursor.execute(f'ALTER TABLE convicts ADD COLUMN {column} {column_type}')
+    
+    def _update_name_keys(self, cursor):
+        """Добавляет в нечеткий индекс ФИО записи, которые еще не проиндексированы"""
+        rows = [(key, convict_id)
+                for convict_id, full_name in self._pending_rows(cursor, 'name_keys', 'full_name')
+                for key in name_keys(full_name)]
+        cursor.executemany('INSERT OR IGNORE INTO name_keys (key, convict_id) VALUES (?, ?)', rows)
+    
+    def _pending_rows(self, cursor, name, column):
+        """
+        Записи, которые проход разбора name еще не просматривал, с отметкой о том,
+        что они просмотрены (отметка сохраняется вместе с результатами разбора)
+        
+        Args:
+            cursor: Курсор базы данных
+            name (str): Название прохода в таблице parse_progress
+            column (str): Разбираемый столбец convicts
+            
+        Returns:
+            list: Пары (id, значение) для непустых значений
+        """
+        cursor.execute('SELECT last_id FROM parse_progress WHERE name = ?', (name,))
+        progress = cursor.fetchone()
         
+        cursor.execute(f'SELECT id, {column} FROM convicts WHERE id > ? ORDER BY id',
+                       (progress[0] if progress else 0,))
+        rows = cursor.fetchall()
+        if rows:
+            cursor.execute('INSERT OR REPLACE INTO parse_progress (name, last_id) VALUES (?, ?)',
+                           (name, rows[-1][0]))
+        return [(convict_id, value) for convict_id, value in rows if value is not None]
+    
+    def _mark_inserted(self, cursor, name):
+        """
+        Отмечает все записи просмотренными проходом name: для новых записей значение
+        уже вычислено при вставке (phone_number в INSERT_CONVICT_SQL)
+        """
+        cursor.execute('UPDATE parse_progress SET last_id = (SELECT IFNULL(MAX(id), 0) FROM convicts) WHERE name = ?',
+                       (name,))
+    
+    def _update_court_decisions(self, cursor):
+        """Разбирает информацию о приговоре для записей, которые еще не разобраны"""
+        for convict_id, court_info in self._pending_rows(cursor, 'court_decisions', 'court_info'):
+            decision = parse_court_decision(court_info)
+            if decision is None:
+                continue
+            
+            cursor.execute('''
+            INSERT INTO court_decisions (
+                convict_id, decision_date, court_name, court_key,
+                punishment, term_months, conditional, probation_months
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                convict_id, decision['decision_date'], decision['court_name'], decision['court_key'],
+                decision['punishment'], decision['term_months'], decision['conditional'],
+                decision['probation_months']
+            ))
+            decision_id = cursor.lastrowid
+            cursor.executemany(
+                'INSERT INTO court_articles (decision_id, article, part, point) VALUES (?, ?, ?, ?)',
+                [(decision_id,) + tuple(article) for article in decision['articles']]
+            )
+    
+    def _update_restrictions(self, cursor):
+        """Разбирает обязанности (столбец L) для записей, которые еще не разобраны"""
+        type_ids = dict(cursor.execute('SELECT code, id FROM restriction_types'))
+        
+        # Вид, которого нет в справочнике базы, пропускается
+        rows = [(type_ids[code], convict_id)
+                for convict_id, restrictions in self._pending_rows(cursor, 'restrictions', 'restrictions')
+                for code in parse_restrictions(restrictions) if code in type_ids]
+        cursor.executemany('INSERT OR IGNORE INTO convict_restrictions (type_id, convict_id) VALUES (?, ?)', rows)
+    
+    def _update_phone_numbers(self, cursor):
+        """
+        Заполняет телефон в формате E.164 для записей, импортированных до появления столбца
+        (каждая запись просматривается один раз, в том числе значения, не похожие на телефон)
+        """
+        rows = []
+        for convict_id, phone in self._pending_rows(cursor, 'phone_numbers', 'phone'):
+            number = normalize_phone(phone)
+            if number is not None:
+                rows.append((number, convict_id))
+        cursor.executemany('UPDATE convicts SET phone_number = ? WHERE id = ?', rows)
+    
+    def _update_addresses(self, cursor):
+        """Связывает с таблицей addresses записи, адрес которых еще не разбирался"""
+        street_ids = dict(cursor.execute('SELECT name, id FROM streets'))
+        
+        links = []
+        address_ids = {}
+        for convict_id, address in self._pending_rows(cursor, 'addresses', 'address'):
+            parsed = parse_address(address)
+            if parsed is None:
+                continue
+            street_id = street_ids.get(parsed.street)
+            key = address_key(address, parsed, street_id)
+            
+            if key not in address_ids:
+                cursor.execute('''
+                INSERT OR IGNORE INTO addresses (address_key, street_id, house, building, flat, address)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', (key, street_id, parsed.house, parsed.building, parsed.flat, address))
+                cursor.execute('SELECT id FROM addresses WHERE address_key = ?', (key,))
+                address_ids[key] = cursor.fetchone()[0]
+            
+            links.append((address_ids[key], convict_id))
+        
+        cursor.executemany('UPDATE convicts SET address_id = ? WHERE id = ?', links)
+    
+    def _convict_values(self, data):
+        """Значения для вставки записи об осужденном в порядке INSERT_CONVICT_SQL"""
         # Объединяем дополнительную информацию
         other_info = []
         if data.get('other_info_g'):
@@ -62,12 +357,7 @@ class DatabaseManager:
         
         other_info_text = ' | '.join(other_info) if other_info else None
         
-        cursor.execute('''
-        INSERT INTO convicts (
-            start_date, birth_date, end_date, court_info, 
-            restrictions, full_name, address, phone, other_info_g, other_info_h, other_info_q
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        return (
             data.get('start_date'),
             data.get('birth_date'),
             data.get('end_date'),
@@ -78,14 +368,114 @@ class DatabaseManager:
             data.get('phone'),
             data.get('other_info_g'),
             data.get('other_info_h'),
-            other_info_text
-        ))
+            other_info_text,
+            data.get('dislocation'),
+            normalize_phone(data.get('phone'))
+        )
+    
+    def add_convict(self, data):
+        """Добавление нового осужденного в базу данных"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(INSERT_CONVICT_SQL, self._convict_values(data))
         
         convict_id = cursor.lastrowid
+        self._mark_inserted(cursor, 'phone_numbers')
+        self._update_name_keys(cursor)
+        self._update_court_decisions(cursor)
+        self._update_restrictions(cursor)
+        self._update_addresses(cursor)
         conn.commit()
         conn.close()
         return convict_id
     
+    def import_from_excel(self, excel_path, batch_size=1000, progress=None):
+        """
+        Потоковый импорт обработанного Excel-файла в базу данных
+        
+        Файл читается в режиме read_only построчно, записи вставляются пакетами
+        через executemany, поэтому расход памяти не зависит от размера файла
+        
+        Args:
+            excel_path (str): Путь к обработанному Excel-файлу
+            batch_size (int): Количество записей в одном пакете вставки
+            progress: Функция progress(имя листа, импортировано записей), вызывается
+                      в начале каждого листа и после каждого пакета
+            
+        Returns:
+            int: Количество импортированных записей
+        """
+        workbook = openpyxl.load_workbook(excel_path, read_only=True)
+        try:
+            return self.import_workbook(workbook, batch_size, progress)
+        finally:
+            workbook.close()
+    
+    def import_workbook(self, workbook, batch_size=1000, progress=None):
+        """
+        Импорт обработанной рабочей книги (из файла или построенной в памяти)
+        пакетными вставками через executemany
+        
+        Args:
+            workbook: Рабочая книга openpyxl (в том числе открытая в режиме read_only)
+            batch_size (int): Количество записей в одном пакете вставки
+            progress: Функция progress(имя листа, импортировано записей)
+            
+        Returns:
+            int: Количество импортированных записей
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        total_imported = 0
+        batch = []
+        
+        def flush():
+            cursor.executemany(INSERT_CONVICT_SQL, batch)
+            self._mark_inserted(cursor, 'phone_numbers')
+            conn.commit()
+            batch.clear()
+        
+        try:
+            for sheet in workbook.worksheets:
+                if progress:
+                    progress(sheet.title, total_imported)
+                
+                for values in sheet.iter_rows(values_only=True, max_col=max(EXCEL_COLUMNS.values())):
+                    # Пустая строка в книге из памяти равнозначна пустой ячейке в сохраненном файле
+                    data = {
+                        field: None if values[column - 1] == '' else values[column - 1]
+                        for field, column in EXCEL_COLUMNS.items()
+                    }
+                    
+                    # Импортируем только строки, в которых есть ФИО
+                    if not data['full_name']:
+                        continue
+                    
+                    batch.append(self._convict_values(data))
+                    total_imported += 1
+                    
+                    if len(batch) >= batch_size:
+                        flush()
+                        if progress:
+                            progress(sheet.title, total_imported)
+            
+            if batch:
+                flush()
+            
+            # Индексируем ФИО новых записей для нечеткого поиска, разбираем приговоры,
+            # обязанности и адреса
+            self._update_name_keys(cursor)
+            self._update_court_decisions(cursor)
+            self._update_restrictions(cursor)
+            self._update_addresses(cursor)
+            conn.commit()
+        finally:
+            conn.close()
+        
+        return total_imported
+    
     def add_characteristic(self, convict_id, characteristic_type, text, is_template=False):
         """Добавление характеристики"""
         conn = sqlite3.connect(self.db_path)
@@ -110,6 +500,307 @@ class DatabaseManager:
         conn.close()
         return convicts
     
+    def find_similar_names(self, full_name, limit=10, min_similarity=0.0):
+        """
+        Нечеткий поиск осужденных по ФИО через индекс фонетических ключей
+        
+        Кандидаты выбираются по индексу (фамилия с инициалом, затем фамилия, затем
+        все слова): уровни добавляются, пока кандидатов меньше limit. На уровне слов
+        база сама отбирает записи с наибольшим числом совпавших слов (не больше
+        limit * WORD_TIER_CANDIDATES). Сходство считается только для кандидатов
+        
+        Args:
+            full_name (str): Искомое ФИО
+            limit (int): Количество результатов
+            min_similarity (float): Минимальное сходство (от 0 до 1)
+            
+        Returns:
+            list: Кортежи (id, ФИО, сходство) по убыванию сходства
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        *surname_tiers, word_tier = candidate_tiers(name_keys(full_name))
+        
+        candidates = {}
+        for tier in surname_tiers:
+            if not tier:
+                continue
+            placeholders = ', '.join('?' * len(tier))
+            cursor.execute(f'''
+            SELECT DISTINCT c.id, c.full_name FROM name_keys k
+            JOIN convicts c ON c.id = k.convict_id
+            WHERE k.key IN ({placeholders})
+            ''', sorted(tier))
+            candidates.update(cursor.fetchall())
+            if len(candidates) >= limit:
+                break
+        
+        if len(candidates) < limit and word_tier:
+            # Записи, совпавшие по одному частому слову (например, по имени),
+            # не загружаются: отбор и ограничение выполняются в запросе
+            placeholders = ', '.join('?' * len(word_tier))
+            cursor.execute(f'''
+            SELECT c.id, c.full_name FROM name_keys k
+            JOIN convicts c ON c.id = k.convict_id
+            WHERE k.key IN ({placeholders})
+            GROUP BY c.id
+            HAVING COUNT(*) >= ?
+            ORDER BY COUNT(*) DESC, c.id
+            LIMIT ?
+            ''', sorted(word_tier) + [min(WORD_TIER_MIN_MATCHES, len(word_tier)), limit * WORD_TIER_CANDIDATES])
+            candidates.update(cursor.fetchall())
+        
+        conn.close()
+        
+        ranked = rank_candidates(full_name, candidates.items(), limit)
+        return [item for item in ranked if item[2] >= min_similarity]
+    
+    def find_possible_duplicates(self, min_similarity=0.8):
+        """
+        Поиск возможных дублей: записи с одинаковым ключом фамилии и инициала имени
+        и близкими ФИО (попарно сравниваются только записи внутри одного ключа)
+        
+        Args:
+            min_similarity (float): Минимальное сходство ФИО (от 0 до 1)
+            
+        Returns:
+            list: Кортежи (id1, ФИО1, id2, ФИО2, сходство)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT k.key, c.id, c.full_name FROM name_keys k
+        JOIN convicts c ON c.id = k.convict_id
+        WHERE k.key LIKE ? ORDER BY k.key, c.id
+        ''', (SURNAME_INITIAL_KEY + '%',))
+        
+        groups = {}
+        for key, convict_id, full_name in cursor.fetchall():
+            groups.setdefault(key, []).append((convict_id, full_name))
+        
+        conn.close()
+        
+        duplicates = {}
+        for group in groups.values():
+            for index, (first_id, first_name) in enumerate(group):
+                for second_id, second_name in group[index + 1:]:
+                    similarity = name_similarity(first_name, second_name)
+                    if similarity >= min_similarity:
+                        duplicates[(first_id, second_id)] = (first_id, first_name, second_id, second_name, similarity)
+        
+        return list(duplicates.values())
+    
+    def find_by_article(self, article, part=None):
+        """
+        Поиск осужденных по статье УК (по индексу court_articles)
+        
+        Args:
+            article (str): Номер статьи: "228", "228.1"
+            part (int): Часть статьи (None - любая)
+            
+        Returns:
+            list: Кортежи (id, ФИО, дата приговора, суд, часть, пункты)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        query = '''
+        SELECT c.id, c.full_name, d.decision_date, d.court_name, a.part, a.point
+        FROM court_articles a
+        JOIN court_decisions d ON d.id = a.decision_id
+        JOIN convicts c ON c.id = d.convict_id
+        WHERE a.article = ?
+        '''
+        params = [str(article).replace(' ', '')]
+        
+        if part is not None:
+            query += ' AND a.part = ?'
+            params.append(part)
+        
+        cursor.execute(query + ' ORDER BY d.decision_date, c.id', params)
+        convicts = cursor.fetchall()
+        
+        conn.close()
+        return convicts
+    
+    def find_court_decisions(self, court=None, year=None):
+        """
+        Поиск приговоров по суду и году (по индексу court_key, decision_date)
+        
+        Args:
+            court (str): Суд в любом написании: "Калининский р/с", "Калининским районным судом"
+            year (int): Год приговора (None - любой)
+            
+        Returns:
+            list: Кортежи (id осужденного, ФИО, дата приговора, суд, вид наказания, срок в месяцах)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        query = '''
+        SELECT c.id, c.full_name, d.decision_date, d.court_name, d.punishment, d.term_months
+        FROM court_decisions d
+        JOIN convicts c ON c.id = d.convict_id
+        WHERE 1=1
+        '''
+        params = []
+        
+        if court:
+            query += ' AND d.court_key = ?'
+            params.append(court_key(court))
+        
+        if year:
+            # Диапазон дат вместо strftime, чтобы использовался индекс
+            query += ' AND d.decision_date BETWEEN ? AND ?'
+            params.extend((f"{year}-01-01", f"{year}-12-31"))
+        
+        cursor.execute(query + ' ORDER BY d.decision_date, c.id', params)
+        decisions = cursor.fetchall()
+        
+        conn.close()
+        return decisions
+    
+    def get_restriction_types(self):
+        """
+        Справочник видов обязанностей
+        
+        Returns:
+            list: Кортежи (id, код, название, количество осужденных)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT t.id, t.code, t.name, COUNT(r.convict_id) FROM restriction_types t
+        LEFT JOIN convict_restrictions r ON r.type_id = t.id
+        GROUP BY t.id ORDER BY t.id
+        ''')
+        types = cursor.fetchall()
+        
+        conn.close()
+        return types
+    
+    def find_by_restriction(self, code):
+        """
+        Поиск осужденных с обязанностью указанного вида (по индексу convict_restrictions)
+        
+        Args:
+            code (str): Код вида обязанности (см. restriction_parser.RESTRICTION_TYPES), например "curfew"
+            
+        Returns:
+            list: Кортежи (id, ФИО, обязанности)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT c.id, c.full_name, c.restrictions FROM convict_restrictions r
+        JOIN restriction_types t ON t.id = r.type_id
+        JOIN convicts c ON c.id = r.convict_id
+        WHERE t.code = ?
+        ORDER BY c.id
+        ''', (code,))
+        convicts = cursor.fetchall()
+        
+        conn.close()
+        return convicts
+    
+    def find_by_address(self, address):
+        """
+        Поиск осужденных, проживающих по адресу (по уникальному индексу address_key)
+        
+        Args:
+            address (str): Адрес в формате столбца O: "ул. Бутлерова 11-2-45" (тип улицы необязателен)
+            
+        Returns:
+            list: Кортежи (id, ФИО, адрес)
+        """
+        parsed = parse_address(address)
+        if parsed is None:
+            return []
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT id FROM streets WHERE name = ?', (parsed.street,))
+        street = cursor.fetchone()
+        
+        cursor.execute('''
+        SELECT c.id, c.full_name, c.address FROM addresses a
+        JOIN convicts c ON c.address_id = a.id
+        WHERE a.address_key = ?
+        ORDER BY c.id
+        ''', (address_key(address, parsed, street[0] if street else None),))
+        convicts = cursor.fetchall()
+        
+        conn.close()
+        return convicts
+    
+    def find_by_street(self, street, house=None):
+        """
+        Поиск осужденных, проживающих на улице (по индексу addresses (street_id, house))
+        
+        Args:
+            street (str): Название улицы без учета регистра и "ё": "Бутлерова", "непокоренных"
+            house (str): Номер дома (None - любой)
+            
+        Returns:
+            list: Кортежи (id, ФИО, адрес, дом, корпус, квартира)
+        """
+        parsed = parse_address(street)
+        if parsed is None or parsed.street is None:
+            return []
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        query = '''
+        SELECT c.id, c.full_name, c.address, a.house, a.building, a.flat FROM streets s
+        JOIN addresses a ON a.street_id = s.id
+        JOIN convicts c ON c.address_id = a.id
+        WHERE s.name = ?
+        '''
+        params = [parsed.street]
+        
+        if house is not None:
+            query += ' AND a.house = ?'
+            params.append(str(house).upper().replace('Ё', 'Е'))
+        
+        cursor.execute(query + ' ORDER BY a.house, a.building, a.flat, c.id', params)
+        convicts = cursor.fetchall()
+        
+        conn.close()
+        return convicts
+    
+    def find_by_phone(self, prefix):
+        """
+        Поиск осужденных по началу номера телефона (диапазон по индексу phone_number)
+        
+        Args:
+            prefix (str): Начало номера: "921123", "+7 921", "8 921" (см. phone_prefix_range)
+            
+        Returns:
+            list: Кортежи (id, ФИО, телефон как в документе, телефон в формате E.164)
+        """
+        bounds = phone_prefix_range(prefix)
+        if bounds is None:
+            return []
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT id, full_name, phone, phone_number FROM convicts
+        WHERE phone_number BETWEEN ? AND ?
+        ORDER BY phone_number, id
+        ''', bounds)
+        convicts = cursor.fetchall()
+        
+        conn.close()
+        return convicts
+    
     def get_characteristics(self, convict_id=None, characteristic_type=None):
         """Получение характеристик"""
         conn = sqlite3.connect(self.db_path)
@@ -1,14 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
 from database_manager import DatabaseManager
 
+# Интервал проверки готовности фоновых запросов (мс)
+POLL_INTERVAL_MS = 20
+
 class DatabaseViewer:
     def __init__(self, parent):
         self.window = tk.Toplevel(parent)
         self.window.title("Просмотр базы данных")
         self.window.geometry("1200x800")
         
-        self.db_manager = DatabaseManager()
+        # Запросы к базе выполняются в фоновом потоке, чтобы окно не зависало.
+        # Один поток - запросы выполняются по очереди, в порядке отправки
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.db_manager = None
+        
+        # Номер последнего запроса характеристик: ответы на более ранние запросы
+        # (пользователь уже выбрал другую строку) отбрасываются
+        self.characteristics_request = 0
+        self.characteristics_future = None
+        
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
         
         # Создаем интерфейс
         self.create_gui()
@@ -16,6 +30,53 @@ class DatabaseViewer:
         # Загружаем данные
         self.load_data()
     
+    def close(self):
+        """Закрытие окна: незапущенные запросы отменяются"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.window.destroy()
+    
+    def _database(self):
+        """Менеджер базы данных (создается в фоновом потоке при первом запросе)"""
+        if self.db_manager is None:
+            self.db_manager = DatabaseManager()
+        return self.db_manager
+    
+    def run_async(self, query, on_done, on_error=None):
+        """
+        Выполняет запрос к базе в фоновом потоке, результат передается в поток Tk
+        
+        Args:
+            query: Функция query(db_manager), выполняемая в фоновом потоке
+            on_done: Функция on_done(результат), вызывается в потоке Tk
+            on_error: Функция on_error(исключение), вызывается в потоке Tk
+                      (по умолчанию - сообщение об ошибке)
+            
+        Returns:
+            Future: Запрос (можно отменить, пока он не начал выполняться)
+        """
+        future = self.executor.submit(lambda: query(self._database()))
+        
+        def poll():
+            # Окно могло быть закрыто, пока выполнялся запрос
+            if not self.window.winfo_exists():
+                return
+            if not future.done():
+                self.window.after(POLL_INTERVAL_MS, poll)
+                return
+            if future.cancelled():
+                return
+            
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                messagebox.showerror("Ошибка", f"Ошибка при обращении к базе данных: {error}", parent=self.window)
+        
+        self.window.after(POLL_INTERVAL_MS, poll)
+        return future
+    
     def create_gui(self):
         """Создание графического интерфейса"""
         # Создаем фрейм с разделителем
@@ -105,13 +166,15 @@ class DatabaseViewer:
                   command=self.delete_characteristic).pack(pady=5)
     
     def load_data(self):
-        """Загрузка данных из базы данных"""
+        """Загрузка данных из базы данных (в фоновом потоке)"""
+        self.run_async(lambda db_manager: db_manager.get_convicts(), self.show_convicts)
+    
+    def show_convicts(self, convicts):
+        """Отображение списка осужденных"""
         # Очищаем существующие данные
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        # Загружаем данные
-        convicts = self.db_manager.get_convicts()
         for convict in convicts:
             self.tree.insert("", tk.END, values=(
                 convict[0],  # id
@@ -133,13 +196,32 @@ class DatabaseViewer:
         self.load_characteristics(convict_id)
     
     def load_characteristics(self, convict_id):
-        """Загрузка характеристик для выбранного осужденного"""
+        """Загрузка характеристик для выбранного осужденного (в фоновом потоке)"""
         # Очищаем существующие данные
         for item in self.char_tree.get_children():
             self.char_tree.delete(item)
         
-        # Загружаем характеристики
-        characteristics = self.db_manager.get_characteristics(convict_id=convict_id)
+        # Предыдущий запрос больше не нужен: отменяем, если он еще в очереди
+        if self.characteristics_future is not None:
+            self.characteristics_future.cancel()
+        
+        self.characteristics_request += 1
+        request = self.characteristics_request
+        
+        def show(characteristics):
+            # Пока выполнялся запрос, пользователь выбрал другого осужденного
+            if request == self.characteristics_request:
+                self.show_characteristics(characteristics)
+        
+        self.characteristics_future = self.run_async(
+            lambda db_manager: db_manager.get_characteristics(convict_id=convict_id), show
+        )
+    
+    def show_characteristics(self, characteristics):
+        """Отображение характеристик выбранного осужденного"""
+        for item in self.char_tree.get_children():
+            self.char_tree.delete(item)
+        
         for char in characteristics:
             type_text = {
                 "positive": "Положительная",
@@ -173,13 +255,31 @@ class DatabaseViewer:
                 return
             
             convict_id = self.tree.item(selection[0])["values"][0]
-            self.db_manager.add_characteristic(convict_id, char_type, text)
             
-            # Обновляем список характеристик
-            self.load_characteristics(convict_id)
-            dialog.destroy()
+            # Повторное нажатие до завершения записи не создаст дубль
+            save_button.config(state=tk.DISABLED)
+            
+            def saved(_):
+                if dialog.winfo_exists():
+                    dialog.destroy()
+                # Обновляем список характеристик, если осужденный все еще выбран
+                current = self.tree.selection()
+                if current and self.tree.item(current[0])["values"][0] == convict_id:
+                    self.load_characteristics(convict_id)
+            
+            def failed(error):
+                if not dialog.winfo_exists():
+                    return
+                save_button.config(state=tk.NORMAL)
+                messagebox.showerror("Ошибка", f"Не удалось сохранить характеристику: {error}", parent=dialog)
+            
+            self.run_async(
+                lambda db_manager: db_manager.add_characteristic(convict_id, char_type, text),
+                saved, failed
+            )
         
-        ttk.Button(dialog, text="Сохранить", command=save).pack(pady=5)
+        save_button = ttk.Button(dialog, text="Сохранить", command=save)
+        save_button.pack(pady=5)
     
     def delete_characteristic(self):
         """Удаление выбранной характеристики"""
@@ -1,32 +1,14 @@
-import re
 from datetime import datetime
+from date_tokenizer import DATE_TOKENIZER, normalize_date, unique_dates
 
 def _extract_all_dates_from_text(text):
     """
-    Извлекает все даты из текста в виде списка
+    Извлекает все даты из текста в виде списка (в порядке приоритета форматов)
     
     Например, из "14.07.25 14.08.25" извлечет ["14.07.25", "14.08.25"]
     Также обрабатывает даты с пробелами: "13. 05. 2024" -> ["13. 05. 2024"]
     """
-    # Шаблоны для поиска дат в тексте
-    date_patterns = [
-        r'\d{1,2}\s*\.\s*\d{1,2}\s*\.\s*\d{2,4}',  # ДД.ММ.ГГ или ДД.ММ.ГГГГ (с возможными пробелами)
-        r'\d{1,2}\s*/\s*\d{1,2}\s*/\s*\d{2,4}',    # ДД/ММ/ГГ или ДД/ММ/ГГГГ (с возможными пробелами)
-        r'\d{1,2}\s*-\s*\d{1,2}\s*-\s*\d{2,4}',    # ДД-ММ-ГГ или ДД-ММ-ГГГГ (с возможными пробелами)
-        r'\d{2}\d{2}\s*\.\s*\d{2}',                # ДДММ.ГГ (с возможными пробелами)
-        r'\d{8}'                                   # ДДММГГГГ
-    ]
-    
-    # Список для найденных дат
-    found_dates = []
-    
-    # Ищем все даты в тексте по шаблонам
-    for pattern in date_patterns:
-        matches = re.findall(pattern, text)
-        found_dates.extend(matches)
-    
-    # Удаляем возможные дубликаты
-    return list(dict.fromkeys(found_dates))
+    return [token.text for token in unique_dates(DATE_TOKENIZER.iter_dates(text))]
 
 def _parse_and_normalize_date(date_str):
     """
@@ -42,65 +24,7 @@ def _parse_and_normalize_date(date_str):
     - ДД-ММ-ГГ -> ДД.ММ.ГГГГ
     - ДДММГГГГ -> ДД.ММ.ГГГГ (без разделителей)
     """
-    # Удаляем пробелы перед обработкой, чтобы упростить регулярные выражения
-    clean_date_str = re.sub(r'\s+', '', date_str)
-    
-    # Проверяем различные форматы даты
-    
-    # Формат ДД.ММ.ГГ (двузначный год)
-    match = re.match(r'^(\d{1,2})\.(\d{1,2})\.(\d{2})$', clean_date_str)
-    if match:
-        day, month, year = match.groups()
-        full_year = _expand_year(year)
-        return f"{int(day):02d}.{int(month):02d}.{full_year}"
-    
-    # Формат ДД.ММ.ГГГГ (четырехзначный год)
-    match = re.match(r'^(\d{1,2})\.(\d{1,2})\.(\d{4})$', clean_date_str)
-    if match:
-        day, month, year = match.groups()
-        return f"{int(day):02d}.{int(month):02d}.{year}"
-    
-    # Формат ДДММ.ГГ (пропущена точка между днем и месяцем)
-    match = re.match(r'^(\d{2})(\d{2})\.(\d{2})$', clean_date_str)
-    if match:
-        day, month, year = match.groups()
-        full_year = _expand_year(year)
-        return f"{int(day):02d}.{int(month):02d}.{full_year}"
-    
-    # Формат ДДММГГГГ (без разделителей)
-    match = re.match(r'^(\d{2})(\d{2})(\d{4})$', clean_date_str)
-    if match:
-        day, month, year = match.groups()
-        return f"{int(day):02d}.{int(month):02d}.{year}"
-    
-    # Формат ДД/ММ/ГГ
-    match = re.match(r'^(\d{1,2})/(\d{1,2})/(\d{2})$', clean_date_str)
-    if match:
-        day, month, year = match.groups()
-        full_year = _expand_year(year)
-        return f"{int(day):02d}.{int(month):02d}.{full_year}"
-    
-    # Формат ДД/ММ/ГГГГ
-    match = re.match(r'^(\d{1,2})/(\d{1,2})/(\d{4})$', clean_date_str)
-    if match:
-        day, month, year = match.groups()
-        return f"{int(day):02d}.{int(month):02d}.{year}"
-    
-    # Формат ДД-ММ-ГГ
-    match = re.match(r'^(\d{1,2})-(\d{1,2})-(\d{2})$', clean_date_str)
-    if match:
-        day, month, year = match.groups()
-        full_year = _expand_year(year)
-        return f"{int(day):02d}.{int(month):02d}.{full_year}"
-    
-    # Формат ДД-ММ-ГГГГ
-    match = re.match(r'^(\d{1,2})-(\d{1,2})-(\d{4})$', clean_date_str)
-    if match:
-        day, month, year = match.groups()
-        return f"{int(day):02d}.{int(month):02d}.{year}"
-    
-    # Если ни один из форматов не подошел, возвращаем None
-    return None
+    return normalize_date(DATE_TOKENIZER.parse(date_str), _expand_year)
 
 def _expand_year(year_str):
     """
@@ -0,0 +1,148 @@
+import re
+from collections import namedtuple
+
+# Найденная в тексте дата: позиция (start, end), день, месяц и год в исходном виде,
+# формат записи и исходный текст даты
+DateToken = namedtuple('DateToken', ['span', 'day', 'month', 'year', 'format', 'text'])
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Форматы дат в порядке приоритета. Все даты текста ищутся по форматам по очереди:
+# сначала все даты первого формата, затем второго и т.д. (порядок важен для
+# _process_end_dates, где из двух дат берется вторая)
+DATE_FORMATS = (
+    ('dot', r'(\d{1,2})\s*\.\s*(\d{1,2})\s*\.\s*(\d{2,4})'),    # ДД.ММ.ГГ(ГГ), допускаются пробелы
+    ('slash', r'(\d{1,2})\s*/\s*(\d{1,2})\s*/\s*(\d{2,4})'),    # ДД/ММ/ГГ(ГГ)
+    ('dash', r'(\d{1,2})\s*-\s*(\d{1,2})\s*-\s*(\d{2,4})'),     # ДД-ММ-ГГ(ГГ)
+    ('ddmm.yy', r'(\d{2})(\d{2})\s*\.\s*(\d{2})'),               # ДДММ.ГГ (пропущена точка)
+    ('ddmmyyyy', r'(\d{2})(\d{2})(\d{4})'),                      # ДДММГГГГ (без разделителей)
+)
+
+# Строгие форматы для первой даты и проверки ячейки на дату: пробелы допускаются
+# только вокруг точек в ДД.ММ.ГГГГ ("12 /08/1978" - не дата)
+STRICT_DATE_FORMATS = (
+    ('dot', r'(\d{1,2})\s*\.\s*(\d{1,2})\s*\.\s*(\d{2,4})'),
+    ('slash', r'(\d{1,2})/(\d{1,2})/(\d{2,4})'),
+    ('dash', r'(\d{1,2})-(\d{1,2})-(\d{2,4})'),
+    ('ddmm.yy', r'(\d{2})(\d{2})\.(\d{2})'),
+    ('ddmmyyyy', r'(\d{2})(\d{2})(\d{4})'),
+)
+
+
+class DateTokenizer:
+    """
+    Сканер дат: форматы скомпилированы один раз и проверяются в порядке приоритета
+
+    Для поиска даты в любом месте текста без учета приоритета (earliest_date,
+    удаление всех дат) есть общее выражение pattern со всеми форматами
+    """
+
+    def __init__(self, formats=DATE_FORMATS):
+        """
+        Args:
+            formats (tuple): Пары (название, шаблон с группами день, месяц, год)
+                             в порядке приоритета
+        """
+        self.formats = [(name, re.compile(pattern)) for name, pattern in formats]
+        # Каждый формат - внешняя группа и три вложенные (день, месяц, год)
+        self.pattern = re.compile('|'.join(f'({pattern})' for _, pattern in formats))
+        self.format_names = [name for name, _ in formats]
+
+    def _token(self, match, name):
+        """Преобразует совпадение формата name в DateToken"""
+        day, month, year = match.groups()
+        return DateToken(match.span(), day, month, year, name, match.group())
+
+    def iter_dates(self, text):
+        """
+        Находит все даты в тексте
+
+        Args:
+            text (str): Исходный текст
+
+        Yields:
+            DateToken: Даты в порядке приоритета форматов, внутри формата - по тексту
+        """
+        for name, pattern in self.formats:
+            for match in pattern.finditer(text):
+                yield self._token(match, name)
+
+    def first_date(self, text):
+        """Возвращает первую дату самого приоритетного из найденных форматов или None"""
+        for name, pattern in self.formats:
+            match = pattern.search(text)
+            if match:
+                return self._token(match, name)
+        return None
+
+    def earliest_date(self, text):
+        """Возвращает дату, которая встречается в тексте раньше остальных, или None"""
+        match = self.pattern.search(text)
+        if match is None:
+            return None
+        # lastindex указывает на внешнюю группу сработавшего формата
+        base = match.lastindex
+        return DateToken(match.span(), match.group(base + 1), match.group(base + 2),
+                         match.group(base + 3), self.format_names[(base - 1) // 4], match.group(base))
+
+    def match_start(self, text):
+        """Возвращает дату, с которой начинается текст, или None"""
+        for name, pattern in self.formats:
+            match = pattern.match(text)
+            if match:
+                return self._token(match, name)
+        return None
+
+    def parse(self, text):
+        """
+        Разбирает строку, целиком состоящую из даты (пробелы игнорируются)
+
+        Returns:
+            DateToken: Дата или None, если строка не является датой
+        """
+        text = WHITESPACE_RE.sub('', text)
+        for name, pattern in self.formats:
+            match = pattern.fullmatch(text)
+            if match:
+                return self._token(match, name)
+        return None
+
+
+def normalize_date(token, expand_year):
+    """
+    Приводит дату к формату ДД.ММ.ГГГГ
+
+    Args:
+        token (DateToken): Найденная дата
+        expand_year: Функция преобразования двузначного года в четырехзначный
+
+    Returns:
+        str: Дата в формате ДД.ММ.ГГГГ или None, если год не двух- и не четырехзначный
+    """
+    if token is None:
+        return None
+
+    if len(token.year) == 2:
+        year = expand_year(token.year)
+    elif len(token.year) == 4:
+        year = token.year
+    else:
+        return None
+
+    return f"{int(token.day):02d}.{int(token.month):02d}.{year}"
+
+
+def unique_dates(tokens):
+    """Оставляет только первое вхождение каждой даты (по исходному тексту)"""
+    seen = set()
+    result = []
+    for token in tokens:
+        if token.text not in seen:
+            seen.add(token.text)
+            result.append(token)
+    return result
+
+
+# Общие экземпляры сканера (регулярные выражения компилируются один раз)
+DATE_TOKENIZER = DateTokenizer()
+STRICT_DATE_TOKENIZER = DateTokenizer(STRICT_DATE_FORMATS)
@@ -0,0 +1,301 @@
+import openpyxl
+
+from docx_to_excel_processor import DocxToExcelProcessor
+from date_tokenizer import STRICT_DATE_TOKENIZER, normalize_date
+from name_index import normalize_name, name_trigrams, trigram_similarity
+
+# Столбец основного реестра, в который записывается дислокация (R)
+DISLOCATION_COLUMN = 18
+
+# Столбцы основного реестра после обработки: ФИО (N) и дата рождения (C)
+NAME_COLUMN = 14
+BIRTH_DATE_COLUMN = 3
+
+# Ключевые слова заголовков таблицы дислокации
+NAME_HEADERS = ('фио', 'ф.и.о', 'фамилия')
+BIRTH_DATE_HEADERS = ('рожд',)
+SKIP_HEADERS = ('№', 'п/п', 'номер')
+
+# Минимальное сходство ФИО для нечеткого совпадения при одинаковой дате рождения
+FUZZY_NAME_SIMILARITY = 0.6
+
+
+class DislocationIndex:
+    """
+    Индекс таблицы дислокации: словарь (нормализованное ФИО, дата рождения) -> записи
+
+    Таблица разбирается один раз, поиск по ключу выполняется за O(1),
+    поэтому объединение с реестром линейно по числу строк. Если точного совпадения
+    нет, ФИО сравниваются нечетко, но только среди записей с той же датой рождения
+    """
+
+    def __init__(self, processor=None):
+        """
+        Args:
+            processor (DocxToExcelProcessor): Процессор для чтения DOCX и нормализации дат
+        """
+        self.processor = processor or DocxToExcelProcessor()
+        self.entries = {}
+        # Дата рождения -> {нормализованное ФИО: триграммы} для нечеткого сравнения;
+        # триграммы строятся по исходному ФИО, чтобы учесть слитные слова и варианты в скобках
+        self.by_birth_date = {}
+        # Раскладка столбцов последнего заголовка: продолжения таблицы на следующих
+        # страницах часто идут отдельными таблицами без заголовка
+        self.columns = None
+        self.rows_indexed = 0
+        self.rows_skipped = 0
+
+    def key(self, name, birth_date):
+        """
+        Ключ индекса для пары ФИО + дата рождения
+
+        Returns:
+            tuple: (ФИО, дата ДД.ММ.ГГГГ) или None, если ФИО или дату не удалось разобрать
+        """
+        name = normalize_name(name)
+        if not name or not birth_date:
+            return None
+
+        token = STRICT_DATE_TOKENIZER.first_date(str(birth_date))
+        date = normalize_date(token, self.processor._expand_year)
+        if not date:
+            return None
+
+        return name, date
+
+    def load_docx(self, docx_path):
+        """
+        Загружает таблицы дислокации из DOCX файла
+
+        Args:
+            docx_path (str): Путь к DOCX файлу с дислокацией
+
+        Returns:
+            int: Количество проиндексированных записей
+        """
+        for table in self.processor.extract_tables(docx_path):
+            self.add_table(table)
+        return self.rows_indexed
+
+    def add_table(self, table):
+        """
+        Добавляет в индекс строки таблицы дислокации
+
+        Столбцы ФИО и даты рождения определяются по заголовку; все прочие
+        непустые столбцы (кроме номера по порядку) считаются дислокацией.
+        Таблица без заголовка разбирается по раскладке предыдущей таблицы;
+        строки до первого заголовка в файле пропускаются. Каждая строка,
+        не попавшая в индекс (в том числе заголовок), учитывается в rows_skipped.
+
+        Args:
+            table (list): Строки таблицы (списки значений ячеек)
+        """
+        header_found = False
+
+        for row in table:
+            # Пока в таблице не встретился заголовок, каждая строка проверяется на него
+            if not header_found:
+                header = self._detect_columns(row)
+                if header is not None:
+                    self.columns = header
+                    header_found = True
+                    self.rows_skipped += 1
+                    continue
+                if self.columns is None:
+                    self.rows_skipped += 1
+                    continue
+
+            columns = self.columns
+
+            name = row[columns['name']] if columns['name'] < len(row) else None
+            birth_date = row[columns['birth_date']] if columns['birth_date'] < len(row) else None
+            key = self.key(name, birth_date)
+
+            location = '; '.join(
+                str(row[index]).strip() for index in columns['location']
+                if index < len(row) and row[index] and str(row[index]).strip()
+            )
+
+            if key is None or not location:
+                self.rows_skipped += 1
+                continue
+
+            self.entries.setdefault(key, []).append(location)
+            candidates = self.by_birth_date.setdefault(key[1], {})
+            if key[0] not in candidates:
+                candidates[key[0]] = name_trigrams(name)
+            self.rows_indexed += 1
+
+    def _detect_columns(self, header):
+        """
+        Определяет по строке заголовка номера столбцов ФИО, даты рождения и дислокации
+
+        Returns:
+            dict: Номера столбцов или None, если строка не похожа на заголовок
+        """
+        headers = [str(value or '').strip().lower() for value in header]
+
+        def find(keywords):
+            return next((index for index, text in enumerate(headers)
+                         if any(keyword in text for keyword in keywords)), None)
+
+        name_column = find(NAME_HEADERS)
+        birth_date_column = find(BIRTH_DATE_HEADERS)
+        if name_column is None or birth_date_column is None:
+            return None
+
+        location = [
+            index for index, text in enumerate(headers)
+            if index not in (name_column, birth_date_column)
+            and text and not any(keyword in text for keyword in SKIP_HEADERS)
+        ]
+
+        return {'name': name_column, 'birth_date': birth_date_column, 'location': location}
+
+    def lookup(self, name, birth_date):
+        """
+        Ищет дислокацию по ФИО и дате рождения
+
+        Returns:
+            list: Найденные записи дислокации (пустой список, если совпадений нет)
+        """
+        key = self.key(name, birth_date)
+        return self.entries.get(key, []) if key else []
+
+    def fuzzy_key(self, key, name):
+        """
+        Ищет ключ с той же датой рождения и близким ФИО
+
+        Args:
+            key (tuple): Ключ (ФИО, дата рождения), не найденный в индексе
+            name (str): Исходное ФИО, по которому построен ключ
+
+        Returns:
+            tuple: Ключ индекса или None, если близких ФИО нет или лучших несколько
+        """
+        date = key[1]
+        candidates = self.by_birth_date.get(date)
+        if not candidates:
+            return None
+
+        query = name_trigrams(name)
+        scored = sorted(
+            ((trigram_similarity(query, trigrams), candidate) for candidate, trigrams in candidates.items()),
+            reverse=True
+        )
+        best_similarity, best_name = scored[0]
+        if best_similarity < FUZZY_NAME_SIMILARITY:
+            return None
+        if len(scored) > 1 and scored[1][0] == best_similarity:
+            return None
+
+        return best_name, date
+
+    def merge_into_workbook(self, workbook):
+        """
+        Записывает дислокацию в столбец R основного реестра
+
+        Каждая строка реестра ищется в индексе по ключу, поэтому объединение
+        выполняется за один проход по реестру. Строки с несколькими разными
+        записями дислокации не заполняются и попадают в отчет как неоднозначные.
+
+        Args:
+            workbook: Рабочая книга openpyxl с обработанным реестром
+
+        Returns:
+            dict: Отчет (matched, fuzzy, unmatched, ambiguous, unused)
+        """
+        report = {'matched': 0, 'fuzzy': [], 'unmatched': [], 'ambiguous': [], 'unused': []}
+        used_keys = set()
+
+        for sheet in workbook.worksheets:
+            for row in sheet.iter_rows(min_row=1, max_row=sheet.max_row, max_col=DISLOCATION_COLUMN):
+                name = row[NAME_COLUMN - 1].value
+                if not name:
+                    continue
+
+                birth_date = row[BIRTH_DATE_COLUMN - 1].value
+                key = self.key(name, birth_date)
+                locations = self.entries.get(key, []) if key else []
+                record = (sheet.title, row[0].row, str(name), birth_date)
+
+                # Нет точного совпадения - ищем близкое ФИО с той же датой рождения
+                if not locations and key:
+                    key = self.fuzzy_key(key, name)
+                    if key:
+                        locations = self.entries[key]
+                        report['fuzzy'].append(record + (key[0],))
+
+                if not locations:
+                    report['unmatched'].append(record)
+                    continue
+
+                used_keys.add(key)
+                # Повторы одной и той же записи не считаются неоднозначностью
+                distinct = list(dict.fromkeys(locations))
+                if len(distinct) > 1:
+                    report['ambiguous'].append(record + (' | '.join(distinct),))
+                    continue
+
+                row[DISLOCATION_COLUMN - 1].value = distinct[0]
+                report['matched'] += 1
+
+        # Записи дислокации, не найденные в реестре
+        report['unused'] = [
+            (name, date, ' | '.join(locations))
+            for (name, date), locations in self.entries.items()
+            if (name, date) not in used_keys
+        ]
+
+        return report
+
+
+def save_report(report, report_path):
+    """
+    Сохраняет отчет об объединении с дислокацией в Excel-файл
+    (листы "Не найдены", "Неоднозначные", "Нечеткие совпадения", "Без пары в реестре")
+
+    Args:
+        report (dict): Отчет DislocationIndex.merge_into_workbook
+        report_path (str): Путь к Excel-файлу отчета
+    """
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+
+    sheets = (
+        ("Не найдены", ("Лист", "Строка", "ФИО", "Дата рождения"), report['unmatched']),
+        ("Неоднозначные", ("Лист", "Строка", "ФИО", "Дата рождения", "Дислокация"), report['ambiguous']),
+        ("Нечеткие совпадения", ("Лист", "Строка", "ФИО", "Дата рождения", "ФИО в дислокации"), report['fuzzy']),
+        ("Без пары в реестре", ("ФИО", "Дата рождения", "Дислокация"), report['unused']),
+    )
+
+    for title, header, rows in sheets:
+        sheet = workbook.create_sheet(title)
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+
+    workbook.save(report_path)
+
+
+def merge_dislocation(workbook, dislocation_docx_path, processor=None):
+    """
+    Разбирает файл дислокации и объединяет его с реестром
+
+    Args:
+        workbook: Рабочая книга openpyxl с обработанным реестром
+        dislocation_docx_path (str): Путь к DOCX файлу с дислокацией
+        processor (DocxToExcelProcessor): Процессор для чтения DOCX
+
+    Returns:
+        dict: Отчет объединения (см. DislocationIndex.merge_into_workbook)
+              с количеством проиндексированных и пропущенных строк дислокации
+    """
+    index = DislocationIndex(processor)
+    index.load_docx(dislocation_docx_path)
+
+    report = index.merge_into_workbook(workbook)
+    report['rows_indexed'] = index.rows_indexed
+    report['rows_skipped'] = index.rows_skipped
+
+    return report
@@ -0,0 +1,270 @@
+import argparse
+import time
+
+import openpyxl
+
+from docx_to_excel_processor import DocxToExcelProcessor
+from b_column_parser import ImprovedAddressProcessor, process_address_columns
+from database_manager import DatabaseManager
+from dislocation import merge_dislocation
+from pipeline_metrics import PipelineMetrics
+from parse_cache import ParseCache, file_sha256, row_fingerprint, trim_row
+
+
+def process_tables(tables, processor, metrics, rows_deleted=None):
+    """
+    Собирает таблицы в книгу в памяти и применяет все правила обработки
+
+    Args:
+        tables (list): Таблицы, полученные из extract_tables
+        processor (DocxToExcelProcessor): Процессор документа
+        metrics (PipelineMetrics): Сборщик метрик этапов
+        rows_deleted (int): Таблицы уже приведены project_tables (значение - количество
+                            удаленных первых строк); None - привести здесь
+
+    Returns:
+        tuple: (рабочая книга, статистика обработки, статистика разбора адресов)
+    """
+    address_processor = ImprovedAddressProcessor()
+
+    # Столбцы A, C и заголовки отбрасываются до записи в книгу (без сдвига ячеек)
+    with metrics.stage("build_workbook"):
+        if rows_deleted is None:
+            tables, rows_deleted = processor.project_tables(tables)
+        workbook = processor.build_workbook(tables, adjust_width=False)
+
+    stats = processor.process_workbook(workbook, metrics, adjust_width=False, rows_deleted=rows_deleted)
+
+    # Разбор адресов и телефонов из столбцов B и D (как в GUI); литеры удаляются
+    # из адресов при разборе
+    address_stats = {}
+    for sheet in workbook.worksheets:
+        with metrics.stage("address_parsing", sheet=sheet.title, rows=sheet.max_row,
+                           text_bytes=metrics.text_size(sheet, 2, 4)):
+            process_address_columns(sheet, address_processor, (2, 4), address_stats)
+
+    return workbook, stats, address_stats
+
+
+def process_document(docx_path, processor, metrics):
+    """
+    Извлекает таблицы документа в книгу в памяти и применяет все правила обработки
+
+    Args:
+        docx_path (str): Путь к DOCX файлу
+        processor (DocxToExcelProcessor): Процессор документа
+        metrics (PipelineMetrics): Сборщик метрик этапов
+
+    Returns:
+        tuple: (рабочая книга, статистика обработки, статистика разбора адресов)
+    """
+    with metrics.stage("extract_tables"):
+        tables = processor.extract_tables(docx_path)
+
+    return process_tables(tables, processor, metrics)
+
+
+def process_document_incremental(docx_path, processor, cache, metrics, adjust_width=False):
+    """
+    Инкрементальная обработка: правила применяются только к новым и измененным строкам
+
+    Каждая строка таблицы получает отпечаток по ячейкам, с которыми работают правила
+    (без столбцов A и C, см. project_table), поэтому перенумерация строк не делает
+    их новыми; результаты обработки строк с известными отпечатками берутся из кэша.
+    
+    Новые строки обрабатываются вместе на отдельном листе, без соседних строк документа.
+    Результат совпадает с полной обработкой, пока каждое правило process_workbook и
+    разбора адресов читает и меняет только ячейки своей строки (заголовки и первые
+    строки таблиц отбрасываются project_tables до вычисления отпечатков). Правило,
+    зависящее от соседних строк, нарушит это совпадение: его проверяет
+    tests/test_incremental.py (сравнение с process_document после вставки, удаления,
+    изменения и перестановки строк).
+    Статистика обработки и разбора адресов относится только к обработанным строкам.
+
+    Args:
+        docx_path (str): Путь к DOCX файлу
+        processor (DocxToExcelProcessor): Процессор документа
+        cache (ParseCache): Кэш результатов обработки
+        metrics (PipelineMetrics): Сборщик метрик этапов
+        adjust_width (bool): Подбирать ширину столбцов (нужно только для сохранения в файл)
+
+    Returns:
+        tuple: (рабочая книга, статистика обработки, статистика разбора адресов,
+                статистика повторного использования: rows_total, rows_reused, rows_processed)
+    """
+    with metrics.stage("extract_tables"):
+        tables = processor.extract_tables(docx_path)
+
+    with metrics.stage("row_cache_lookup"):
+        data_rows, rows_deleted = processor.project_tables(tables)
+        fingerprints = [[row_fingerprint(row) for row in rows] for rows in data_rows]
+        cached_rows = cache.load_rows(fingerprint for table in fingerprints for fingerprint in table)
+
+    # Новые и измененные строки (одинаковые строки обрабатываются один раз)
+    new_rows = {}
+    for rows, table_fingerprints in zip(data_rows, fingerprints):
+        for row, fingerprint in zip(rows, table_fingerprints):
+            if fingerprint not in cached_rows:
+                new_rows.setdefault(fingerprint, row)
+
+    # Строки уже без заголовков и столбцов A, C; если новых строк нет, обрабатывается
+    # пустой лист (статистика при этом содержит все счетчики)
+    workbook, stats, address_stats = process_tables([list(new_rows.values())], processor, metrics,
+                                                    rows_deleted=0)
+    sheet = workbook.worksheets[0]
+    processed = {
+        fingerprint: trim_row(values)
+        for fingerprint, values in zip(new_rows, sheet.iter_rows(min_row=1, max_row=len(new_rows),
+                                                                 values_only=True))
+    }
+    with metrics.stage("row_cache_store"):
+        cache.store_rows(processed)
+    cached_rows.update(processed)
+
+    # Собираем итоговую книгу в исходном порядке строк
+    with metrics.stage("assemble_workbook"):
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+        for index, table_fingerprints in enumerate(fingerprints):
+            sheet = workbook.create_sheet(title=f"Таблица_{index + 1}")
+            for fingerprint in table_fingerprints:
+                sheet.append(cached_rows[fingerprint])
+            if adjust_width:
+                processor._adjust_column_width(sheet)
+
+    # Счетчики по всему документу, а не по обработанной части
+    stats['sheets_processed'] = len(tables)
+    stats['rows_deleted'] = rows_deleted
+
+    rows_total = sum(len(table) for table in fingerprints)
+    reuse_stats = {
+        'rows_total': rows_total,
+        'rows_reused': rows_total - sum(
+            1 for table in fingerprints for fingerprint in table if fingerprint in new_rows
+        ),
+        'rows_processed': len(new_rows)
+    }
+
+    return workbook, stats, address_stats, reuse_stats
+
+
+def docx_to_database(docx_path, db_path="convicts.db", metrics=None, batch_size=1000, dislocation_path=None,
+                     cache_path=None, incremental=False):
+    """
+    Быстрый путь DOCX -> SQLite без промежуточного Excel-файла
+
+    Таблицы документа собираются в рабочую книгу в памяти, к ней применяются те же
+    правила, что и при обработке Excel-файла (форматтеры, разбор адресов из столбцов
+    B и D с удалением литер из адресов), затем записи пакетно вставляются в базу.
+    Книга не сохраняется на диск, ширина столбцов не подбирается. Если указан кэш
+    и документ уже обрабатывался, обработка пропускается.
+
+    Args:
+        docx_path (str): Путь к DOCX файлу
+        db_path (str): Путь к базе данных
+        metrics (PipelineMetrics): Сборщик метрик этапов (по умолчанию создается новый)
+        batch_size (int): Количество записей в одном пакете вставки
+        dislocation_path (str): Путь к DOCX файлу с дислокацией (необязательно)
+        cache_path (str): Путь к кэшу результатов обработки (None - без кэша)
+        incremental (bool): Обрабатывать только новые и измененные строки (требуется кэш)
+
+    Returns:
+        dict: Статистика (imported, address_stats, dislocation, cache_hit, reuse, elapsed, rows_per_sec, metrics)
+    """
+    if incremental and not cache_path:
+        raise ValueError("Для инкрементальной обработки нужен кэш (cache_path)")
+
+    if metrics is None:
+        metrics = PipelineMetrics()
+
+    processor = DocxToExcelProcessor()
+
+    start = time.perf_counter()
+
+    cached = None
+    if cache_path:
+        cache = ParseCache(cache_path)
+        with metrics.stage("parse_cache_lookup"):
+            docx_hash = file_sha256(docx_path)
+            cached = cache.load(docx_hash)
+
+    reuse_stats = None
+    if cached:
+        workbook, cached_stats = cached
+        stats, address_stats = cached_stats['stats'], cached_stats['address_stats']
+    else:
+        if incremental:
+            workbook, stats, address_stats, reuse_stats = process_document_incremental(
+                docx_path, processor, cache, metrics
+            )
+        else:
+            workbook, stats, address_stats = process_document(docx_path, processor, metrics)
+        if cache_path:
+            with metrics.stage("parse_cache_store"):
+                cache.store(docx_hash, workbook, {'stats': stats, 'address_stats': address_stats})
+
+    dislocation_report = None
+    if dislocation_path:
+        with metrics.stage("dislocation_merge"):
+            dislocation_report = merge_dislocation(workbook, dislocation_path, processor)
+
+    with metrics.stage("database_import"):
+        imported = DatabaseManager(db_path).import_workbook(workbook, batch_size)
+
+    elapsed = time.perf_counter() - start
+
+    stats.update({
+        'imported': imported,
+        'cache_hit': bool(cached),
+        'reuse': reuse_stats,
+        'address_stats': address_stats,
+        'dislocation': dislocation_report,
+        'elapsed': elapsed,
+        'rows_per_sec': imported / elapsed if elapsed > 0 else None,
+        'metrics': metrics.report()
+    })
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Импорт DOCX реестра в базу данных без промежуточного Excel")
+    parser.add_argument("docx_path", help="путь к DOCX файлу")
+    parser.add_argument("--db", default="convicts.db", help="путь к базе данных")
+    parser.add_argument("--batch-size", type=int, default=1000, help="записей в одном пакете вставки")
+    parser.add_argument("--dislocation", metavar="DOCX", help="файл с дислокацией для объединения с реестром")
+    parser.add_argument("--cache", metavar="PATH", help="кэш результатов обработки (повторный запуск без изменений документа пропускает обработку)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="обрабатывать только новые и измененные строки (требуется --cache)")
+    parser.add_argument("--metrics-json", metavar="PATH", help="сохранить отчет о метриках в JSON")
+    parser.add_argument("--detailed-metrics", action="store_true",
+                        help="считать объем текста по этапам (дополнительный проход по столбцам)")
+    args = parser.parse_args()
+    if args.incremental and not args.cache:
+        parser.error("--incremental требует --cache")
+
+    metrics = PipelineMetrics(detailed=args.detailed_metrics)
+    stats = docx_to_database(args.docx_path, args.db, metrics, args.batch_size, args.dislocation,
+                             args.cache, args.incremental)
+
+    print(f"Импортировано записей: {stats['imported']}")
+    if stats['cache_hit']:
+        print("Документ не изменился: результат обработки взят из кэша")
+    if stats['reuse']:
+        reuse = stats['reuse']
+        print(f"Строк: {reuse['rows_total']}, взято из кэша: {reuse['rows_reused']}, "
+              f"обработано: {reuse['rows_processed']}")
+    if stats['dislocation']:
+        report = stats['dislocation']
+        print(f"Дислокация: найдено {report['matched']} (нечетко {len(report['fuzzy'])}), не найдено {len(report['unmatched'])}, "
+              f"неоднозначных {len(report['ambiguous'])}, без пары в реестре {len(report['unused'])}")
+    print(f"Время: {stats['elapsed']:.3f} с, скорость: {stats['rows_per_sec']:.0f} строк/с")
+    print(metrics.format_summary())
+
+    if args.metrics_json:
+        metrics.to_json(args.metrics_json)
+        print(f"Метрики сохранены: {args.metrics_json}")
+
+
+if __name__ == "__main__":
+    main()
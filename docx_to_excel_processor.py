@@ -8,6 +8,9 @@ from column_l_formatter import ColumnLFormatter
 from column_k_formatter import ColumnKFormatter
 from column_b_formatter import ColumnBFormatter
 from final_date_formatter import FinalDateFormatter
+from pipeline_metrics import PipelineMetrics
+from date_tokenizer import DATE_TOKENIZER, STRICT_DATE_TOKENIZER, normalize_date, unique_dates
+from keyword_matcher import KEYWORD_MATCHER
 
 class DocxToExcelProcessor:
     """
@@ -17,49 +20,178 @@ class DocxToExcelProcessor:
     
     def convert_docx_to_excel(self, docx_path, excel_path):
         """Извлечение таблиц из DOCX и сохранение в Excel"""
-        # Открываем DOCX-файл
-        document = Document(docx_path)
+        # Извлекаем таблицы из DOCX-файла
+        tables = self.extract_tables(docx_path)
         
         # Проверяем, есть ли таблицы
-        if not document.tables:
+        if not tables:
             return 0
         
+        # Сохраняем таблицы в Excel-файл
+        return self.save_tables(tables, excel_path)
+    
+    def extract_tables(self, docx_path):
+        """
+        Извлекает текст всех таблиц из DOCX-файла
+        
+        Args:
+            docx_path (str): Путь к DOCX-файлу
+            
+        Returns:
+            list: Список таблиц, каждая таблица - список строк, строка - список текстов ячеек
+        """
+        # Открываем DOCX-файл
+        document = Document(docx_path)
+        
+        tables = []
+        for table in document.tables:
+            tables.append([[cell.text for cell in row.cells] for row in table.rows])
+        
+        return tables
+    
+    def project_table(self, table):
+        """
+        Приводит таблицу к раскладке, с которой работают правила обработки:
+        без столбцов A и C и без строки заголовка (если во второй ячейке первой
+        строки НЕТ даты). Результат тот же, что у delete_cols/delete_rows
+        в process_workbook, но ячейки не перемещаются
+        
+        Args:
+            table (list): Строки таблицы (списки текстов ячеек)
+            
+        Returns:
+            tuple: (строки без столбцов A и C, True если первая строка удалена)
+        """
+        # Та же проверка, что в process_workbook (пустая таблица - заголовок "удаляется")
+        second_cell_value = table[0][1] if table and len(table[0]) > 1 else None
+        delete_first_row = not self._is_date(second_cell_value)
+        
+        rows = table[1:] if delete_first_row else table
+        return [row[1:2] + row[3:] for row in rows], delete_first_row
+    
+    def project_tables(self, tables):
+        """
+        Применяет project_table ко всем таблицам
+        
+        Args:
+            tables (list): Таблицы, полученные из extract_tables
+            
+        Returns:
+            tuple: (таблицы в раскладке для обработки, количество удаленных первых строк)
+        """
+        projected = []
+        rows_deleted = 0
+        for table in tables:
+            rows, delete_first_row = self.project_table(table)
+            projected.append(rows)
+            rows_deleted += delete_first_row
+        
+        return projected, rows_deleted
+    
+    def save_tables(self, tables, excel_path):
+        """
+        Сохраняет извлеченные таблицы в Excel, каждую таблицу на отдельный лист
+        
+        Args:
+            tables (list): Таблицы, полученные из extract_tables
+            excel_path (str): Путь для сохранения Excel-файла
+            
+        Returns:
+            int: Количество сохраненных таблиц
+        """
+        workbook = self.build_workbook(tables)
+        
+        # Сохраняем Excel-файл
+        workbook.save(excel_path)
+        
+        return len(workbook.worksheets)
+    
+    def build_workbook(self, tables, adjust_width=True):
+        """
+        Создает рабочую книгу в памяти, каждую таблицу на отдельном листе
+        
+        Args:
+            tables (list): Таблицы, полученные из extract_tables
+            adjust_width (bool): Подбирать ширину столбцов (нужно только для сохранения в файл)
+            
+        Returns:
+            Workbook: Рабочая книга openpyxl
+        """
         # Создаем новую рабочую книгу Excel
         workbook = openpyxl.Workbook()
         # Удаляем стандартный лист
         default_sheet = workbook.active
         workbook.remove(default_sheet)
         
-        # Счетчик таблиц
-        table_count = 0
-        
         # Для каждой таблицы из docx
-        for i, table in enumerate(document.tables):
+        for i, table in enumerate(tables):
             # Создаем новый лист для каждой таблицы
             sheet_name = f"Таблица_{i+1}"
             sheet = workbook.create_sheet(title=sheet_name)
-            table_count += 1
             
             # Копируем данные из таблицы docx в Excel
-            for row_idx, row in enumerate(table.rows):
-                for col_idx, cell in enumerate(row.cells):
+            for row_idx, row in enumerate(table):
+                for col_idx, text in enumerate(row):
                     # Excel использует индексацию с 1, а не с 0
                     excel_row = row_idx + 1
                     excel_col = col_idx + 1
-                    sheet.cell(row=excel_row, column=excel_col).value = cell.text
+                    sheet.cell(row=excel_row, column=excel_col).value = text
             
             # Автоподбор ширины столбцов
-            self._adjust_column_width(sheet)
+            if adjust_width:
+                self._adjust_column_width(sheet)
         
-        # Сохраняем Excel-файл
-        workbook.save(excel_path)
-        
-        return table_count
+        return workbook
     
-    def process_excel_file(self, excel_path):
-        """Удаление столбцов A и C из Excel-файла и обработка первой строки"""
+    def process_excel_file(self, excel_path, metrics=None, rows_deleted=None):
+        """
+        Удаление столбцов A и C из Excel-файла и обработка первой строки
+        
+        Args:
+            excel_path (str): Путь к Excel-файлу
+            metrics (PipelineMetrics): Сборщик метрик этапов (по умолчанию создается новый)
+            rows_deleted (int): Если файл сохранен из таблиц после project_tables -
+                                количество удаленных при этом первых строк
+            
+        Returns:
+            dict: Статистика обработки (в ключе "metrics" - отчет о времени этапов)
+        """
+        if metrics is None:
+            metrics = PipelineMetrics()
+        
         # Загружаем рабочую книгу
-        workbook = openpyxl.load_workbook(excel_path)
+        with metrics.stage("load_workbook"):
+            workbook = openpyxl.load_workbook(excel_path)
+        
+        stats = self.process_workbook(workbook, metrics, rows_deleted=rows_deleted)
+        
+        # Сохраняем изменения
+        with metrics.stage("save_workbook"):
+            workbook.save(excel_path)
+        
+        # Отчет о времени выполнения этапов
+        stats["metrics"] = metrics.report()
+        
+        return stats
+    
+    def process_workbook(self, workbook, metrics=None, adjust_width=True, rows_deleted=None):
+        """
+        Применяет все правила обработки к рабочей книге в памяти (без чтения и записи файла)
+        
+        Args:
+            workbook: Рабочая книга openpyxl
+            metrics (PipelineMetrics): Сборщик метрик этапов (по умолчанию создается новый)
+            adjust_width (bool): Подбирать ширину столбцов (нужно только для сохранения в файл)
+            rows_deleted (int): Книга построена из таблиц после project_tables - столбцы A, C
+                                и заголовки уже удалены (значение - количество удаленных
+                                первых строк); None - удалить их здесь
+            
+        Returns:
+            dict: Статистика обработки
+        """
+        if metrics is None:
+            metrics = PipelineMetrics()
+        self.metrics = metrics
         
         # Колонки для удаления в обратном порядке (C, A)
         # Важно: удаляем сначала большие индексы, потом меньшие,
@@ -82,7 +214,8 @@ class DocxToExcelProcessor:
             "duties_formatted": 0,
             "column_k_formatted": 0,  # Добавляем новый счетчик
             "final_dates_formatted": 0,  # Счетчик для финального форматирования дат
-            "names_formatted": 0  # Счетчик для форматирования имен
+            "names_formatted": 0,  # Счетчик для форматирования имен
+            "rules_skipped": 0  # Правила замены, пропущенные по признакам (столбцы B, I, L)
         }
         
         # Создаем экземпляры форматтеров
@@ -91,91 +224,119 @@ class DocxToExcelProcessor:
         column_k_formatter = ColumnKFormatter()
         column_b_formatter = ColumnBFormatter()
         
+        # Столбцы и заголовки уже отброшены при извлечении (project_tables)
+        if rows_deleted is not None:
+            stats["rows_deleted"] = rows_deleted
+        
         # Обрабатываем каждый лист
         for sheet_name in workbook.sheetnames:
             sheet = workbook[sheet_name]
             stats["sheets_processed"] += 1
             
-            # ВАЖНО: Сначала проверяем, нужно ли удалить первую строку
-            # Получаем значение ВТОРОЙ ячейки (B1) для проверки
-            second_cell_value = sheet.cell(row=1, column=2).value
-            
-            # Определяем, нужно ли удалять первую строку
-            delete_first_row = not self._is_date(second_cell_value)
-            
-            # Удаляем столбцы
-            for col_idx in columns_to_remove:
-                sheet.delete_cols(col_idx, 1)
+            if rows_deleted is None:
+                # ВАЖНО: Сначала проверяем, нужно ли удалить первую строку
+                # Получаем значение ВТОРОЙ ячейки (B1) для проверки
+                second_cell_value = sheet.cell(row=1, column=2).value
+                
+                # Определяем, нужно ли удалять первую строку
+                delete_first_row = not self._is_date(second_cell_value)
+                
+                with metrics.stage("delete_columns", sheet_name, sheet.max_row):
+                    # Удаляем столбцы
+                    for col_idx in columns_to_remove:
+                        sheet.delete_cols(col_idx, 1)
+                    
+                    # Теперь удаляем первую строку, если нужно
+                    if delete_first_row:
+                        sheet.delete_rows(1, 1)
+                        stats["rows_deleted"] += 1
             
-            # Теперь удаляем первую строку, если нужно
-            if delete_first_row:
-                sheet.delete_rows(1, 1)
-                stats["rows_deleted"] += 1
+            rows = sheet.max_row
             
             # Нормализуем даты в первом столбце (бывший B, теперь A после удаления)
-            normalized_count = self._normalize_dates(sheet, 1)  # Столбец 1 (A)
+            with metrics.stage("start_dates", sheet_name, rows, metrics.text_size(sheet, 1)):
+                normalized_count = self._normalize_dates(sheet, 1)  # Столбец 1 (A)
             stats["dates_normalized"] += normalized_count
             
             # Форматируем имена в столбце B
-            column_b_stats = column_b_formatter.process_excel_column(sheet, 2)
+            with metrics.stage("column_b_names", sheet_name, rows, metrics.text_size(sheet, 2)):
+                column_b_stats = column_b_formatter.process_excel_column(sheet, 2)
             stats["names_formatted"] += column_b_stats["names_formatted"]
+            stats["rules_skipped"] += column_b_stats["rules_skipped"]
             
             # Нормализуем даты рождения в третьем столбце (бывший E, теперь C после удаления столбцов A и C)
-            birth_normalized_count = self._normalize_birth_dates(sheet, 3)  # Столбец 3 (C)
+            with metrics.stage("birth_dates", sheet_name, rows, metrics.text_size(sheet, 3)):
+                birth_normalized_count = self._normalize_birth_dates(sheet, 3)  # Столбец 3 (C)
             stats["birth_dates_normalized"] += birth_normalized_count
             
             # Обрабатываем столбец 8 (бывший J, теперь H/6 после удаления столбцов A и C)
-            end_dates_count, moved_text_count = self._process_end_dates(sheet, 6, 8)  # Столбец 6 (F) и 8 (H)
+            with metrics.stage("end_dates", sheet_name, rows, metrics.text_size(sheet, 6)):
+                end_dates_count, moved_text_count = self._process_end_dates(sheet, 6, 8)  # Столбец 6 (F) и 8 (H)
             stats["end_dates_normalized"] += end_dates_count
             stats["text_moved"] += moved_text_count
             
             # Обрабатываем столбцы 4 и 5 (бывшие F и G, новые D и E) и ищем информацию о судах
-            court_moved = self._move_court_info(sheet, source_columns=(4, 5), target_column=9)
+            # Категории ячеек сохраняются для переноса обязанностей из столбца E
+            keyword_classes = {}
+            with metrics.stage("court_info_move", sheet_name, rows, metrics.text_size(sheet, 4, 5)):
+                court_moved = self._move_court_info(sheet, source_columns=(4, 5), target_column=9,
+                                                    keyword_classes=keyword_classes)
             stats["court_info_moved"] += court_moved
             
             # Нормализуем даты в столбце с информацией о судах
-            court_normalized = self._normalize_dates_in_court_info(sheet, 9)
+            with metrics.stage("court_dates", sheet_name, rows, metrics.text_size(sheet, 9)):
+                court_normalized = self._normalize_dates_in_court_info(sheet, 9)
             stats["court_dates_normalized"] += court_normalized
             
             # Форматируем информацию о судах в столбце I
-            column_i_stats = column_i_formatter.process_excel_column(sheet, 9)
+            with metrics.stage("column_i_format", sheet_name, rows, metrics.text_size(sheet, 9)):
+                column_i_stats = column_i_formatter.process_excel_column(sheet, 9)
             stats["formatted_cells"] += column_i_stats["cells_processed"]
+            stats["rules_skipped"] += column_i_stats["rules_skipped"]
             
             # Переносим данные из столбца I в K и очищаем столбец I
-            moved_to_k = self._move_court_info_to_column_k(sheet)
+            with metrics.stage("move_to_column_k", sheet_name, rows):
+                moved_to_k = self._move_court_info_to_column_k(sheet)
             stats["moved_to_column_k"] += moved_to_k
             
             # Нормализуем даты в столбце K
-            k_dates_normalized = self._normalize_dates_in_column_k(sheet)
+            with metrics.stage("column_k_dates", sheet_name, rows, metrics.text_size(sheet, 11)):
+                k_dates_normalized = self._normalize_dates_in_column_k(sheet)
             stats["column_k_dates_normalized"] += k_dates_normalized
             
             # Форматируем информацию в столбце K
-            column_k_stats = column_k_formatter.process_excel_column(sheet, 11)
+            with metrics.stage("column_k_format", sheet_name, rows, metrics.text_size(sheet, 11)):
+                column_k_stats = column_k_formatter.process_excel_column(sheet, 11)
             stats["column_k_formatted"] += column_k_stats["cells_processed"]
             
             # Обрабатываем столбец E (обязанности)
-            for row in range(1, sheet.max_row + 1):
-                column_e_value = sheet.cell(row=row, column=5).value
-                if self._is_duties_column(column_e_value):
-                    # Если да, то переносим данные в столбец L
-                    sheet.cell(row=row, column=12).value = column_e_value
-                    # Очищаем столбец E
-                    sheet.cell(row=row, column=5).value = None
-                    stats["duties_moved"] += 1
+            with metrics.stage("duties_move", sheet_name, rows, metrics.text_size(sheet, 5)):
+                for row in range(1, sheet.max_row + 1):
+                    # Столбец E не меняется после переноса информации о судах,
+                    # поэтому используется категория, найденная при том проходе
+                    if keyword_classes.get((row, 5)) == 'duties':
+                        column_e_value = sheet.cell(row=row, column=5).value
+                        # Если да, то переносим данные в столбец L
+                        sheet.cell(row=row, column=12).value = column_e_value
+                        # Очищаем столбец E
+                        sheet.cell(row=row, column=5).value = None
+                        stats["duties_moved"] += 1
             
             # Форматируем обязанности в столбце L
-            column_l_stats = column_l_formatter.process_excel_column(sheet, 12)
+            with metrics.stage("column_l_format", sheet_name, rows, metrics.text_size(sheet, 12)):
+                column_l_stats = column_l_formatter.process_excel_column(sheet, 12)
             stats["duties_formatted"] += column_l_stats["cells_processed"]
+            stats["rules_skipped"] += column_l_stats["rules_skipped"]
             
             # Финальная обработка дат в столбце K
-            dates_formatted = FinalDateFormatter.process_dates_in_column_k(sheet)
+            with metrics.stage("final_dates", sheet_name, rows, metrics.text_size(sheet, 11)):
+                dates_formatted = FinalDateFormatter.process_dates_in_column_k(sheet)
             stats["final_dates_formatted"] += dates_formatted
             
             # Автоподбор ширины столбцов
-            self._adjust_column_width(sheet)
-        
-        # Сохраняем изменения
-        workbook.save(excel_path)
+            if adjust_width:
+                with metrics.stage("adjust_width", sheet_name, rows):
+                    self._adjust_column_width(sheet)
         
         # Общее количество нормализованных дат
         stats["total_dates_normalized"] = stats["dates_normalized"] + stats["birth_dates_normalized"] + stats["end_dates_normalized"] + stats["court_dates_normalized"]
@@ -256,7 +417,7 @@ class DocxToExcelProcessor:
             value_str = str(value).strip()
             
             # Извлекаем все даты из текста
-            dates = self._extract_all_dates_from_text(value_str)
+            dates = unique_dates(DATE_TOKENIZER.iter_dates(value_str))
             
             # Если даты найдены
             if dates:
@@ -264,10 +425,10 @@ class DocxToExcelProcessor:
                 # Для каждой найденной даты
                 for date in dates:
                     # Нормализуем дату
-                    normalized_date = self._parse_and_normalize_date(date)
+                    normalized_date = normalize_date(date, self._expand_year)
                     if normalized_date:
                         # Заменяем исходную дату на нормализованную
-                        modified_value = modified_value.replace(date, normalized_date)
+                        modified_value = modified_value.replace(date.text, normalized_date)
                         normalized_count += 1
                 
                 # Обновляем значение ячейки только если были изменения
@@ -276,32 +437,18 @@ class DocxToExcelProcessor:
         
         return normalized_count
     
-    def _move_court_info(self, sheet, source_columns=(4, 5), target_column=9):
+    def _move_court_info(self, sheet, source_columns=(4, 5), target_column=9, keyword_classes=None):
         """
         Проверяет столбцы source_columns на наличие информации о судах
         и перемещает эту информацию в target_column
         
+        Если передан словарь keyword_classes, в него записывается категория
+        каждой непустой ячейки: {(строка, столбец): 'court' | 'duties' | None}
+        
         Возвращает количество перемещенных записей о судах
         """
         moved_count = 0
         
-        # Ключевые слова и паттерны для определения информации о судах
-        court_keywords = [
-            r'\d{2}\.\d{2}\.\d{4}.*?суд',        # Дата + суд
-            r'суд.*?по ст',                       # суд + статья
-            r'р/с',                               # районный суд (сокращение)
-            r'г/с',                               # городской суд (сокращение)
-            r'судом',                             # слово "судом"
-            r'осужденный',                        # слово "осужденный"
-            r'постановлением',                    # слово "постановлением"
-            r'УК РФ',                             # отсылка к УК РФ
-            r'л/св',                              # лишение свободы
-            r'ст\. \d{1,3}',                      # статья (например, "ст. 158")
-            r'ИС \d+ (год|г|лет)',                # испытательный срок
-            r'Мировым судьей',                    # Мировой судья
-            r'МССУ',                              # МССУ (мировой судебный участок)
-        ]
-        
         # Обрабатываем все строки в указанных столбцах
         for row in range(1, sheet.max_row + 1):
             for col_idx in source_columns:
@@ -314,14 +461,11 @@ class DocxToExcelProcessor:
                     
                 value_str = str(value).strip()
                 
-                # Проверяем, содержит ли ячейка информацию о суде
-                is_court_info = False
-                
-                # Проверяем наличие ключевых слов/шаблонов
-                for pattern in court_keywords:
-                    if re.search(pattern, value_str, re.IGNORECASE):
-                        is_court_info = True
-                        break
+                # Классифицируем ячейку (суд, обязанности или ничего)
+                category = KEYWORD_MATCHER.classify(value_str)
+                if keyword_classes is not None:
+                    keyword_classes[(row, col_idx)] = category
+                is_court_info = category == 'court'
                 
                 # Если нашли информацию о суде
                 if is_court_info:
@@ -389,15 +533,11 @@ class DocxToExcelProcessor:
                 
             value_str = str(value).strip()
             
-            # Извлекаем дату из текста, удаляя посторонние символы и тексты
-            date_only = self._extract_date_from_text(value_str)
-            
-            if date_only:
-                # Нормализуем извлеченную дату
-                normalized_date = self._parse_and_normalize_date(date_only)
-                if normalized_date:
-                    cell.value = normalized_date
-                    normalized_count += 1
+            # Извлекаем первую дату из текста, отбрасывая посторонние символы и тексты
+            normalized_date = normalize_date(STRICT_DATE_TOKENIZER.first_date(value_str), self._expand_year)
+            if normalized_date:
+                cell.value = normalized_date
+                normalized_count += 1
         
         return normalized_count
     
@@ -425,22 +565,21 @@ class DocxToExcelProcessor:
             value_str = str(value).strip()
             
             # Проверяем наличие двух дат или даты с текстом
-            dates = self._extract_all_dates_from_text(value_str)
+            dates = unique_dates(DATE_TOKENIZER.iter_dates(value_str))
             
             if len(dates) == 2:
                 # Если нашли две даты, оставляем только вторую
-                second_date = dates[1]
-                normalized_date = self._parse_and_normalize_date(second_date)
+                normalized_date = normalize_date(dates[1], self._expand_year)
                 if normalized_date:
                     cell.value = normalized_date
                     normalized_count += 1
             elif len(dates) == 1:
                 # Нашли одну дату, нормализуем ее
                 date = dates[0]
-                normalized_date = self._parse_and_normalize_date(date)
+                normalized_date = normalize_date(date, self._expand_year)
                 
                 # Извлекаем текст, который следует за датой
-                text_after_date = value_str[value_str.find(date) + len(date):].strip()
+                text_after_date = value_str[value_str.find(date.text) + len(date.text):].strip()
                 
                 if text_after_date:
                     # Перемещаем текст в указанный столбец
@@ -461,56 +600,6 @@ class DocxToExcelProcessor:
         
         return normalized_count, moved_text_count
     
-    def _extract_all_dates_from_text(self, text):
-        """
-        Извлекает все даты из текста в виде списка
-        
-        Например, из "14.07.25 14.08.25" извлечет ["14.07.25", "14.08.25"]
-        Также обрабатывает даты с пробелами: "13. 05. 2024" -> ["13. 05. 2024"]
-        """
-        # Шаблоны для поиска дат в тексте
-        date_patterns = [
-            r'\d{1,2}\s*\.\s*\d{1,2}\s*\.\s*\d{2,4}',  # ДД.ММ.ГГ или ДД.ММ.ГГГГ (с возможными пробелами)
-            r'\d{1,2}\s*/\s*\d{1,2}\s*/\s*\d{2,4}',    # ДД/ММ/ГГ или ДД/ММ/ГГГГ (с возможными пробелами)
-            r'\d{1,2}\s*-\s*\d{1,2}\s*-\s*\d{2,4}',    # ДД-ММ-ГГ или ДД-ММ-ГГГГ (с возможными пробелами)
-            r'\d{2}\d{2}\s*\.\s*\d{2}',                # ДДММ.ГГ (с возможными пробелами)
-            r'\d{8}'                                   # ДДММГГГГ
-        ]
-        
-        # Список для найденных дат
-        found_dates = []
-        
-        # Ищем все даты в тексте по шаблонам
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            found_dates.extend(matches)
-        
-        # Удаляем возможные дубликаты
-        return list(dict.fromkeys(found_dates))
-        
-    def _extract_date_from_text(self, text):
-        """
-        Извлекает первую дату из текста
-        
-        Возвращает только дату, если она найдена, иначе None
-        """
-        # Шаблоны для поиска даты в тексте
-        date_patterns = [
-            r'(\d{1,2}\s*\.\s*\d{1,2}\s*\.\s*\d{2,4})',  # ДД.ММ.ГГ или ДД.ММ.ГГГГ с пробелами
-            r'(\d{1,2}/\d{1,2}/\d{2,4})',    # ДД/ММ/ГГ или ДД/ММ/ГГГГ
-            r'(\d{1,2}-\d{1,2}-\d{2,4})',    # ДД-ММ-ГГ или ДД-ММ-ГГГГ
-            r'(\d{2}\d{2}\.\d{2})',          # ДДММ.ГГ
-            r'(\d{8})'                       # ДДММГГГГ
-        ]
-        
-        # Ищем первую дату в тексте по шаблонам
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(1)
-        
-        return None
-    
     def _parse_and_normalize_date(self, date_str):
         """
         Парсит различные форматы дат и нормализует их к формату ДД.ММ.ГГГГ
@@ -525,65 +614,7 @@ class DocxToExcelProcessor:
         - ДД-ММ-ГГ -> ДД.ММ.ГГГГ
         - ДДММГГГГ -> ДД.ММ.ГГГГ (без разделителей)
         """
-        # Удаляем пробелы перед обработкой, чтобы упростить регулярные выражения
-        clean_date_str = re.sub(r'\s+', '', date_str)
-        
-        # Проверяем различные форматы даты
-        
-        # Формат ДД.ММ.ГГ (двузначный год)
-        match = re.match(r'^(\d{1,2})\.(\d{1,2})\.(\d{2})$', clean_date_str)
-        if match:
-            day, month, year = match.groups()
-            full_year = self._expand_year(year)
-            return f"{int(day):02d}.{int(month):02d}.{full_year}"
-        
-        # Формат ДД.ММ.ГГГГ (четырехзначный год)
-        match = re.match(r'^(\d{1,2})\.(\d{1,2})\.(\d{4})$', clean_date_str)
-        if match:
-            day, month, year = match.groups()
-            return f"{int(day):02d}.{int(month):02d}.{year}"
-        
-        # Формат ДДММ.ГГ (пропущена точка между днем и месяцем)
-        match = re.match(r'^(\d{2})(\d{2})\.(\d{2})$', clean_date_str)
-        if match:
-            day, month, year = match.groups()
-            full_year = self._expand_year(year)
-            return f"{int(day):02d}.{int(month):02d}.{full_year}"
-        
-        # Формат ДДММГГГГ (без разделителей)
-        match = re.match(r'^(\d{2})(\d{2})(\d{4})$', clean_date_str)
-        if match:
-            day, month, year = match.groups()
-            return f"{int(day):02d}.{int(month):02d}.{year}"
-        
-        # Формат ДД/ММ/ГГ
-        match = re.match(r'^(\d{1,2})/(\d{1,2})/(\d{2})$', clean_date_str)
-        if match:
-            day, month, year = match.groups()
-            full_year = self._expand_year(year)
-            return f"{int(day):02d}.{int(month):02d}.{full_year}"
-        
-        # Формат ДД/ММ/ГГГГ
-        match = re.match(r'^(\d{1,2})/(\d{1,2})/(\d{4})$', clean_date_str)
-        if match:
-            day, month, year = match.groups()
-            return f"{int(day):02d}.{int(month):02d}.{year}"
-        
-        # Формат ДД-ММ-ГГ
-        match = re.match(r'^(\d{1,2})-(\d{1,2})-(\d{2})$', clean_date_str)
-        if match:
-            day, month, year = match.groups()
-            full_year = self._expand_year(year)
-            return f"{int(day):02d}.{int(month):02d}.{full_year}"
-        
-        # Формат ДД-ММ-ГГГГ
-        match = re.match(r'^(\d{1,2})-(\d{1,2})-(\d{4})$', clean_date_str)
-        if match:
-            day, month, year = match.groups()
-            return f"{int(day):02d}.{int(month):02d}.{year}"
-        
-        # Если ни один из форматов не подошел, возвращаем None
-        return None
+        return normalize_date(DATE_TOKENIZER.parse(date_str), self._expand_year)
     
     def _expand_year(self, year_str):
         """
@@ -611,20 +642,8 @@ class DocxToExcelProcessor:
         # Преобразуем значение в строку и удаляем пробелы
         value_str = str(value).strip()
         
-        # Шаблоны для проверки дат в различных форматах, включая форматы с пробелами
-        date_patterns = [
-            r'^\d{1,2}\s*\.\s*\d{1,2}\s*\.\s*\d{2,4}',  # ДД.ММ.ГГ или ДД.ММ.ГГГГ с пробелами
-            r'^\d{1,2}/\d{1,2}/\d{2,4}',    # ДД/ММ/ГГ или ДД/ММ/ГГГГ
-            r'^\d{1,2}-\d{1,2}-\d{2,4}',    # ДД-ММ-ГГ или ДД-ММ-ГГГГ
-            r'^\d{2}\d{2}\.\d{2}',          # ДДММ.ГГ (пропущена точка между днем и месяцем)
-            r'^\d{8}'                       # ДДММГГГГ (без разделителей)
-        ]
-        
-        for pattern in date_patterns:
-            if re.match(pattern, value_str):
-                return True
-                
-        return False
+        # Значение должно начинаться с даты в одном из поддерживаемых форматов
+        return STRICT_DATE_TOKENIZER.match_start(value_str) is not None
     
     def _adjust_column_width(self, sheet):
         """Автоподбор ширины столбцов"""
@@ -703,33 +722,3 @@ class DocxToExcelProcessor:
                 moved_count += 1
         
         return moved_count
-
-    def _is_duties_column(self, text):
-        """
-        Определяет, является ли текст списком обязанностей
-        
-        Args:
-            text (str): Текст для проверки
-            
-        Returns:
-            bool: True если это список обязанностей, False в противном случае
-        """
-        if not text:
-            return False
-            
-        # Ключевые слова для определения обязанностей
-        keywords = [
-            "уходить", "жительства", "выехать", "изменять", "дома",
-            "регистр", "УИИ", "22", "23", "06", "05", "пределы",
-            "менять", "ПМЖ", "курс", "лечения"
-        ]
-        
-        # Приводим текст к нижнему регистру для поиска
-        text_lower = text.lower()
-        
-        # Проверяем наличие ключевых слов
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                return True
-                
-        return False
@@ -0,0 +1,394 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import openpyxl
+
+import column_kernels
+from b_column_parser import ImprovedAddressProcessor, _clean_other_info_sequential
+from benchmark import SyntheticRegisterGenerator
+from column_b_formatter import ColumnBFormatter
+from column_i_formatter import ColumnIFormatter
+from column_k_formatter import ColumnKFormatter
+from column_l_formatter import ColumnLFormatter
+from date_tokenizer import DATE_TOKENIZER, STRICT_DATE_TOKENIZER, unique_dates
+from docx_to_excel_processor import DocxToExcelProcessor
+from keyword_matcher import KEYWORD_MATCHER
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "corpus.json.gz")
+
+
+class _SingleRowSheet:
+    """
+    Переиспользуемый лист из одной строки для запуска правил,
+    которые работают с ячейками листа (столбцы B/N, перенос информации о судах)
+    """
+
+    def __init__(self):
+        self.sheet = openpyxl.Workbook().active
+
+    def load(self, values):
+        """Очищает строку и заполняет ячейки {номер столбца: значение}"""
+        for row in self.sheet.iter_rows(min_row=1, max_row=1):
+            for cell in row:
+                cell.value = None
+        for column, value in values.items():
+            self.sheet.cell(row=1, column=column).value = value
+        return self.sheet
+
+    def value(self, column):
+        return self.sheet.cell(row=1, column=column).value
+
+
+def build_targets():
+    """
+    Текущие реализации проверяемых функций
+
+    Returns:
+        dict: {имя функции: (группа корпуса, функция text -> результат)}
+    """
+    column_b = ColumnBFormatter()
+    column_i = ColumnIFormatter()
+    column_k = ColumnKFormatter()
+    column_l = ColumnLFormatter()
+    address = ImprovedAddressProcessor()
+    processor = DocxToExcelProcessor()
+    row_sheet = _SingleRowSheet()
+
+    def column_b_row(text):
+        sheet = row_sheet.load({2: text})
+        column_b.process_excel_column(sheet, 2)
+        return [row_sheet.value(2), row_sheet.value(14)]
+
+    def all_dates(text):
+        return [token.text for token in unique_dates(DATE_TOKENIZER.iter_dates(text))]
+
+    def first_date(text):
+        token = STRICT_DATE_TOKENIZER.first_date(text)
+        return token.text if token else None
+
+    def court_info_moved(text):
+        sheet = row_sheet.load({4: text})
+        return processor._move_court_info(sheet, source_columns=(4,), target_column=9) > 0
+
+    return {
+        'column_b.split_joined_names': ('person', column_b._split_joined_names),
+        'column_b.normalize_spb': ('person', column_b._normalize_spb_formatting),
+        'column_b.remove_spb': ('person', column_b._remove_spb_from_text),
+        'column_b.row': ('person', column_b_row),
+        'column_i.format_text': ('court', column_i.format_text),
+        'column_k.format_text': ('court', column_k.format_text),
+        'column_l.format_text': ('duties', column_l.format_text),
+        'address.extract_phone': ('fragment', address.extract_phone),
+        'address.extract_address': ('fragment', address.extract_address),
+        'address.clean_other_info': ('fragment', address.clean_other_info),
+        'dates.extract_all': ('dates', all_dates),
+        'dates.extract_first': ('dates', first_date),
+        'dates.is_date': ('dates', processor._is_date),
+        'dates.parse': ('dates', processor._parse_and_normalize_date),
+        'keywords.classify': ('duties', KEYWORD_MATCHER.classify),
+        'keywords.court_info': ('duties', court_info_moved),
+    }
+
+
+# Пары "эталонная реализация - новая реализация" для функций, у которых
+# быстрая версия существует параллельно со старой:
+# {имя: (группа, эталон, кандидат[, пакетный])}; пакетный кандидат принимает
+# весь список текстов и возвращает список результатов
+PAIRS = {}
+
+
+def _register_pairs():
+    """Регистрирует пары для пакетных и векторных (при наличии pandas) версий"""
+    column_k = ColumnKFormatter()
+    address = ImprovedAddressProcessor()
+
+    def phone_batch(texts):
+        phones, spans = address.extract_phones(texts)
+        return [
+            (phone, [text[span[0]:span[1]]]) if span else (None, [])
+            for text, phone, span in zip(texts, phones, spans)
+        ]
+
+    PAIRS['address.extract_phones'] = ('fragment', address.extract_phone, phone_batch, True)
+    PAIRS['address.clean_other_info'] = ('fragment', _clean_other_info_sequential, address.clean_other_info)
+
+    if not column_kernels.PANDAS_AVAILABLE:
+        return
+
+    pd = column_kernels.pd
+
+    def batch(series_function):
+        return lambda texts: list(series_function(pd.Series(texts)))
+
+    def phone_series(series):
+        phones = column_kernels.extract_phones(series)
+        return pd.Series([
+            (phone, [phone_text]) if phone_text else (None, [])
+            for phone, phone_text in zip(phones['phone'], phones['phone_text'])
+        ])
+
+    PAIRS['column_k.format_series'] = ('court', column_k.format_text, batch(column_k.format_series), True)
+    PAIRS['address.clean_other_info_series'] = (
+        'fragment', address.clean_other_info, batch(column_kernels.clean_other_info), True)
+    PAIRS['address.extract_phones_series'] = ('fragment', address.extract_phone, batch(phone_series), True)
+
+
+_register_pairs()
+
+
+def _mutate(rnd, text):
+    """Случайные искажения текста: пробелы, регистр, знаки препинания"""
+    chars = list(text)
+    for _ in range(rnd.randint(1, 3)):
+        if not chars:
+            break
+        position = rnd.randrange(len(chars))
+        action = rnd.random()
+        if action < 0.3 and chars[position] == ' ':
+            del chars[position]
+        elif action < 0.5:
+            chars.insert(position, ' ')
+        elif action < 0.7:
+            chars[position] = chars[position].swapcase()
+        else:
+            chars.insert(position, rnd.choice(',.;:-/'))
+    return ''.join(chars)
+
+
+def build_corpus(size, seed=7):
+    """
+    Формирует корпус входных текстов по группам
+
+    Args:
+        size (int): Количество текстов в каждой группе
+        seed (int): Зерно генератора
+
+    Returns:
+        dict: {группа: список текстов}
+    """
+    generator = SyntheticRegisterGenerator(seed)
+    rnd = random.Random(seed)
+    column_b = ColumnBFormatter()
+    row_sheet = _SingleRowSheet()
+
+    def maybe_mutate(text):
+        return _mutate(rnd, text) if rnd.random() < 0.3 else text
+
+    corpus = {'person': [], 'court': [], 'duties': [], 'fragment': [], 'dates': []}
+
+    for index in range(size):
+        row = generator.row(index + 1)
+        person = maybe_mutate(row[3])
+        corpus['person'].append(person)
+        corpus['court'].append(maybe_mutate(row[5]))
+        corpus['duties'].append(maybe_mutate(row[6] if index % 4 else row[5]))
+
+        # Фрагменты для разбора адресов - то, что остается в столбце B после форматтера
+        sheet = row_sheet.load({2: person})
+        column_b.process_excel_column(sheet, 2)
+        corpus['fragment'].append(row_sheet.value(2) or person)
+
+        corpus['dates'].append(maybe_mutate(rnd.choice([row[1], row[4], row[7], row[5]])))
+
+    return corpus
+
+
+def _to_json(value):
+    """Приводит результат к виду, в котором он хранится в JSON (кортежи -> списки)"""
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def _run(function, inputs, min_time=0.2):
+    """
+    Прогоняет функцию по входам и замеряет пропускную способность
+
+    Returns:
+        tuple: (список результатов, текстов в секунду)
+    """
+    start = time.perf_counter()
+    outputs = [function(text) for text in inputs]
+    elapsed = time.perf_counter() - start
+    outputs = [_to_json(output) for output in outputs]
+    processed = len(inputs)
+
+    # Для маленьких корпусов повторяем прогон, чтобы замер был устойчивым
+    while inputs and elapsed < min_time:
+        round_start = time.perf_counter()
+        for text in inputs:
+            function(text)
+        elapsed += time.perf_counter() - round_start
+        processed += len(inputs)
+
+    return outputs, (processed / elapsed if elapsed > 0 else None)
+
+
+def _run_batch(function, inputs, min_time=0.2):
+    """
+    Прогоняет пакетную функцию (весь список текстов за вызов) и замеряет пропускную способность
+
+    Returns:
+        tuple: (список результатов, текстов в секунду)
+    """
+    start = time.perf_counter()
+    outputs = function(inputs)
+    elapsed = time.perf_counter() - start
+    outputs = [_to_json(output) for output in outputs]
+    processed = len(inputs)
+
+    while inputs and elapsed < min_time:
+        round_start = time.perf_counter()
+        function(inputs)
+        elapsed += time.perf_counter() - round_start
+        processed += len(inputs)
+
+    return outputs, (processed / elapsed if elapsed > 0 else None)
+
+
+def record(path=DEFAULT_PATH, size=500, seed=7):
+    """
+    Записывает эталонные результаты текущих реализаций
+
+    Args:
+        path (str): Путь к файлу корпуса (.json.gz)
+        size (int): Количество текстов в каждой группе
+        seed (int): Зерно генератора
+    """
+    corpus = build_corpus(size, seed)
+    functions = {}
+
+    for name, (group, function) in build_targets().items():
+        outputs, rows_per_sec = _run(function, corpus[group])
+        functions[name] = {'group': group, 'outputs': outputs, 'rows_per_sec': rows_per_sec}
+        print(f"{name:<32} {rows_per_sec:12.0f} текстов/с")
+
+    golden = {
+        'meta': {'created': datetime.now().isoformat(timespec='seconds'), 'size': size, 'seed': seed},
+        'corpus': corpus,
+        'functions': functions
+    }
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as golden_file:
+        json.dump(golden, golden_file, ensure_ascii=False)
+
+    print(f"Эталон сохранен: {path}")
+
+
+def _print_mismatches(name, inputs, expected, actual, show):
+    """Печатает расхождения и возвращает их количество"""
+    mismatches = [index for index, (old, new) in enumerate(zip(expected, actual)) if old != new]
+    for index in mismatches[:show]:
+        print(f"    вход:   {inputs[index]!r}")
+        print(f"    эталон: {expected[index]!r}")
+        print(f"    сейчас: {actual[index]!r}")
+    return len(mismatches)
+
+
+def verify(path=DEFAULT_PATH, show=3, names=None):
+    """
+    Сравнивает текущие реализации с эталонными результатами
+
+    Args:
+        path (str): Путь к файлу корпуса
+        show (int): Сколько расхождений показывать для каждой функции
+        names (list): Проверять только эти функции
+
+    Returns:
+        int: Общее количество расхождений
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as golden_file:
+        golden = json.load(golden_file)
+
+    total_mismatches = 0
+    for name, (group, function) in build_targets().items():
+        if names and name not in names:
+            continue
+        if name not in golden['functions']:
+            print(f"{name:<32} нет в эталоне, пропущено")
+            continue
+
+        inputs = golden['corpus'][group]
+        expected = golden['functions'][name]['outputs']
+        actual, rows_per_sec = _run(function, inputs)
+        old_rows_per_sec = golden['functions'][name]['rows_per_sec']
+
+        mismatches = sum(1 for old, new in zip(expected, actual) if old != new)
+        status = "OK" if not mismatches else f"РАСХОЖДЕНИЙ: {mismatches}"
+        print(f"{name:<32} {status:<18} было {old_rows_per_sec:10.0f}/с, "
+              f"стало {rows_per_sec:10.0f}/с (x{rows_per_sec / old_rows_per_sec:.2f})")
+        if mismatches:
+            _print_mismatches(name, inputs, expected, actual, show)
+        total_mismatches += mismatches
+
+    return total_mismatches
+
+
+def compare(name, size=10000, seed=11, show=3):
+    """
+    Сравнивает эталонную и новую реализацию функции на синтетической выборке
+
+    Args:
+        name (str): Имя пары из PAIRS
+        size (int): Размер выборки
+        seed (int): Зерно генератора
+        show (int): Сколько расхождений показывать
+
+    Returns:
+        int: Количество расхождений
+    """
+    group, reference, candidate, *options = PAIRS[name]
+    inputs = build_corpus(size, seed)[group]
+
+    expected, reference_speed = _run(reference, inputs)
+    if options and options[0]:
+        actual, candidate_speed = _run_batch(candidate, inputs)
+    else:
+        actual, candidate_speed = _run(candidate, inputs)
+
+    print(f"{name}: {len(inputs)} текстов")
+    print(f"  эталон:   {reference_speed:12.0f} текстов/с")
+    print(f"  кандидат: {candidate_speed:12.0f} текстов/с (x{candidate_speed / reference_speed:.2f})")
+
+    mismatches = _print_mismatches(name, inputs, expected, actual, show)
+    print(f"  расхождений: {mismatches}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Эталонный корпус для проверки эквивалентности форматтеров")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="записать эталон текущих реализаций")
+    record_parser.add_argument("--path", default=DEFAULT_PATH)
+    record_parser.add_argument("--size", type=int, default=500, help="текстов в каждой группе")
+    record_parser.add_argument("--seed", type=int, default=7)
+
+    verify_parser = commands.add_parser("verify", help="сравнить текущие реализации с эталоном")
+    verify_parser.add_argument("--path", default=DEFAULT_PATH)
+    verify_parser.add_argument("--show", type=int, default=3, help="сколько расхождений показывать")
+    verify_parser.add_argument("names", nargs="*", help="имена функций (по умолчанию все)")
+
+    compare_parser = commands.add_parser("compare", help="сравнить эталонную и новую реализацию")
+    compare_parser.add_argument("name", choices=sorted(PAIRS) or None)
+    compare_parser.add_argument("--size", type=int, default=10000)
+    compare_parser.add_argument("--seed", type=int, default=11)
+    compare_parser.add_argument("--show", type=int, default=3)
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.path, args.size, args.seed)
+    elif args.command == "verify":
+        sys.exit(1 if verify(args.path, args.show, args.names) else 0)
+    else:
+        sys.exit(1 if compare(args.name, args.size, args.seed, args.show) else 0)
+
+
+if __name__ == "__main__":
+    main()
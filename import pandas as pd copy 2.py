@@ -529,9 +529,7 @@ class Application:
             total_rows = len(df)
             results = []
             
-            for i, row in df.iterrows():
-                raw_text = row['raw_data']
-                
+            for i, raw_text in enumerate(df['raw_data']):
                 try:
                     # 1. Сначала извлекаем телефон
                     phones, original_phones = self.processor.extract_phone(raw_text)
@@ -569,9 +567,9 @@ class Application:
                     })
                 
                 # Обновление прогресса
-                self.progress["value"] = (i + 1) / total_rows * 100
-                self.status_label.config(text=f"Обработано {i+1} из {total_rows} строк...")
-                if i % 10 == 0:  # Обновляем интерфейс каждые 10 строк
+                if i % 10 == 0 or i + 1 == total_rows:  # Обновляем интерфейс каждые 10 строк
+                    self.progress["value"] = (i + 1) / total_rows * 100
+                    self.status_label.config(text=f"Обработано {i+1} из {total_rows} строк...")
                     self.root.update_idletasks()
             
             # Создание DataFrame с результатами
@@ -1,16 +1,27 @@
+import time
+
+# Отсчет времени запуска - до импорта остальных модулей
+STARTUP_START = time.perf_counter()
+
 import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import os
 import subprocess
 import platform
-from docx_to_excel_processor import DocxToExcelProcessor
-import openpyxl
-from database_manager import DatabaseManager
-from database_viewer import DatabaseViewer
+import threading
+from pipeline_metrics import PipelineMetrics
+from profiling import profile_run, profiling_enabled
 
-# Импортируем класс для обработки адресов
-from b_column_parser import ImprovedAddressProcessor
+# Тяжелые модули (python-docx, openpyxl, обработчики, база данных) импортируются
+# не при запуске, а при первом обращении или в фоновом потоке прогрева после
+# появления окна (см. DocxToExcelApp.warm_up)
+
+# Интервал проверки завершения прогрева (мс)
+WARMUP_POLL_MS = 50
+
+# Счетчики, которые относятся только к одному запуску, а не к результату:
+# метрики и статистика инкрементальной обработки. В кэш документа не сохраняются
+RUN_ONLY_STATS = ('metrics', 'rows_total', 'rows_reused', 'rows_processed')
 
 class DocxToExcelApp:
     def __init__(self, root):
@@ -24,13 +35,99 @@ class DocxToExcelApp:
         self.dislocation_docx_path = None
         self.dislocation_excel_path = None
         
-        # Создаем экземпляр обработчика
-        self.processor = DocxToExcelProcessor()
-        self.address_processor = ImprovedAddressProcessor()
-        self.db_manager = DatabaseManager()
+        # Обработчики создаются при первом обращении (см. _lazy)
+        self._lazy_objects = {}
+        self._lazy_lock = threading.RLock()
+        self.warmup_thread = None
+        
+        # Время запуска: появление окна и загрузка модулей (в секундах)
+        self.startup_times = {}
         
         # Создание интерфейса
         self.create_gui()
+        
+        # Модули загружаются после того, как окно будет отрисовано
+        self.root.after_idle(self.on_window_shown)
+    
+    def _lazy(self, name, factory):
+        """
+        Возвращает объект, создавая его при первом обращении
+        (потокобезопасно: объект создается один раз, даже если к нему
+        одновременно обращаются окно и поток прогрева; блокировка повторно
+        входимая, так как одни объекты создаются через другие)
+        
+        Args:
+            name (str): Имя объекта
+            factory: Функция без аргументов, создающая объект
+        """
+        with self._lazy_lock:
+            if name not in self._lazy_objects:
+                self._lazy_objects[name] = factory()
+            return self._lazy_objects[name]
+    
+    @property
+    def processor(self):
+        """Обработчик DOCX файлов"""
+        from docx_to_excel_processor import DocxToExcelProcessor
+        return self._lazy('processor', DocxToExcelProcessor)
+    
+    @property
+    def address_processor(self):
+        """Обработчик адресов и телефонов"""
+        from b_column_parser import ImprovedAddressProcessor
+        return self._lazy('address_processor', ImprovedAddressProcessor)
+    
+    @property
+    def db_manager(self):
+        """Менеджер базы данных"""
+        from database_manager import DatabaseManager
+        return self._lazy('db_manager', DatabaseManager)
+    
+    @property
+    def parse_cache(self):
+        """Кэш результатов обработки (хранится рядом с базой данных)"""
+        from parse_cache import ParseCache, DEFAULT_CACHE_NAME
+        return self._lazy('parse_cache', lambda: ParseCache(os.path.join(
+            os.path.dirname(os.path.abspath(self.db_manager.db_path)), DEFAULT_CACHE_NAME
+        )))
+    
+    def on_window_shown(self):
+        """Окно отрисовано: фиксируем время запуска и начинаем прогрев в фоне"""
+        self.startup_times['window'] = time.perf_counter() - STARTUP_START
+        
+        self.warmup_thread = threading.Thread(target=self.warm_up, daemon=True)
+        self.warmup_thread.start()
+        self.root.after(WARMUP_POLL_MS, self.check_warm_up)
+    
+    def warm_up(self):
+        """
+        Фоновый прогрев: импорт модулей и создание обработчиков.
+        Выполняется вне потока Tk и не обращается к виджетам
+        """
+        import openpyxl, docx_to_database, dislocation, database_viewer  # noqa: F401
+        
+        self.processor
+        self.address_processor
+        self.parse_cache
+        
+        self.startup_times['modules'] = time.perf_counter() - STARTUP_START
+    
+    def check_warm_up(self):
+        """Проверяет завершение прогрева и показывает время запуска"""
+        if self.warmup_thread.is_alive():
+            self.root.after(WARMUP_POLL_MS, self.check_warm_up)
+            return
+        
+        # Ошибка прогрева не мешает работе: модуль будет загружен при первом обращении
+        if 'modules' not in self.startup_times:
+            return
+        
+        # Не затираем сообщения, если пользователь уже начал работу
+        if not self.docx_path:
+            self.update_status(
+                f"Окно открыто за {self.startup_times['window']:.2f} с, "
+                f"модули загружены за {self.startup_times['modules']:.2f} с"
+            )
     
     def create_gui(self):
         """Создание графического интерфейса"""
@@ -118,6 +215,17 @@ class DocxToExcelApp:
         )
         view_database_button.pack(side=tk.LEFT, padx=5)
         
+        # Флажок профилирования (по умолчанию - из переменной окружения DOCX_PROFILE)
+        self.profile_var = tk.BooleanVar(value=profiling_enabled())
+        profile_check = ttk.Checkbutton(button_frame, text="Профилирование", variable=self.profile_var)
+        profile_check.pack(side=tk.LEFT, padx=5)
+        
+        # Флажок инкрементальной обработки (правила применяются только к новым и измененным строкам)
+        self.incremental_var = tk.BooleanVar(value=True)
+        incremental_check = ttk.Checkbutton(button_frame, text="Только измененные строки",
+                                            variable=self.incremental_var)
+        incremental_check.pack(side=tk.LEFT, padx=5)
+        
         # Кнопка выхода
         exit_button = ttk.Button(button_frame, text="Выход", command=self.root.destroy)
         exit_button.pack(side=tk.RIGHT, padx=5)
@@ -129,6 +237,8 @@ class DocxToExcelApp:
             return
         
         try:
+            import openpyxl
+            
             # Открываем Excel файл
             workbook = openpyxl.load_workbook(self.excel_path)
             
@@ -202,15 +312,41 @@ class DocxToExcelApp:
         
         if file_path:
             self.dislocation_docx_path = file_path
+            # Отчет о сверке с реестром сохраняется рядом с файлом дислокации
+            name, _ = os.path.splitext(file_path)
+            self.dislocation_excel_path = f"{name}_report.xlsx"
             self.dislocation_label.config(text=os.path.basename(file_path))
             self.update_status(f"Выбран файл с дислокацией: {file_path}")
     
+    def run_profiled(self, label, action):
+        """
+        Выполняет действие, при включенном профилировании - под cProfile
+        с сохранением .pstats и сводки рядом с Excel-файлом
+        
+        Args:
+            label (str): Название операции (используется в именах файлов профиля)
+            action: Функция без аргументов
+        """
+        with profile_run(self.excel_path, label, self.profile_var.get()) as profile:
+            action()
+        
+        if profile:
+            status = self.status_text.get("1.0", tk.END).rstrip()
+            self.update_status(f"{status}\n\nПрофиль сохранен:\n{profile['stats_path']}\n{profile['summary_path']}")
+    
     def process_file(self):
+        """Обработка файла (с профилированием, если оно включено)"""
+        self.run_profiled("process_file", self._process_file)
+    
+    def _process_file(self):
         """Обработка файла: конвертация DOCX в Excel и применение всех правил обработки"""
         if not self.docx_path:
             messagebox.showerror("Ошибка", "Сначала выберите DOCX файл")
             return
         
+        from parse_cache import file_sha256
+        from dislocation import merge_dislocation, save_report as save_dislocation_report
+        
         try:
             self.update_status("Обработка файла...\nШаг 1: Извлечение таблиц из DOCX...\n\n"
                             "Правила обработки:\n"
@@ -224,155 +360,72 @@ class DocxToExcelApp:
                             "- Информация о судах из столбцов D и E будет перемещена в столбец I\n"
                             "- Даты в информации о судах будут нормализованы, включая даты с пробелами")
             
-            # Шаг 1: Извлечение таблиц из DOCX в Excel
-            table_count = self.processor.convert_docx_to_excel(self.docx_path, self.excel_path)
+            # Сборщик метрик времени по этапам обработки
+            metrics = PipelineMetrics()
+            
+            # Если документ уже обрабатывался этой версией программы, результат берется из кэша
+            with metrics.stage("parse_cache_lookup"):
+                docx_hash = file_sha256(self.docx_path)
+                cached = self.parse_cache.load(docx_hash)
+            
+            if cached:
+                workbook, cached_stats = cached
+                table_count = cached_stats['table_count']
+                # Статистика повторного использования строк относится к прошлому запуску
+                stats = {key: value for key, value in cached_stats['stats'].items()
+                         if key not in RUN_ONLY_STATS}
+                b_stats = cached_stats['b_stats']
+                removed_count = cached_stats['removed_count']
+                self.update_status("Документ не изменился с прошлой обработки: результат взят из кэша")
+            else:
+                table_count, workbook, stats, b_stats, removed_count = self._process_document(metrics)
+                if table_count > 0:
+                    with metrics.stage("parse_cache_store"):
+                        self.parse_cache.store(docx_hash, workbook, {
+                            'table_count': table_count,
+                            'stats': {key: value for key, value in stats.items() if key not in RUN_ONLY_STATS},
+                            'b_stats': b_stats,
+                            'removed_count': removed_count
+                        })
             
             if table_count > 0:
-                self.update_status(f"Шаг 1: Таблицы успешно извлечены ({table_count} шт.)\n\n"
-                                "Шаг 2: Удаление столбцов A и C, обработка дат и информации о судах...")
-                
-                # Шаг 2: Обработка Excel-файла (все операции в одной функции)
-                stats = self.processor.process_excel_file(self.excel_path)
-                
-                # Шаг 3: Дополнительная обработка столбца B - извлечение адресов, телефонов и другой информации
-                self.update_status(f"Шаг 3: Обработка столбца B - извлечение адресов, телефонов и другой информации...")
-                
-                # Вместо использования process_column_b, реализуем схожую логику здесь для всех листов
-                # Загружаем файл для обработки столбца B
-                workbook = openpyxl.load_workbook(self.excel_path)
-                
-                # Статистика для столбца B по всем листам
-                b_stats = {
-                    'processed_rows': 0,
-                    'addresses_found': 0,
-                    'phones_found': 0,
-                    'other_info_found': 0,
-                    'sheets_processed': 0
-                }
-                
-                # Обрабатываем каждый лист в Excel-файле
-                for sheet_name in workbook.sheetnames:
-                    sheet = workbook[sheet_name]
-                    b_stats['sheets_processed'] += 1
-                    
-                    self.update_status(f"Обработка листа: {sheet_name}...")
+                # Объединяем реестр с дислокацией (если выбран файл)
+                dislocation_summary = ""
+                if self.dislocation_docx_path:
+                    self.update_status("Объединение с файлом дислокации...")
+                    with metrics.stage("dislocation_merge"):
+                        report = merge_dislocation(workbook, self.dislocation_docx_path, self.processor)
+                        save_dislocation_report(report, self.dislocation_excel_path)
                     
-                    # Обрабатываем каждую строку в столбце B текущего листа
-                    for row in range(1, sheet.max_row + 1):
-                        cell_b = sheet.cell(row=row, column=2)  # Столбец B
-                        
-                        # Если ячейка не пустая, обрабатываем ее
-                        if cell_b.value and str(cell_b.value).strip():
-                            raw_text = str(cell_b.value).strip()
-                            b_stats['processed_rows'] += 1
-                            
-                            # 1. Сначала извлекаем телефон
-                            phone, original_phone_texts = self.address_processor.extract_phone(raw_text)
-                            
-                            # 2. Удаляем телефон из исходного текста
-                            text_without_phone = raw_text
-                            if original_phone_texts:
-                                for phone_text in original_phone_texts:
-                                    text_without_phone = text_without_phone.replace(phone_text, '')
-                                b_stats['phones_found'] += 1
-                            
-                            # 3. Извлекаем адрес из текста без телефона
-                            formatted_address, original_address = self.address_processor.extract_address(text_without_phone)
-                            
-                            # 4. Определяем иное - всё, что осталось после удаления телефона и адреса
-                            other_info = text_without_phone
-                            if original_address:
-                                other_info = other_info.replace(original_address, '')
-                                b_stats['addresses_found'] += 1
-                            
-                            # Очищаем результат
-                            other_info = self.address_processor.clean_other_info(other_info)
-                            if other_info:
-                                b_stats['other_info_found'] += 1
-                            
-                            # Получаем ячейки в столбцах O, P, Q
-                            cell_o = sheet.cell(row=row, column=15)  # Столбец O для адреса
-                            cell_p = sheet.cell(row=row, column=16)  # Столбец P для телефона
-                            cell_q = sheet.cell(row=row, column=17)  # Столбец Q для иного
-                            
-                            # Заполняем ячейки
-                            if formatted_address:
-                                cell_o.value = formatted_address
-                            
-                            if phone:
-                                cell_p.value = phone
-                            
-                            if other_info:
-                                cell_q.value = other_info
-                            
-                            # Очищаем столбец B, если извлекли что-то полезное
-                            if formatted_address or phone or other_info:
-                                cell_b.value = None
-                                
-                        # Также проверяем столбец D, если там есть данные
-                        cell_d = sheet.cell(row=row, column=4)  # Столбец D
-                        
-                        # Если ячейка не пустая, обрабатываем ее
-                        if cell_d.value and str(cell_d.value).strip():
-                            raw_text = str(cell_d.value).strip()
-                            b_stats['processed_rows'] += 1
-                            
-                            # 1. Сначала извлекаем телефон
-                            phone, original_phone_texts = self.address_processor.extract_phone(raw_text)
-                            
-                            # 2. Удаляем телефон из исходного текста
-                            text_without_phone = raw_text
-                            if original_phone_texts:
-                                for phone_text in original_phone_texts:
-                                    text_without_phone = text_without_phone.replace(phone_text, '')
-                                b_stats['phones_found'] += 1
-                            
-                            # 3. Извлекаем адрес из текста без телефона
-                            formatted_address, original_address = self.address_processor.extract_address(text_without_phone)
-                            
-                            # 4. Определяем иное - всё, что осталось после удаления телефона и адреса
-                            other_info = text_without_phone
-                            if original_address:
-                                other_info = other_info.replace(original_address, '')
-                                b_stats['addresses_found'] += 1
-                            
-                            # Очищаем результат
-                            other_info = self.address_processor.clean_other_info(other_info)
-                            if other_info:
-                                b_stats['other_info_found'] += 1
-                            
-                            # Получаем ячейки в столбцах O, P, Q
-                            cell_o = sheet.cell(row=row, column=15)  # Столбец O для адреса
-                            cell_p = sheet.cell(row=row, column=16)  # Столбец P для телефона
-                            cell_q = sheet.cell(row=row, column=17)  # Столбец Q для иного
-                            
-                            # Заполняем ячейки
-                            if formatted_address:
-                                cell_o.value = formatted_address
-                            
-                            if phone:
-                                cell_p.value = phone
-                            
-                            if other_info:
-                                cell_q.value = other_info
-                            
-                            # Очищаем столбец D, если извлекли что-то полезное
-                            if formatted_address or phone or other_info:
-                                cell_d.value = None
-                    
-                    # Обновляем статус после обработки каждого листа
-                    self.update_status(f"Лист '{sheet_name}' обработан. Всего строк: {b_stats['processed_rows']}")
-                
-                # Удаляем литеры А, Б, В, Г из адресов
-                self.update_status("Удаление литер А, Б, В, Г из адресов...")
-                removed_count = self.remove_letters_from_addresses(workbook)
+                    dislocation_summary = (
+                        f"Дислокация:\n"
+                        f"- Записей в файле дислокации: {report['rows_indexed']} "
+                        f"(пропущено строк: {report['rows_skipped']})\n"
+                        f"- Найдено совпадений: {report['matched']}\n"
+                        f"- Из них нечетких (по близкому ФИО): {len(report['fuzzy'])}\n"
+                        f"- Не найдено в дислокации: {len(report['unmatched'])}\n"
+                        f"- Неоднозначных совпадений: {len(report['ambiguous'])}\n"
+                        f"- Записей дислокации без пары в реестре: {len(report['unused'])}\n"
+                        f"- Дислокация записана в столбец R, отчет: {self.dislocation_excel_path}\n\n"
+                    )
                 
                 # Сохраняем изменения
-                workbook.save(self.excel_path)
+                with metrics.stage("save_workbook"):
+                    workbook.save(self.excel_path)
+                
+                # Сохраняем отчет о времени этапов рядом с Excel-файлом
+                metrics_path = os.path.splitext(self.excel_path)[0] + "_metrics.json"
+                metrics.to_json(metrics_path)
+                
+                reuse_summary = ""
+                if 'rows_reused' in stats:
+                    reuse_summary = (f"Инкрементальная обработка: взято из кэша строк: {stats['rows_reused']}, "
+                                     f"обработано: {stats['rows_processed']} (счетчики ниже - только по ним)\n\n")
                 
                 # Финальное сообщение
                 self.update_status(
                     f"Обработка успешно завершена!\n\n"
+                    f"{reuse_summary}"
                     f"- Извлечено таблиц: {table_count}\n"
                     f"- Обработано листов: {stats['sheets_processed']} + {b_stats['sheets_processed']}\n"
                     f"- Удалено первых строк: {stats['rows_deleted']}\n"
@@ -383,6 +436,7 @@ class DocxToExcelApp:
                     f"- Перемещено записей о судах: {stats['court_info_moved']}\n"
                     f"- Нормализовано дат в информации о судах: {stats['court_dates_normalized']}\n"
                     f"- Отформатировано ячеек с информацией о судах: {stats['formatted_cells']}\n"
+                    f"- Пропущено правил замены без признаков в тексте: {stats['rules_skipped']}\n"
                     f"- Всего нормализовано дат: {stats['total_dates_normalized']}\n"
                     f"- Удалены столбцы: A и C\n\n"
                     f"Обработка столбцов B и D:\n"
@@ -392,45 +446,32 @@ class DocxToExcelApp:
                     f"- Найдено телефонов: {b_stats['phones_found']}\n"
                     f"- Найдено дополнительной информации: {b_stats['other_info_found']}\n"
                     f"- Удалено литер из адресов: {removed_count}\n\n"
+                    f"{dislocation_summary}"
                     f"Результат сохранен в: {self.excel_path}\n\n"
                     f"Адреса перемещены в столбец O\n"
                     f"Телефоны перемещены в столбец P\n"
-                    f"Прочая информация перемещена в столбец Q"
+                    f"Прочая информация перемещена в столбец Q\n\n"
+                    f"Время этапов (отчет: {metrics_path}):\n"
+                    f"{metrics.format_summary()}"
                 )
                 
                 # Импортируем данные в базу данных
                 self.update_status("\nНачинаем импорт данных в базу данных...")
-                total_imported = 0
                 
-                # Обрабатываем каждый лист
-                for sheet_name in workbook.sheetnames:
-                    sheet = workbook[sheet_name]
-                    self.update_status(f"Импорт листа: {sheet_name}...")
-                    
-                    # Обрабатываем каждую строку
-                    for row in range(1, sheet.max_row + 1):
-                        # Собираем данные из нужных столбцов
-                        data = {
-                            'start_date': sheet.cell(row=row, column=1).value,  # A
-                            'birth_date': sheet.cell(row=row, column=3).value,  # C
-                            'end_date': sheet.cell(row=row, column=6).value,    # F
-                            'other_info_g': sheet.cell(row=row, column=7).value,  # G
-                            'other_info_h': sheet.cell(row=row, column=8).value,  # H
-                            'court_info': sheet.cell(row=row, column=11).value,   # K
-                            'restrictions': sheet.cell(row=row, column=12).value,  # L
-                            'full_name': sheet.cell(row=row, column=14).value,    # N
-                            'address': sheet.cell(row=row, column=15).value,      # O
-                            'phone': sheet.cell(row=row, column=16).value,        # P
-                            'other_info_q': sheet.cell(row=row, column=17).value  # Q
-                        }
-                        
-                        # Проверяем, что есть хотя бы ФИО
-                        if data['full_name']:
-                            # Добавляем в базу данных
-                            convict_id = self.db_manager.add_convict(data)
-                            total_imported += 1
+                with metrics.stage("db_import") as import_stage:
+                    # Потоковый импорт сохраненного файла пакетами
+                    total_imported = self.db_manager.import_from_excel(
+                        self.excel_path,
+                        progress=lambda sheet_name, imported: self.update_status(
+                            f"Импорт листа: {sheet_name}... (импортировано записей: {imported})"
+                        )
+                    )
+                    import_stage['rows'] = total_imported
                 
-                self.update_status(f"\nИмпорт в базу данных завершен. Всего импортировано записей: {total_imported}")
+                metrics.to_json(metrics_path)
+                self.update_status(f"\nИмпорт в базу данных завершен. Всего импортировано записей: {total_imported}\n\n"
+                                   f"Время этапов (отчет: {metrics_path}):\n"
+                                   f"{metrics.format_summary()}")
                 messagebox.showinfo("Успех", f"Обработка и импорт завершены.\nВсего импортировано записей: {total_imported}")
             else:
                 self.update_status("В документе не найдено таблиц.")
@@ -440,57 +481,108 @@ class DocxToExcelApp:
             self.update_status(f"Произошла ошибка при обработке файла:\n{str(e)}")
             messagebox.showerror("Ошибка", f"Произошла ошибка: {str(e)}")
     
-    def remove_letters_from_addresses(self, workbook):
+    def _process_document(self, metrics):
         """
-        Удаляет буквы А, Б, В, Г из адресов в столбце O во всех листах
+        Извлечение таблиц, применение правил обработки и разбор адресов
         
         Args:
-            workbook: открытый workbook openpyxl
+            metrics (PipelineMetrics): Сборщик метрик этапов
             
         Returns:
-            int: количество измененных адресов
+            tuple: (количество таблиц, рабочая книга, статистика обработки,
+                    статистика столбцов B и D, количество удаленных литер);
+                    если таблиц нет - (0, None, None, None, 0)
         """
-        import re
+        if self.incremental_var.get():
+            return self._process_document_incremental(metrics)
+        
+        import openpyxl
+        from b_column_parser import process_address_columns
+        
+        # Шаг 1: Извлечение таблиц из DOCX в Excel (столбцы A, C и заголовки
+        # отбрасываются сразу, до записи в файл)
+        with metrics.stage("docx_to_xlsx"):
+            tables = self.processor.extract_tables(self.docx_path)
+            if not tables:
+                return 0, None, None, None, 0
+            tables, rows_deleted = self.processor.project_tables(tables)
+            table_count = self.processor.save_tables(tables, self.excel_path)
+        
+        self.update_status(f"Шаг 1: Таблицы успешно извлечены ({table_count} шт.)\n\n"
+                        "Шаг 2: Удаление столбцов A и C, обработка дат и информации о судах...")
+        
+        # Шаг 2: Обработка Excel-файла (все операции в одной функции)
+        stats = self.processor.process_excel_file(self.excel_path, metrics, rows_deleted=rows_deleted)
         
-        # Счетчик измененных адресов
-        total_changes = 0
+        # Шаг 3: Дополнительная обработка столбца B - извлечение адресов, телефонов и другой информации
+        self.update_status(f"Шаг 3: Обработка столбца B - извлечение адресов, телефонов и другой информации...")
         
-        # Обрабатываем каждый лист
+        # Вместо использования process_column_b, реализуем схожую логику здесь для всех листов
+        # Загружаем файл для обработки столбца B
+        with metrics.stage("load_workbook"):
+            workbook = openpyxl.load_workbook(self.excel_path)
+        
+        # Статистика для столбца B по всем листам
+        b_stats = {
+            'processed_rows': 0,
+            'addresses_found': 0,
+            'phones_found': 0,
+            'other_info_found': 0,
+            'letters_removed': 0,
+            'sheets_processed': 0
+        }
+        
+        # Обрабатываем каждый лист в Excel-файле
         for sheet_name in workbook.sheetnames:
             sheet = workbook[sheet_name]
+            b_stats['sheets_processed'] += 1
+        
+            self.update_status(f"Обработка листа: {sheet_name}...")
+        
+            # Обрабатываем столбцы B и D текущего листа (литеры А, Б, В, Г удаляются из адресов при разборе)
+            with metrics.stage("address_parsing", sheet_name, sheet.max_row, metrics.text_size(sheet, 2, 4)):
+                process_address_columns(sheet, self.address_processor, (2, 4), b_stats)
+        
+            # Обновляем статус после обработки каждого листа
+            self.update_status(f"Лист '{sheet_name}' обработан. Всего строк: {b_stats['processed_rows']}")
+        
+        removed_count = b_stats.pop('letters_removed')
+        
+        return table_count, workbook, stats, b_stats, removed_count
+    
+    def _process_document_incremental(self, metrics):
+        """
+        Инкрементальная обработка документа в памяти: правила применяются только
+        к строкам, которых нет в кэше (см. process_document_incremental)
+        
+        Args:
+            metrics (PipelineMetrics): Сборщик метрик этапов
             
-            # Обрабатываем каждую строку
-            for row in range(1, sheet.max_row + 1):
-                cell_o = sheet.cell(row=row, column=15)  # Столбец O для адреса
-                
-                # Если ячейка не пустая, обрабатываем её
-                if cell_o.value and str(cell_o.value).strip():
-                    address = str(cell_o.value)
-                    original_address = address  # Сохраняем исходный адрес для сравнения
-                    
-                    # Обрабатываем каждую литеру
-                    for letter in ['А', 'Б', 'В', 'Г']:
-                        # Заменяем числоЛитера-число на число-число
-                        new_address = re.sub(fr'(\d+){letter}-(\d+)', r'\1-\2', address)
-                        if new_address != address:
-                            address = new_address
-                            
-                        # Заменяем числоЛитера в конце строки или перед пробелом
-                        new_address = re.sub(fr'(\d+){letter}(?=\s|$)', r'\1', address)
-                        if new_address != address:
-                            address = new_address
-                            
-                        # Заменяем число-корпусЛитера-число на число-корпус-число
-                        new_address = re.sub(fr'(\d+)-(\d+){letter}-(\d+)', r'\1-\2-\3', address)
-                        if new_address != address:
-                            address = new_address
-                    
-                    # Если адрес изменился, обновляем ячейку
-                    if address != original_address:
-                        cell_o.value = address
-                        total_changes += 1
+        Returns:
+            tuple: То же, что и _process_document
+        """
+        from docx_to_database import process_document_incremental
+        
+        self.update_status("Шаг 1: Извлечение таблиц и поиск новых и измененных строк...")
+        
+        workbook, stats, address_stats, reuse = process_document_incremental(
+            self.docx_path, self.processor, self.parse_cache, metrics, adjust_width=True
+        )
+        
+        table_count = len(workbook.worksheets)
+        if table_count == 0:
+            return 0, None, None, None, 0
+        
+        # Счетчики правил относятся только к обработанным строкам
+        stats.update(reuse)
+        b_stats = dict(address_stats, sheets_processed=table_count)
+        removed_count = b_stats.pop('letters_removed')
+        
+        self.update_status(f"Строк в документе: {reuse['rows_total']}\n"
+                           f"Взято из кэша: {reuse['rows_reused']}\n"
+                           f"Обработано новых и измененных: {reuse['rows_processed']}")
         
-        return total_changes
+        return table_count, workbook, stats, b_stats, removed_count
     
     def open_file(self, file_path):
         """Открытие файла в соответствующем приложении"""
@@ -507,6 +599,10 @@ class DocxToExcelApp:
             return False
 
     def import_to_database(self):
+        """Импорт данных в базу данных (с профилированием, если оно включено)"""
+        self.run_profiled("import_to_database", self._import_to_database)
+    
+    def _import_to_database(self):
         """Импорт данных из Excel в базу данных"""
         if not self.excel_path:
             messagebox.showerror("Ошибка", "Сначала выберите и обработайте DOCX файл")
@@ -515,38 +611,13 @@ class DocxToExcelApp:
         try:
             self.update_status("Начинаем импорт данных в базу данных...")
             
-            # Открываем Excel файл
-            workbook = openpyxl.load_workbook(self.excel_path)
-            
-            total_imported = 0
-            
-            # Обрабатываем каждый лист
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                self.update_status(f"Обработка листа: {sheet_name}...")
-                
-                # Обрабатываем каждую строку
-                for row in range(1, sheet.max_row + 1):
-                    # Собираем данные из нужных столбцов
-                    data = {
-                        'start_date': sheet.cell(row=row, column=1).value,  # A
-                        'birth_date': sheet.cell(row=row, column=3).value,  # C
-                        'end_date': sheet.cell(row=row, column=6).value,    # F
-                        'other_info_g': sheet.cell(row=row, column=7).value,  # G
-                        'other_info_h': sheet.cell(row=row, column=8).value,  # H
-                        'court_info': sheet.cell(row=row, column=11).value,   # K
-                        'restrictions': sheet.cell(row=row, column=12).value,  # L
-                        'full_name': sheet.cell(row=row, column=14).value,    # N
-                        'address': sheet.cell(row=row, column=15).value,      # O
-                        'phone': sheet.cell(row=row, column=16).value,        # P
-                        'other_info_q': sheet.cell(row=row, column=17).value  # Q
-                    }
-                    
-                    # Проверяем, что есть хотя бы ФИО
-                    if data['full_name']:
-                        # Добавляем в базу данных
-                        convict_id = self.db_manager.add_convict(data)
-                        total_imported += 1
+            # Потоковый импорт: файл читается построчно, записи вставляются пакетами
+            total_imported = self.db_manager.import_from_excel(
+                self.excel_path,
+                progress=lambda sheet_name, imported: self.update_status(
+                    f"Обработка листа: {sheet_name}... (импортировано записей: {imported})"
+                )
+            )
             
             self.update_status(f"Импорт завершен. Всего импортировано записей: {total_imported}")
             messagebox.showinfo("Успех", f"Импорт завершен. Всего импортировано записей: {total_imported}")
@@ -557,6 +628,7 @@ class DocxToExcelApp:
 
     def open_database_viewer(self):
         """Открытие окна просмотра базы данных"""
+        from database_viewer import DatabaseViewer
         DatabaseViewer(self.root)
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+import re
+
+# Признаки информации о суде (регулярные выражения)
+COURT_KEYWORDS = (
+    r'\d{2}\.\d{2}\.\d{4}.*?суд',        # Дата + суд
+    r'суд.*?по ст',                       # суд + статья
+    r'р/с',                               # районный суд (сокращение)
+    r'г/с',                               # городской суд (сокращение)
+    r'судом',                             # слово "судом"
+    r'осужденный',                        # слово "осужденный"
+    r'постановлением',                    # слово "постановлением"
+    r'УК РФ',                             # отсылка к УК РФ
+    r'л/св',                              # лишение свободы
+    r'ст\. \d{1,3}',                      # статья (например, "ст. 158")
+    r'ИС \d+ (?:год|г|лет)',              # испытательный срок
+    r'Мировым судьей',                    # Мировой судья
+    r'МССУ',                              # МССУ (мировой судебный участок)
+)
+
+# Признаки списка обязанностей (подстроки без учета регистра)
+DUTIES_KEYWORDS = (
+    "уходить", "жительства", "выехать", "изменять", "дома",
+    "регистр", "УИИ", "22", "23", "06", "05", "пределы",
+    "менять", "ПМЖ", "курс", "лечения"
+)
+
+
+def _first_char(pattern):
+    """Первый символ шаблона для класса символов: буква, цифра или \\d"""
+    if pattern.startswith(r'\d'):
+        return r'\d'
+    if not pattern[:1].isalnum():
+        raise ValueError(f"Шаблон ключевого слова должен начинаться с буквы, цифры или \\d: {pattern}")
+    return pattern[0]
+
+
+class KeywordMatcher:
+    """
+    Классификатор ячеек по ключевым словам нескольких категорий
+
+    Шаблоны всех категорий собраны в одно скомпилированное выражение, каждая
+    категория - своя группа; если в одной позиции совпадают несколько категорий,
+    побеждает более приоритетная. Поиск останавливается на первом ключевом слове.
+    Если оно не из самой приоритетной категории, оставшаяся часть текста
+    проверяется шаблонами более приоритетных категорий - это второй поиск.
+    Шаблоны с ".*?" (например, "дата ... суд") при проверке позиции
+    просматривают текст дальше, поэтому классификация не линейна по длине текста
+    """
+
+    def __init__(self, categories):
+        """
+        Args:
+            categories (tuple): Пары (категория, шаблоны) в порядке приоритета;
+                                шаблон начинается с буквы, цифры или \\d и не содержит
+                                захватывающих групп
+        """
+        self.categories = [name for name, _ in categories]
+        alternatives = ['|'.join(f'(?:{pattern})' for pattern in patterns) for _, patterns in categories]
+
+        # Позиции, с которых не начинается ни одно ключевое слово, отбрасываются
+        # по первому символу без проверки всех шаблонов
+        first_chars = dict.fromkeys(_first_char(pattern) for _, patterns in categories for pattern in patterns)
+        guard = '(?=[' + ''.join(first_chars) + '])'
+
+        self.pattern = re.compile(
+            guard + '(?:' + '|'.join(f'({alternative})' for alternative in alternatives) + ')',
+            re.IGNORECASE
+        )
+        # Отдельные шаблоны категорий - для поиска в оставшейся части текста
+        self.category_patterns = [re.compile(guard + f'(?:{alternative})', re.IGNORECASE)
+                                  for alternative in alternatives]
+
+    def classify(self, text):
+        """
+        Определяет категорию текста: первая по приоритету из найденных
+
+        Args:
+            text (str): Текст ячейки
+
+        Returns:
+            str: Категория или None, если ключевых слов нет
+        """
+        if not text:
+            return None
+
+        match = self.pattern.search(text)
+        if match is None:
+            return None
+
+        # В позиции совпадения более приоритетные категории уже проверены
+        found = match.lastindex - 1
+        for index in range(found):
+            if self.category_patterns[index].search(text, match.start() + 1):
+                return self.categories[index]
+        return self.categories[found]
+
+
+# Общий классификатор столбцов D и E: информация о суде важнее обязанностей
+KEYWORD_MATCHER = KeywordMatcher((
+    ('court', COURT_KEYWORDS),
+    ('duties', tuple(re.escape(keyword) for keyword in DUTIES_KEYWORDS)),
+))
@@ -0,0 +1,207 @@
+import re
+
+NAME_CLEAN_RE = re.compile(r'[^\w\s-]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Слитно записанные слова: "ИвановИван" -> "Иванов Иван"
+JOINED_WORDS_RE = re.compile(r'(?<=[а-яё])(?=[А-ЯЁ])')
+
+# Вариант в скобках: "Славин (Сенин)" - фамилия и ее второй вариант
+PARENTHESES_RE = re.compile(r'(\S+)\s*\(([^)]*)\)')
+
+# Тюркские частицы после отчества, которые в разных файлах пишутся по-разному или опускаются
+PATRONYMIC_SUFFIXES = {'оглы', 'оглу', 'огли', 'угли', 'кызы', 'кизи', 'гызы'}
+
+# Группы созвучных согласных для фонетического ключа (глухие и звонкие пары объединены)
+PHONETIC_GROUPS = {
+    'б': 'п', 'п': 'п',
+    'в': 'ф', 'ф': 'ф',
+    'г': 'к', 'к': 'к', 'х': 'к',
+    'д': 'т', 'т': 'т',
+    'ж': 'ш', 'ш': 'ш', 'щ': 'ш', 'ч': 'ш',
+    'з': 'с', 'с': 'с', 'ц': 'с',
+    'л': 'л', 'м': 'м', 'н': 'н', 'р': 'р'
+}
+VOWELS = set('аеёиоуыэюяй')
+
+# Ключи, по которым ищутся кандидаты: фамилия и фамилия + инициал имени
+SURNAME_KEY = 's:'
+SURNAME_INITIAL_KEY = 'si:'
+# Ключи всех слов ФИО (используются при подсчете совпадений и если фамилия не нашлась)
+WORD_KEY = 'w:'
+
+# Уровень слов отбирается в SQL: записи хотя бы с двумя совпавшими словами (если в
+# запросе их меньше - со всеми), не больше WORD_TIER_CANDIDATES на один результат
+WORD_TIER_MIN_MATCHES = 2
+WORD_TIER_CANDIDATES = 20
+
+
+def normalize_name(value):
+    """
+    Нормализует ФИО для сравнения: нижний регистр, ё -> е,
+    без знаков препинания и лишних пробелов
+
+    Args:
+        value: ФИО (строка или значение ячейки)
+
+    Returns:
+        str: Нормализованное ФИО или None для пустого значения
+    """
+    if not value:
+        return None
+
+    text = str(value).lower().replace('ё', 'е')
+    text = WHITESPACE_RE.sub(' ', NAME_CLEAN_RE.sub(' ', text)).strip()
+    return text or None
+
+
+def name_variants(value):
+    """
+    Варианты написания ФИО для нечеткого сравнения
+
+    Слитные слова разделяются, вариант в скобках дает отдельное написание,
+    частицы "оглы"/"кызы" отбрасываются
+
+    Args:
+        value: ФИО
+
+    Returns:
+        list: Списки слов для каждого варианта (пустой список для пустого ФИО)
+    """
+    if not value:
+        return []
+
+    text = JOINED_WORDS_RE.sub(' ', str(value))
+
+    texts = [text]
+    if PARENTHESES_RE.search(text):
+        texts = [PARENTHESES_RE.sub(r'\1', text), PARENTHESES_RE.sub(r'\2', text)]
+
+    variants = []
+    for text in texts:
+        words = [word for word in (normalize_name(text) or '').replace('-', ' ').split()
+                 if word not in PATRONYMIC_SUFFIXES]
+        if words and words not in variants:
+            variants.append(words)
+
+    return variants
+
+
+def phonetic_key(word):
+    """
+    Фонетический ключ слова (упрощенный русский Soundex): остов из групп созвучных
+    согласных, гласные отбрасываются, кроме начальной, повторы схлопываются
+
+    "Славин" и "Славен" -> "слфн", "Иванов" и "Иванова" -> "афнф"
+
+    Args:
+        word (str): Слово в нижнем регистре
+
+    Returns:
+        str: Фонетический ключ
+    """
+    key = 'а' if word[:1] in VOWELS else ''
+    for char in word:
+        code = PHONETIC_GROUPS.get(char)
+        if code is None:
+            # Буквы других алфавитов сохраняются как есть, гласные и знаки пропускаются
+            if char in VOWELS or char in 'ьъ' or not char.isalpha():
+                continue
+            code = char
+        if not key or key[-1] != code:
+            key += code
+    return key
+
+
+def name_keys(value):
+    """
+    Ключи нечеткого индекса для ФИО
+
+    Returns:
+        set: Ключи фамилии (s:), фамилии с инициалом имени (si:) и всех слов (w:)
+    """
+    keys = set()
+    for words in name_variants(value):
+        surname = phonetic_key(words[0])
+        keys.add(SURNAME_KEY + surname)
+        if len(words) > 1:
+            keys.add(f"{SURNAME_INITIAL_KEY}{surname}:{words[1][0]}")
+        keys.update(WORD_KEY + phonetic_key(word) for word in words)
+    return keys
+
+
+def _trigrams(words):
+    """Множество триграмм строки из слов (с граничными пробелами)"""
+    text = f"  {' '.join(words)} "
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def name_trigrams(value):
+    """Множества триграмм для каждого варианта написания ФИО"""
+    return [_trigrams(words) for words in name_variants(value)]
+
+
+def trigram_similarity(first_sets, second_sets):
+    """Лучший коэффициент Жаккара между вариантами двух ФИО (см. name_trigrams)"""
+    best = 0.0
+    for first in first_sets:
+        for second in second_sets:
+            best = max(best, len(first & second) / len(first | second))
+    return best
+
+
+def name_similarity(first, second):
+    """
+    Сходство двух ФИО от 0 до 1 (коэффициент Жаккара по триграммам,
+    лучший из вариантов написания)
+
+    Args:
+        first: Первое ФИО
+        second: Второе ФИО
+
+    Returns:
+        float: Сходство (1 - совпадают после нормализации)
+    """
+    return trigram_similarity(name_trigrams(first), name_trigrams(second))
+
+
+def candidate_tiers(keys):
+    """
+    Ключи для поиска кандидатов по уровням избирательности: фамилия с инициалом имени,
+    фамилия, все слова. Кандидаты набираются по уровням, пока их не хватает
+
+    Args:
+        keys (set): Ключи ФИО (см. name_keys)
+
+    Returns:
+        list: Множества ключей для каждого уровня
+    """
+    return [
+        {key for key in keys if key.startswith(prefix)}
+        for prefix in (SURNAME_INITIAL_KEY, SURNAME_KEY, WORD_KEY)
+    ]
+
+
+def rank_candidates(name, candidates, limit):
+    """
+    Упорядочивает кандидатов по сходству с ФИО
+
+    Args:
+        name: Искомое ФИО
+        candidates: Пары (id, ФИО)
+        limit (int): Количество возвращаемых записей
+
+    Returns:
+        list: Кортежи (id, ФИО, сходство) по убыванию сходства
+    """
+    query = name_trigrams(name)
+    # Одинаковые ФИО (повторные записи одного человека) сравниваются один раз
+    similarities = {}
+    ranked = []
+    for item_id, full_name in candidates:
+        if full_name not in similarities:
+            similarities[full_name] = trigram_similarity(query, name_trigrams(full_name))
+        ranked.append((item_id, full_name, similarities[full_name]))
+    ranked.sort(key=lambda item: item[2], reverse=True)
+    return ranked[:limit]
+
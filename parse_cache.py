@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+
+import openpyxl
+
+# Версия правил обработки. Увеличивается при изменении формата сохраняемой модели;
+# изменения кода обработчиков учитываются автоматически (см. pipeline_version)
+PIPELINE_VERSION = 1
+
+# Модули, от которых зависит результат обработки документа: правила процессора,
+# разбор адресов (docx_to_database.process_tables) и сохраняемая модель книги
+PIPELINE_MODULES = (
+    'docx_to_excel_processor',
+    'date_tokenizer',
+    'keyword_matcher',
+    'rule_gates',
+    'column_b_formatter',
+    'column_i_formatter',
+    'column_k_formatter',
+    'column_l_formatter',
+    'final_date_formatter',
+    'b_column_parser',
+    'column_kernels',
+    'docx_to_database',
+    'parse_cache',
+)
+
+DEFAULT_CACHE_NAME = "parse_cache.db"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """
+    Вычисляет SHA-256 файла (читается блоками)
+
+    Args:
+        path (str): Путь к файлу
+        chunk_size (int): Размер блока чтения
+
+    Returns:
+        str: Хеш в шестнадцатеричном виде
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pipeline_version():
+    """
+    Версия конвейера: PIPELINE_VERSION и хеш исходного кода модулей обработки,
+    поэтому после любого изменения правил кэш автоматически устаревает
+
+    Returns:
+        str: Строка версии
+    """
+    digest = hashlib.sha256()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in PIPELINE_MODULES:
+        with open(os.path.join(base_dir, f"{module}.py"), 'rb') as source:
+            digest.update(source.read())
+    return f"{PIPELINE_VERSION}:{digest.hexdigest()[:16]}"
+
+
+def row_fingerprint(row):
+    """
+    Отпечаток строки таблицы (значения ячеек в порядке столбцов)
+
+    Строка берется в раскладке для обработки (после project_table): номер по
+    порядку в столбце A и столбец C отбрасываются правилами и в отпечаток не входят
+
+    Args:
+        row (list): Значения ячеек строки
+
+    Returns:
+        str: Хеш строки в шестнадцатеричном виде
+    """
+    text = '\x1f'.join('' if value is None else str(value) for value in row)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def trim_row(values):
+    """Убирает пустые ячейки в конце строки"""
+    values = list(values)
+    while values and values[-1] is None:
+        values.pop()
+    return values
+
+
+def workbook_model(workbook):
+    """
+    Модель обработанной книги: для каждого листа название, строки значений
+    и ширина столбцов
+
+    Args:
+        workbook: Рабочая книга openpyxl
+
+    Returns:
+        list: Модели листов
+    """
+    sheets = []
+    for sheet in workbook.worksheets:
+        # Пустые ячейки в конце строки не сохраняем
+        rows = [trim_row(values) for values in sheet.iter_rows(values_only=True)]
+
+        widths = {letter: dimension.width for letter, dimension in sheet.column_dimensions.items()
+                  if dimension.width}
+        sheets.append({'title': sheet.title, 'rows': rows, 'widths': widths})
+
+    return sheets
+
+
+def build_workbook_from_model(sheets):
+    """
+    Восстанавливает рабочую книгу из модели (см. workbook_model)
+
+    Args:
+        sheets (list): Модели листов
+
+    Returns:
+        Workbook: Рабочая книга openpyxl
+    """
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+
+    for model in sheets:
+        sheet = workbook.create_sheet(title=model['title'])
+        for values in model['rows']:
+            sheet.append(values)
+        for letter, width in model['widths'].items():
+            sheet.column_dimensions[letter].width = width
+
+    return workbook
+
+
+class ParseCache:
+    """
+    Кэш результатов обработки DOCX на диске (SQLite)
+
+    Ключ - SHA-256 документа и версия конвейера, значение - сжатая модель
+    обработанной книги и статистика обработки. Отдельно хранятся результаты
+    обработки строк по отпечаткам исходных строк (инкрементальная обработка)
+    """
+
+    def __init__(self, cache_path=DEFAULT_CACHE_NAME):
+        """
+        Args:
+            cache_path (str): Путь к файлу кэша
+        """
+        self.cache_path = cache_path
+        self.version = pipeline_version()
+
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS parse_cache (
+            docx_hash TEXT NOT NULL,
+            pipeline_version TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (docx_hash, pipeline_version)
+        )
+        ''')
+        # Результаты обработки отдельных строк (для инкрементальной обработки)
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS row_cache (
+            fingerprint TEXT PRIMARY KEY,
+            pipeline_version TEXT NOT NULL,
+            row_values TEXT NOT NULL
+        ) WITHOUT ROWID
+        ''')
+        # Строки, обработанные другой версией конвейера, больше не понадобятся
+        conn.execute('DELETE FROM row_cache WHERE pipeline_version != ?', (self.version,))
+        conn.commit()
+        conn.close()
+
+    def load(self, docx_hash):
+        """
+        Ищет результат обработки документа
+
+        Args:
+            docx_hash (str): SHA-256 документа (см. file_sha256)
+
+        Returns:
+            tuple: (Workbook, статистика) или None, если записи нет
+        """
+        conn = sqlite3.connect(self.cache_path)
+        row = conn.execute(
+            'SELECT payload FROM parse_cache WHERE docx_hash = ? AND pipeline_version = ?',
+            (docx_hash, self.version)
+        ).fetchone()
+        conn.close()
+
+        if row is None:
+            return None
+
+        payload = json.loads(zlib.decompress(row[0]))
+        return build_workbook_from_model(payload['sheets']), payload['stats']
+
+    def store(self, docx_hash, workbook, stats):
+        """
+        Сохраняет результат обработки документа; записи для других версий
+        конвейера этого документа удаляются
+
+        Args:
+            docx_hash (str): SHA-256 документа
+            workbook: Обработанная рабочая книга
+            stats (dict): Статистика обработки (сериализуемая в JSON)
+        """
+        payload = json.dumps({'sheets': workbook_model(workbook), 'stats': stats}, ensure_ascii=False)
+
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute('DELETE FROM parse_cache WHERE docx_hash = ?', (docx_hash,))
+        conn.execute(
+            'INSERT INTO parse_cache (docx_hash, pipeline_version, payload) VALUES (?, ?, ?)',
+            (docx_hash, self.version, zlib.compress(payload.encode('utf-8')))
+        )
+        conn.commit()
+        conn.close()
+
+    def load_rows(self, fingerprints, chunk_size=500):
+        """
+        Ищет обработанные строки по отпечаткам исходных строк
+
+        Args:
+            fingerprints: Отпечатки строк (см. row_fingerprint)
+            chunk_size (int): Количество отпечатков в одном запросе
+
+        Returns:
+            dict: Отпечаток -> значения обработанной строки (только найденные)
+        """
+        fingerprints = list(dict.fromkeys(fingerprints))
+        rows = {}
+
+        conn = sqlite3.connect(self.cache_path)
+        for start in range(0, len(fingerprints), chunk_size):
+            chunk = fingerprints[start:start + chunk_size]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor = conn.execute(
+                f'SELECT fingerprint, row_values FROM row_cache '
+                f'WHERE pipeline_version = ? AND fingerprint IN ({placeholders})',
+                [self.version] + chunk
+            )
+            rows.update((fingerprint, json.loads(values)) for fingerprint, values in cursor)
+        conn.close()
+
+        return rows
+
+    def store_rows(self, rows):
+        """
+        Сохраняет обработанные строки
+
+        Args:
+            rows (dict): Отпечаток -> значения обработанной строки
+        """
+        conn = sqlite3.connect(self.cache_path)
+        conn.executemany(
+            'INSERT OR REPLACE INTO row_cache (fingerprint, pipeline_version, row_values) VALUES (?, ?, ?)',
+            [(fingerprint, self.version, json.dumps(values, ensure_ascii=False))
+             for fingerprint, values in rows.items()]
+        )
+        conn.commit()
+        conn.close()
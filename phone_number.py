@@ -0,0 +1,66 @@
+import re
+
+NON_DIGIT_RE = re.compile(r'\D')
+
+# Длина номера в международном формате E.164 для России: "7" и 10 цифр
+PHONE_LENGTH = 11
+COUNTRY_CODE = '7'
+
+# Префикс с явным кодом страны: "+7...", "8 (921)", "8-921"
+COUNTRY_CODE_RE = re.compile(r'\s*(?:\+\s*7|[78]\D)')
+
+
+def normalize_phone(text):
+    """
+    Приводит телефон к числу в формате E.164 без "+": 79211234567
+
+    Принимаются 10 цифр ("9211234567") и 11 цифр с "8" или "7" в начале
+    ("89211234567", "+7 (921) 123-45-67"); разделители не учитываются
+
+    Args:
+        text (str): Телефон (столбец P или ввод оператора)
+
+    Returns:
+        int: Номер или None, если это не телефон
+    """
+    if text is None:
+        return None
+
+    digits = NON_DIGIT_RE.sub('', str(text))
+    if len(digits) == PHONE_LENGTH and digits[0] in '78':
+        digits = digits[1:]
+    if len(digits) != PHONE_LENGTH - 1:
+        return None
+    return int(COUNTRY_CODE + digits)
+
+
+def phone_prefix_range(prefix):
+    """
+    Диапазон номеров E.164, начинающихся с префикса (для поиска по индексу через BETWEEN)
+
+    Первая "8" или "7" считается кодом страны, только если он записан явно:
+    "+7 921", "8 921", "8(921)" и "921" - одно и то же; в номере из 11 цифр код страны
+    отбрасывается всегда.
+    Слитная запись неоднозначна: "8921" и "812" ищутся как первые цифры номера после
+    кода страны ("7 8921...", "7 812..."), поэтому для поиска с кодом нужен "+" или разделитель
+
+    Args:
+        prefix (str): Начало номера
+
+    Returns:
+        tuple: (наименьший, наибольший) номер или None, если в префиксе нет цифр
+               или он длиннее номера
+    """
+    text = str(prefix or '')
+    digits = NON_DIGIT_RE.sub('', text)
+    if not digits:
+        return None
+    if len(digits) == PHONE_LENGTH or COUNTRY_CODE_RE.match(text):
+        if digits[0] in '78':
+            digits = digits[1:]
+
+    digits = COUNTRY_CODE + digits
+    free = PHONE_LENGTH - len(digits)
+    if free < 0:
+        return None
+    return int(digits) * 10 ** free, (int(digits) + 1) * 10 ** free - 1
@@ -0,0 +1,170 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+class PipelineMetrics:
+    """
+    Класс для сбора метрик этапов обработки: время (реальное и процессорное),
+    количество строк и объем текста по каждому этапу и листу
+    """
+
+    def __init__(self, detailed=False):
+        """
+        Args:
+            detailed (bool): Считать объем текста на входе этапов (text_size) -
+                             отдельный проход по столбцам листа перед каждым этапом
+        """
+        self.detailed = detailed
+        # Список записей по этапам в порядке выполнения
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, sheet=None, rows=0, text_bytes=0):
+        """
+        Замеряет выполнение этапа обработки
+
+        Args:
+            name (str): Название этапа
+            sheet (str): Название листа (None для этапов уровня файла)
+            rows (int): Количество обработанных строк
+            text_bytes (int): Объем текста на входе этапа в байтах (UTF-8)
+
+        Yields:
+            dict: Запись этапа, счетчики в которой можно уточнить внутри блока
+        """
+        record = {
+            'stage': name,
+            'sheet': sheet,
+            'rows': rows,
+            'bytes': text_bytes,
+            'wall_time': 0.0,
+            'cpu_time': 0.0
+        }
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_time'] = time.perf_counter() - wall_start
+            record['cpu_time'] = time.process_time() - cpu_start
+            self.records.append(record)
+
+    def text_size(self, sheet, *column_indexes):
+        """
+        Объем текста в столбцах листа для записи этапа; без детальных метрик - 0
+        (столбцы не читаются)
+
+        Args:
+            sheet: Лист Excel
+            column_indexes (int): Индексы столбцов
+
+        Returns:
+            int: Объем текста в байтах (UTF-8)
+        """
+        if not self.detailed:
+            return 0
+        return column_text_size(sheet, *column_indexes)
+
+    def report(self):
+        """
+        Формирует структурированный отчет по всем замерам
+
+        Returns:
+            dict: Итоги, сводка по этапам и детализация по листам
+        """
+        stages = {}
+        sheets = {}
+        total = {'rows': 0, 'bytes': 0, 'wall_time': 0.0, 'cpu_time': 0.0}
+
+        for record in self.records:
+            summary = stages.setdefault(record['stage'], {
+                'calls': 0, 'rows': 0, 'bytes': 0, 'wall_time': 0.0, 'cpu_time': 0.0
+            })
+            summary['calls'] += 1
+            for key in ('rows', 'bytes', 'wall_time', 'cpu_time'):
+                summary[key] += record[key]
+                total[key] += record[key]
+
+            if record['sheet'] is not None:
+                sheets.setdefault(record['sheet'], {})[record['stage']] = {
+                    'rows': record['rows'],
+                    'bytes': record['bytes'],
+                    'wall_time': record['wall_time'],
+                    'cpu_time': record['cpu_time']
+                }
+
+        # Скорость обработки по этапам (строк в секунду)
+        for summary in stages.values():
+            wall_time = summary['wall_time']
+            summary['rows_per_sec'] = summary['rows'] / wall_time if wall_time > 0 else None
+
+        return {
+            'total': total,
+            'stages': stages,
+            'sheets': sheets
+        }
+
+    def to_json(self, path=None):
+        """
+        Возвращает отчет в формате JSON и при необходимости сохраняет его в файл
+
+        Args:
+            path (str): Путь к файлу для сохранения отчета
+
+        Returns:
+            str: Отчет в формате JSON
+        """
+        report_json = json.dumps(self.report(), ensure_ascii=False, indent=2)
+
+        if path:
+            with open(path, 'w', encoding='utf-8') as report_file:
+                report_file.write(report_json)
+
+        return report_json
+
+    def format_summary(self, limit=10):
+        """
+        Формирует краткую текстовую сводку для панели статуса
+
+        Args:
+            limit (int): Максимальное количество этапов в сводке (самые долгие)
+
+        Returns:
+            str: Текст сводки
+        """
+        report = self.report()
+        stages = sorted(report['stages'].items(), key=lambda item: item[1]['wall_time'], reverse=True)
+
+        lines = [f"Общее время: {report['total']['wall_time']:.2f} с "
+                 f"(CPU {report['total']['cpu_time']:.2f} с)"]
+        for name, summary in stages[:limit]:
+            line = (f"- {name}: {summary['wall_time']:.3f} с, CPU {summary['cpu_time']:.3f} с, "
+                    f"строк {summary['rows']}")
+            if self.detailed:
+                line += f", {summary['bytes'] / 1024:.1f} КБ"
+            lines.append(line)
+
+        return '\n'.join(lines)
+
+
+def column_text_size(sheet, *column_indexes):
+    """
+    Подсчитывает объем текста в указанных столбцах листа
+
+    Args:
+        sheet: Лист Excel
+        column_indexes (int): Индексы столбцов
+
+    Returns:
+        int: Объем текста в байтах (UTF-8)
+    """
+    total_bytes = 0
+
+    for column_index in column_indexes:
+        for (value,) in sheet.iter_rows(min_col=column_index, max_col=column_index, values_only=True):
+            if value:
+                total_bytes += len(str(value).encode('utf-8'))
+
+    return total_bytes
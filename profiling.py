@@ -0,0 +1,83 @@
+import cProfile
+import io
+import os
+import pstats
+from contextlib import contextmanager
+
+# Переменная окружения для включения профилирования без изменения кода
+PROFILE_ENV = "DOCX_PROFILE"
+
+
+def profiling_enabled(enabled=None):
+    """
+    Определяет, включено ли профилирование
+
+    Args:
+        enabled (bool): Явный флаг; если None - берется из переменной окружения DOCX_PROFILE
+
+    Returns:
+        bool: True если профилирование включено
+    """
+    if enabled is not None:
+        return bool(enabled)
+    return os.environ.get(PROFILE_ENV, "").strip() not in ("", "0")
+
+
+@contextmanager
+def profile_run(output_path, label, enabled=None, top_n=30):
+    """
+    Профилирует блок кода через cProfile и сохраняет результаты рядом с выходным файлом:
+    <имя>_<label>.pstats и <имя>_<label>_hotspots.txt (top-N функций)
+
+    Args:
+        output_path (str): Путь к выходному xlsx-файлу
+        label (str): Название профилируемой операции
+        enabled (bool): Включить профилирование (None - по переменной окружения)
+        top_n (int): Количество функций в сводке
+
+    Yields:
+        dict: Пути к сохраненным файлам (заполняются после выхода из блока) или None
+    """
+    if not output_path or not profiling_enabled(enabled):
+        yield None
+        return
+
+    result = {'stats_path': None, 'summary_path': None}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+
+        base_path = f"{os.path.splitext(output_path)[0]}_{label}"
+        result['stats_path'] = base_path + ".pstats"
+        result['summary_path'] = base_path + "_hotspots.txt"
+
+        profiler.dump_stats(result['stats_path'])
+        with open(result['summary_path'], 'w', encoding='utf-8') as summary_file:
+            summary_file.write(format_hotspots(profiler, top_n))
+
+
+def format_hotspots(profiler, top_n=30):
+    """
+    Формирует текстовую сводку самых затратных функций
+
+    Args:
+        profiler: Объект cProfile.Profile или путь к файлу .pstats
+        top_n (int): Количество функций в каждом разделе
+
+    Returns:
+        str: Сводка по собственному и накопленному времени
+    """
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.strip_dirs()
+
+    stream.write(f"=== Топ-{top_n} по собственному времени (tottime) ===\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top_n)
+
+    stream.write(f"\n=== Топ-{top_n} по накопленному времени (cumtime) ===\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+
+    return stream.getvalue()
@@ -0,0 +1,58 @@
+import re
+
+# Виды обязанностей и ограничений (столбец L): код, название и шаблон поиска в одном пункте.
+# Порядок задает идентификаторы в таблице restriction_types, новые виды добавляются в конец
+RESTRICTION_TYPES = (
+    ('residence', 'не менять место жительства',
+     r'(?:менят|изменят|\bизм\b)[^;]*?(?:жительств|пребыван)'),
+    ('work', 'не менять место работы',
+     r'(?:менят|изменят|\bизм\b)[^;]*?работ'),
+    ('registration', 'являться на регистрацию',
+     r'явл|являт|явк|явит|отмечат|ежемесячн|^\s*рег|\d\s*р(?:аз[а-яё]*|\.)?\s*(?:в\s+|/\s*)мес'),
+    ('employment', 'трудоустроиться или встать на учет в ЦЗН',
+     r'трудоустр|\bтруд\.|\bработать|\bцзн?\b'),
+    ('treatment', 'пройти лечение',
+     r'лечени|нарколог|врач|реабилит'),
+    ('curfew', 'находиться дома в ночное время',
+     r'ночн|дома\b|не\s+уходить|не\s+покидать|жил[а-яё]*\s+помещ|\bс\s*\d{1,2}\D{0,3}\d{0,2}\s*(?:час[а-яё]*\s*)?до\s*\d'),
+    ('travel', 'не выезжать за пределы территории',
+     r'выезж|выезд|за\s+предел(?![а-яё]*\s+жил)'),
+    ('public_places', 'не посещать массовые мероприятия и заведения',
+     r'посещ|массов|\bбар|кафе|ресторан|\bрест\b|развлекат|пикет|митинг'),
+    ('contact', 'запрет общения',
+     r'общени|общат'),
+    ('internet', 'запрет использования интернета',
+     r'интернет'),
+    ('communication', 'запрет средств связи и почтовых отправлений',
+     r'средств[а-яё]*\s+связи|почтов|телеграф'),
+    ('damages', 'возместить ущерб',
+     r'\bиск\b|ущерб|возмещ|погас'),
+)
+
+RESTRICTION_PATTERNS = [(code, re.compile(pattern, re.IGNORECASE)) for code, _, pattern in RESTRICTION_TYPES]
+
+# Пункты перечня обязанностей разделяются точкой с запятой
+CLAUSE_SEPARATOR_RE = re.compile(r';')
+
+
+def parse_restrictions(text):
+    """
+    Определяет виды обязанностей в тексте столбца L
+
+    Каждый пункт перечня проверяется по всем шаблонам RESTRICTION_TYPES
+    (в одном пункте может быть несколько обязанностей)
+
+    Args:
+        text (str): Обязанности (после ColumnLFormatter)
+
+    Returns:
+        list: Коды видов обязанностей в порядке RESTRICTION_TYPES (без повторов)
+    """
+    if not text:
+        return []
+
+    clauses = CLAUSE_SEPARATOR_RE.split(str(text).replace('ё', 'е'))
+    return [
+        code for code, pattern in RESTRICTION_PATTERNS
+        if any(pattern.search(clause) for clause in clauses)
+    ]
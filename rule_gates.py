@@ -0,0 +1,71 @@
+import re
+from collections import namedtuple
+
+# Группа правил замены с дешевыми признаками срабатывания:
+#   triggers - подстроки, хотя бы одна из которых обязательна для любого правила группы;
+#   chars - символы, хотя бы один из которых обязателен (None - без проверки);
+#   ignore_case - признаки ищутся в тексте без учета регистра (для правил с re.IGNORECASE);
+#   rules - пары (скомпилированное выражение, замена) в порядке применения
+RuleGroup = namedtuple('RuleGroup', ['triggers', 'chars', 'ignore_case', 'rules'])
+
+# Цифры номеров частей статей ("ч. 1" - "ч. 6")
+PART_DIGITS = frozenset('123456')
+
+
+def rule_group(triggers, rules, chars=None, flags=0):
+    """
+    Создает группу правил с признаками срабатывания
+
+    Каждое правило группы может сработать, только если в тексте есть хотя бы
+    один из признаков (и символ из chars) - иначе вся группа пропускается
+
+    Args:
+        triggers (tuple): Обязательные подстроки (достаточно одной);
+                          для flags с re.IGNORECASE - в нижнем регистре
+        rules (list): Пары (шаблон, замена)
+        chars (str): Обязательные символы (достаточно одного)
+        flags (int): Флаги компиляции шаблонов
+
+    Returns:
+        RuleGroup: Группа правил
+    """
+    ignore_case = bool(flags & re.IGNORECASE)
+    if ignore_case and any(trigger != trigger.casefold() for trigger in triggers):
+        raise ValueError(f"Признаки группы без учета регистра должны быть в нижнем регистре: {triggers}")
+
+    return RuleGroup(
+        tuple(triggers),
+        frozenset(chars) if chars else None,
+        ignore_case,
+        tuple((re.compile(pattern, flags), replacement) for pattern, replacement in rules)
+    )
+
+
+def apply_rule_groups(text, groups, stats=None):
+    """
+    Применяет группы правил по порядку, пропуская группы без признаков в тексте
+
+    Признаки проверяются на тексте после предыдущих групп, поэтому замены,
+    которые создают признак следующей группы, учитываются
+
+    Args:
+        text (str): Исходный текст
+        groups (tuple): Группы правил (RuleGroup)
+        stats (dict): Статистика; rules_skipped увеличивается на число пропущенных правил
+
+    Returns:
+        str: Текст после замен
+    """
+    for group in groups:
+        # casefold совпадает с сопоставлением re.IGNORECASE для кириллицы
+        haystack = text.casefold() if group.ignore_case else text
+        if (not any(trigger in haystack for trigger in group.triggers)
+                or (group.chars is not None and group.chars.isdisjoint(haystack))):
+            if stats is not None:
+                stats['rules_skipped'] = stats.get('rules_skipped', 0) + len(group.rules)
+            continue
+
+        for pattern, replacement in group.rules:
+            text = pattern.sub(replacement, text)
+
+    return text
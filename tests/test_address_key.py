@@ -0,0 +1,55 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from address_key import Address, address_key, parse_address
+
+
+class ParseAddressTest(unittest.TestCase):
+    """Разбор стандартизированного адреса столбца O"""
+
+    def test_house_parts(self):
+        """Номер дома разбирается по числу частей через дефис"""
+        self.assertEqual(parse_address('Бутлерова 11'), Address('Бутлерова', '11', None, None))
+        self.assertEqual(parse_address('пр. Науки 30-85'), Address('Науки', '30', None, '85'))
+        self.assertEqual(parse_address('ул. Бутлерова 11-2-45'), Address('Бутлерова', '11', '2', '45'))
+        self.assertEqual(parse_address('ул. Бутлерова 14-1А-Б-93'), Address('Бутлерова', '14', '1А-Б', '93'))
+
+    def test_street_spelling(self):
+        """Улица ищется в справочнике без учета регистра, "ё" и лишних пробелов"""
+        self.assertEqual(parse_address('бутлерова  11-2-45'), Address('Бутлерова', '11', '2', '45'))
+        self.assertEqual(parse_address('Непокоренных 6д-31'), Address('Непокорённых', '6Д', None, '31'))
+
+    def test_street_without_house(self):
+        self.assertEqual(parse_address('ул. Бутлерова'), Address('Бутлерова', None, None, None))
+
+    def test_unknown_street(self):
+        self.assertEqual(parse_address('ул. Неизвестная 5-1'), Address(None, '5', None, '1'))
+
+    def test_empty(self):
+        self.assertIsNone(parse_address(''))
+        self.assertIsNone(parse_address('   '))
+        self.assertIsNone(parse_address(None))
+
+
+class AddressKeyTest(unittest.TestCase):
+    """Канонический ключ адреса"""
+
+    def test_same_address_in_different_spelling(self):
+        first, second = 'ул. Бутлерова 11-2-45', 'бутлерова  11-2-45'
+        self.assertEqual(address_key(first, parse_address(first), 12), '12:11:2:45')
+        self.assertEqual(address_key(second, parse_address(second), 12), '12:11:2:45')
+
+    def test_missing_parts(self):
+        self.assertEqual(address_key('пр. Науки 30-85', parse_address('пр. Науки 30-85'), 7), '7:30::85')
+
+    def test_street_not_in_directory(self):
+        """Адрес с улицей не из справочника сравнивается по тексту целиком"""
+        text = 'ул. Неизвестная  5-1'
+        self.assertEqual(address_key(text, parse_address(text), None), ':ул. неизвестная 5-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from court_parser import Article, court_key, parse_articles, parse_court_decision, parse_term
+
+
+class ParseCourtDecisionTest(unittest.TestCase):
+    """Разбор информации о приговоре (столбец K)"""
+
+    def test_conditional_sentence(self):
+        decision = parse_court_decision(
+            '12.03.2020 Калининским р/с СПб по ст. 158 ч. 3 п. «г» УК РФ к 3 г. 6 мес. л/св условно с ИС 2 года'
+        )
+        self.assertEqual(decision['decision_date'], '2020-03-12')
+        self.assertEqual(decision['court_key'], 'калининский р/с')
+        self.assertEqual(decision['articles'], [Article('158', 3, 'г')])
+        self.assertEqual(decision['punishment'], 'лишение свободы')
+        self.assertEqual(decision['term_months'], 42)
+        self.assertTrue(decision['conditional'])
+        self.assertEqual(decision['probation_months'], 24)
+
+    def test_points_before_article(self):
+        """Форма "п. «а, в» ч. 2 ст. 158": пункт и часть относятся к следующей статье"""
+        decision = parse_court_decision(
+            'Приговор Невского районного суда от 05.06.2021 по п. «а, в» ч. 2 ст. 158, 159 ч. 1 УК РФ к 1 году ИР'
+        )
+        self.assertEqual(decision['court_name'], 'Невского районного суда')
+        self.assertEqual(decision['court_key'], 'невский р/с')
+        self.assertEqual(decision['articles'], [Article('158', 2, 'а,в'), Article('159', 1, None)])
+        self.assertEqual(decision['punishment'], 'исправительные работы')
+        self.assertEqual(decision['term_months'], 12)
+        self.assertFalse(decision['conditional'])
+
+    def test_magistrate_and_fine(self):
+        decision = parse_court_decision('МССУ № 56 от 01.02.2022 по ст. 264.1 УК РФ к штрафу')
+        self.assertEqual(decision['court_key'], 'мссу № 56')
+        self.assertEqual(decision['articles'], [Article('264.1', None, None)])
+        self.assertEqual(decision['punishment'], 'штраф')
+        self.assertIsNone(decision['term_months'])
+
+    def test_later_decisions_are_ignored(self):
+        """Постановление после даты (продление ИС) не относится к приговору"""
+        decision = parse_court_decision('15.01.2019 КРС по 228 ч. 1 к 2 г. л/св., 20.05.2020 продлен ИС на 1 мес.')
+        self.assertEqual(decision['decision_date'], '2019-01-15')
+        self.assertEqual(decision['court_key'], 'калининский р/с')
+        self.assertEqual(decision['term_months'], 24)
+        self.assertFalse(decision['conditional'])
+        self.assertIsNone(decision['probation_months'])
+
+    def test_two_digit_year_has_no_iso_date(self):
+        decision = parse_court_decision('01.01.20 Городским судом по ст. 158 (2 эп.), ст.161 ч.2 п.«г» УК РФ к 4 г. лишения свободы')
+        self.assertIsNone(decision['decision_date'])
+        self.assertEqual(decision['court_key'], 'г/с')
+        self.assertEqual(decision['articles'], [Article('158', None, None), Article('161', 2, 'г')])
+        self.assertEqual(decision['term_months'], 48)
+
+    def test_text_without_articles(self):
+        decision = parse_court_decision('текст без статей')
+        self.assertEqual(decision['articles'], [])
+        self.assertIsNone(decision['court_key'])
+        self.assertIsNone(decision['punishment'])
+
+    def test_empty(self):
+        self.assertIsNone(parse_court_decision(''))
+        self.assertIsNone(parse_court_decision('   '))
+        self.assertIsNone(parse_court_decision(None))
+
+
+class ParseArticlesTest(unittest.TestCase):
+    """Перечень статей УК"""
+
+    def test_comma_separates_articles(self):
+        """Часть после запятой относится к следующей статье"""
+        self.assertEqual(parse_articles('п. «г» ч. 3 ст. 158, ч. 2 ст. 159'),
+                         [Article('158', 3, 'г'), Article('159', 2, None)])
+
+    def test_spaced_article_number_and_quoted_points(self):
+        self.assertEqual(parse_articles('ст. 264. 1, 158 ч. 2 «а,в»'),
+                         [Article('264.1', None, None), Article('158', 2, 'а,в')])
+
+
+class ParseTermTest(unittest.TestCase):
+    def test_terms(self):
+        self.assertEqual(parse_term('3 г. 6 мес.'), 42)
+        self.assertEqual(parse_term('11 месяцам'), 11)
+        self.assertEqual(parse_term('5лет'), 60)
+        self.assertIsNone(parse_term('штраф'))
+
+
+class CourtKeyTest(unittest.TestCase):
+    """Ключ суда: именительный падеж, сокращения и мировые судьи"""
+
+    def test_keys(self):
+        cases = {
+            'Калининским районным судом': 'калининский р/с',
+            'Калининск. р/с': 'калининский р/с',
+            'КРС': 'калининский р/с',
+            'Невского гор. суда': 'невский г/с',
+            'Петроградский районный суд города': 'петроградский р/с',
+            'Мировым судьей судебного участка № 160': 'мссу № 160',
+            'МССУ': 'мссу',
+        }
+        for court_name, key in cases.items():
+            self.assertEqual(court_key(court_name), key, court_name)
+
+    def test_unknown_court(self):
+        self.assertIsNone(court_key('Смольнинским'))
+        self.assertIsNone(court_key(''))
+
+
+if __name__ == '__main__':
+    unittest.main()
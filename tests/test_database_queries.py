@@ -0,0 +1,215 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_manager import DatabaseManager
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Временная база данных для проверки запросов"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(os.path.join(self.directory.name, 'convicts.db'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def add(self, full_name, **data):
+        """Добавляет осужденного и возвращает его id"""
+        return self.db.add_convict(dict(data, full_name=full_name))
+
+    def query(self, sql, parameters=()):
+        """Выполняет запрос к базе напрямую"""
+        conn = sqlite3.connect(self.db.db_path)
+        try:
+            return conn.execute(sql, parameters).fetchall()
+        finally:
+            conn.close()
+
+    def execute(self, sql, parameters=()):
+        """Изменяет базу в обход DatabaseManager"""
+        conn = sqlite3.connect(self.db.db_path)
+        try:
+            conn.execute(sql, parameters)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def progress(self, name):
+        """Последний id, просмотренный проходом разбора"""
+        return self.query('SELECT last_id FROM parse_progress WHERE name = ?', (name,))[0][0]
+
+
+class SimilarNamesTest(DatabaseTestCase):
+    """Нечеткий поиск по ФИО"""
+
+    def test_surname_tier(self):
+        first = self.add('Славин Иван Петрович')
+        self.add('Петров Иван Петрович')
+        result = self.db.find_similar_names('Славен Иван Петрович', limit=1)
+        self.assertEqual([item[0] for item in result], [first])
+
+    def test_word_tier_needs_two_matching_words(self):
+        """Если фамилия не нашлась, кандидаты - записи хотя бы с двумя совпавшими словами"""
+        expected = self.add('Кузнецов Сергей Николаевич')
+        self.add('Орлов Сергей Андреевич')
+        self.add('Михайлов Никита Николаевич')
+        result = self.db.find_similar_names('Шмыргль Сергей Николаевич')
+        self.assertEqual([item[0] for item in result], [expected])
+
+    def test_word_tier_single_word_query(self):
+        expected = self.add('Кузнецов Сергей Николаевич')
+        result = self.db.find_similar_names('Николаевич')
+        self.assertEqual([item[0] for item in result], [expected])
+
+    def test_find_possible_duplicates(self):
+        """Сравниваются только записи с одинаковыми фамилией и инициалом имени"""
+        first = self.add('Иванов Иван Иванович')
+        second = self.add('Иванов Иван Иванович')
+        joined = self.add('ИвановИван Иванович')
+        self.add('Иванов Игорь Петрович')
+        self.add('Петров Петр')
+        self.add('Петров Иван')
+
+        pairs = [(item[0], item[2]) for item in self.db.find_possible_duplicates()]
+        self.assertEqual(pairs, [(first, second), (first, joined), (second, joined)])
+
+        # Даже без порога сходства записи с разными ключами в пары не попадают
+        self.assertEqual(len(self.db.find_possible_duplicates(min_similarity=0.0)), 6)
+
+
+class CourtDecisionQueriesTest(DatabaseTestCase):
+    """Поиск по разобранным приговорам (court_decisions, court_articles)"""
+
+    def setUp(self):
+        super().setUp()
+        self.first = self.add('Иванов Иван', court_info='12.03.2020 Калининским р/с по ст. 158 ч. 3 п. «г» УК РФ к 3 г. л/св')
+        self.second = self.add('Петров Петр', court_info='05.06.2021 КРС по ст. 158 ч. 1, 228.1 ч. 2 УК РФ к штрафу')
+        self.third = self.add('Сидоров Сидор', court_info='01.02.2022 Невским р/с по ст. 228 ч. 1 УК РФ к 1 г. ИР')
+        self.add('Кузнецов Кузьма', court_info='текст без статей')
+
+    def test_find_by_article(self):
+        self.assertEqual([row[0] for row in self.db.find_by_article('158')], [self.first, self.second])
+        self.assertEqual(self.db.find_by_article('158', part=3),
+                         [(self.first, 'Иванов Иван', '2020-03-12', 'Калининским р/с', 3, 'г')])
+        self.assertEqual([row[0] for row in self.db.find_by_article('228. 1')], [self.second])
+        self.assertEqual([row[0] for row in self.db.find_by_article('228')], [self.third])
+        self.assertEqual(self.db.find_by_article('159'), [])
+
+    def test_find_court_decisions(self):
+        """Суд ищется в любом написании, год - по диапазону дат"""
+        by_court = self.db.find_court_decisions(court='Калининский районный суд')
+        self.assertEqual([row[0] for row in by_court], [self.first, self.second])
+        self.assertEqual(self.db.find_court_decisions(court='КРС', year=2021),
+                         [(self.second, 'Петров Петр', '2021-06-05', 'КРС', 'штраф', None)])
+        self.assertEqual([row[0] for row in self.db.find_court_decisions(year=2022)], [self.third])
+        self.assertEqual(len(self.db.find_court_decisions()), 4)
+        self.assertEqual(self.db.find_court_decisions(court='неизвестный суд'), [])
+
+
+class RestrictionQueriesTest(DatabaseTestCase):
+    """Поиск по разобранным обязанностям (convict_restrictions)"""
+
+    def test_find_by_restriction(self):
+        first = self.add('Иванов Иван', restrictions='Не уходить из дома с 22 до 06; являться на регистрацию')
+        second = self.add('Петров Петр', restrictions='Не выезжать за пределы СПб; не уходить из дома ночью')
+        self.add('Сидоров Сидор', restrictions='без обязанностей')
+
+        self.assertEqual([row[0] for row in self.db.find_by_restriction('curfew')], [first, second])
+        self.assertEqual(self.db.find_by_restriction('travel'),
+                         [(second, 'Петров Петр', 'Не выезжать за пределы СПб; не уходить из дома ночью')])
+        self.assertEqual(self.db.find_by_restriction('internet'), [])
+        self.assertEqual(self.db.find_by_restriction('unknown'), [])
+
+        counts = {code: count for _, code, _, count in self.db.get_restriction_types()}
+        self.assertEqual(counts['curfew'], 2)
+        self.assertEqual(counts['registration'], 1)
+        self.assertEqual(counts['damages'], 0)
+
+
+class AddressQueriesTest(DatabaseTestCase):
+    """Поиск по адресам (addresses, streets)"""
+
+    def setUp(self):
+        super().setUp()
+        self.first = self.add('Иванов Иван', address='ул. Бутлерова 11-2-45')
+        self.second = self.add('Петров Петр', address='бутлерова 11-2-45')
+        self.third = self.add('Сидоров Сидор', address='ул. Бутлерова 9-12')
+        self.fourth = self.add('Кузнецов Кузьма', address='ул. Неизвестная 5-1')
+
+    def test_same_address_stored_once(self):
+        self.assertEqual(self.query('SELECT COUNT(*) FROM addresses'), [(3,)])
+
+    def test_find_by_address(self):
+        """Адрес ищется в любом написании, тип улицы необязателен"""
+        self.assertEqual([row[0] for row in self.db.find_by_address('Бутлерова 11-2-45')], [self.first, self.second])
+        self.assertEqual(self.db.find_by_address('ул. неизвестная 5-1'),
+                         [(self.fourth, 'Кузнецов Кузьма', 'ул. Неизвестная 5-1')])
+        self.assertEqual(self.db.find_by_address('ул. Бутлерова 11-2-46'), [])
+        self.assertEqual(self.db.find_by_address(''), [])
+
+    def test_find_by_street(self):
+        """Результаты упорядочены по дому, корпусу и квартире"""
+        rows = self.db.find_by_street('БУТЛЕРОВА')
+        self.assertEqual([row[0] for row in rows], [self.first, self.second, self.third])
+        self.assertEqual(rows[2], (self.third, 'Сидоров Сидор', 'ул. Бутлерова 9-12', '9', None, '12'))
+        self.assertEqual([row[0] for row in self.db.find_by_street('Бутлерова', house=9)], [self.third])
+        self.assertEqual(self.db.find_by_street('Неизвестная'), [])
+        self.assertEqual(self.db.find_by_street('Науки'), [])
+
+
+class ParseProgressTest(DatabaseTestCase):
+    """Отметки проходов разбора в parse_progress"""
+
+    def test_name_keys_progress(self):
+        """ФИО без ключей (только знаки) не просматривается повторно"""
+        self.add('--')
+        last = self.add('Иванов Иван Иванович')
+        self.assertEqual(self.progress('name_keys'), last)
+        self.assertEqual(self.query('SELECT DISTINCT convict_id FROM name_keys'), [(last,)])
+
+    def test_backfill_runs_once(self):
+        """Открытие базы не запускает проходы разбора повторно"""
+        self.execute("INSERT INTO convicts (full_name, address) VALUES ('Иванов Иван', 'ул. Бутлерова д. 11 кв. 45')")
+        DatabaseManager(self.db.db_path)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM name_keys'), [(0,)])
+
+        # Записи, добавленные в обход DatabaseManager, разбираются при следующем добавлении
+        self.add('Петров Петр')
+        self.assertEqual(self.query('SELECT COUNT(DISTINCT convict_id) FROM name_keys'), [(2,)])
+        self.assertEqual(self.query('SELECT COUNT(*) FROM convicts WHERE address_id IS NOT NULL'), [(1,)])
+
+    def test_backfill_for_new_pass(self):
+        """Проход, которого не было в базе, один раз разбирает уже импортированные записи"""
+        convict_id = self.add('Иванов Иван', address='ул. Бутлерова д. 11 кв. 45', phone='8 (921) 123-45-67')
+        self.execute('UPDATE convicts SET address_id = NULL, phone_number = NULL')
+        self.execute("DELETE FROM parse_progress WHERE name IN ('addresses', 'phone_numbers')")
+
+        DatabaseManager(self.db.db_path)
+        self.assertEqual(self.query('SELECT address_id IS NOT NULL, phone_number FROM convicts'), [(1, 79211234567)])
+        self.assertEqual(self.progress('addresses'), convict_id)
+        self.assertEqual(self.progress('phone_numbers'), convict_id)
+
+    def test_import_marks_phone_numbers(self):
+        """Телефон вычисляется при вставке, поэтому отметка прохода сдвигается вместе с ней"""
+        workbook = openpyxl.Workbook()
+        for full_name, phone in (('Иванов Иван', '89211234567'), ('Петров Петр', 'нет')):
+            row = [None] * 16
+            row[13], row[15] = full_name, phone
+            workbook.active.append(row)
+
+        self.assertEqual(self.db.import_workbook(workbook, batch_size=1), 2)
+        last_id = self.query('SELECT MAX(id) FROM convicts')[0][0]
+        self.assertEqual(self.progress('phone_numbers'), last_id)
+        self.assertEqual(self.query('SELECT phone_number FROM convicts ORDER BY id'), [(79211234567,), (None,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
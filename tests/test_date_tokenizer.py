@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from column_i_formatter import ColumnIFormatter
+from date_tokenizer import DATE_TOKENIZER, STRICT_DATE_TOKENIZER, unique_dates
+from docx_to_excel_processor import DocxToExcelProcessor
+from golden_corpus import _SingleRowSheet
+
+
+class DateTokenizerTest(unittest.TestCase):
+    """Порядок и форматы дат - как в построчных шаблонах до общего сканера"""
+
+    def test_dates_in_format_priority_order(self):
+        """ДД.ММ.ГГГГ находится раньше ДДММ.ГГ, даже если стоит в тексте позже"""
+        dates = unique_dates(DATE_TOKENIZER.iter_dates('1505.23 14.06.2023'))
+        self.assertEqual([token.text for token in dates], ['14.06.2023', '1505.23'])
+        self.assertEqual(STRICT_DATE_TOKENIZER.first_date('1505.23 14.06.2023').text, '14.06.2023')
+
+    def test_earliest_date_in_text_order(self):
+        self.assertEqual(DATE_TOKENIZER.earliest_date('1505.23 14.06.2023').text, '1505.23')
+
+    def test_strict_formats_reject_spaces_around_slash(self):
+        self.assertIsNone(STRICT_DATE_TOKENIZER.match_start('12 /08/1978'))
+        self.assertEqual(DATE_TOKENIZER.first_date('12 /08/1978').text, '12 /08/1978')
+
+    def test_parse_ignores_spaces(self):
+        token = DATE_TOKENIZER.parse('13. 05. 2024')
+        self.assertEqual((token.day, token.month, token.year), ('13', '05', '2024'))
+        self.assertIsNone(DATE_TOKENIZER.parse('13.05.2024 г.'))
+
+
+class ProcessorDatesTest(unittest.TestCase):
+    """Правила процессора, зависящие от порядка дат"""
+
+    def setUp(self):
+        self.processor = DocxToExcelProcessor()
+        self.row = _SingleRowSheet()
+
+    def test_is_date(self):
+        self.assertTrue(self.processor._is_date('12.08.1978'))
+        self.assertTrue(self.processor._is_date('12. 08. 1978 г.р.'))
+        self.assertFalse(self.processor._is_date('12 /08/1978'))
+
+    def test_end_dates_keep_second_date_by_priority(self):
+        sheet = self.row.load({6: '1505.23 14.06.2023'})
+        self.processor._process_end_dates(sheet, 6, 8)
+        self.assertEqual(self.row.value(6), '15.05.2023')
+
+    def test_birth_date_prefers_dotted_date(self):
+        sheet = self.row.load({3: '1505.23 14.06.2023'})
+        self.processor._normalize_birth_dates(sheet, 3)
+        self.assertEqual(self.row.value(3), '14.06.2023')
+
+    def test_court_info_dates(self):
+        sheet = self.row.load({9: 'приговор 1.2.23, постановление 05/03/2024'})
+        self.assertEqual(self.processor._normalize_dates_in_court_info(sheet, 9), 2)
+        self.assertEqual(self.row.value(9), 'приговор 01.02.2023, постановление 05.03.2024')
+
+
+class ColumnIDatesTest(unittest.TestCase):
+    """Даты в столбце I: пробелы допускаются только между частями ДД ММ ГГГГ"""
+
+    def test_spaced_dot_date_is_not_changed(self):
+        self.assertEqual(ColumnIFormatter()._normalize_dates('19.08. 22'), '19.08. 22')
+
+    def test_formats(self):
+        formatter = ColumnIFormatter()
+        self.assertEqual(formatter._normalize_dates('1.2.23 и 5/3/1999'), '01.02.2023 и 05.03.1999')
+        self.assertEqual(formatter._normalize_dates('19 08 22'), '19.08.2022')
+
+
+if __name__ == '__main__':
+    unittest.main()
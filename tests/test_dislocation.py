@@ -0,0 +1,114 @@
+import os
+import sys
+import unittest
+
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dislocation import BIRTH_DATE_COLUMN, DISLOCATION_COLUMN, NAME_COLUMN, DislocationIndex
+
+HEADER = ['№', 'ФИО', 'Дата рождения', 'Отдел', 'Участок']
+
+
+def register(*people):
+    """Реестр после обработки: ФИО в столбце N, дата рождения в столбце C"""
+    workbook = openpyxl.Workbook()
+    for name, birth_date in people:
+        row = [None] * NAME_COLUMN
+        row[BIRTH_DATE_COLUMN - 1], row[NAME_COLUMN - 1] = birth_date, name
+        workbook.active.append(row)
+    return workbook
+
+
+def dislocation(workbook, row):
+    return workbook.active.cell(row=row, column=DISLOCATION_COLUMN).value
+
+
+class DislocationKeyTest(unittest.TestCase):
+    """Ключ индекса: нормализованное ФИО и дата рождения ДД.ММ.ГГГГ"""
+
+    def setUp(self):
+        self.index = DislocationIndex()
+
+    def test_normalization(self):
+        self.assertEqual(self.index.key('Иванов  Иван Иванович.', '1.2.1990'), ('иванов иван иванович', '01.02.1990'))
+        self.assertEqual(self.index.key('Ёлкин', '01.02.90'), ('елкин', '01.02.1990'))
+
+    def test_missing_parts(self):
+        self.assertIsNone(self.index.key('', '01.02.1990'))
+        self.assertIsNone(self.index.key('Иванов', 'нет'))
+        self.assertIsNone(self.index.key('Иванов', None))
+
+
+class DislocationTableTest(unittest.TestCase):
+    """Разбор таблиц дислокации"""
+
+    def setUp(self):
+        self.index = DislocationIndex()
+
+    def test_header_and_continuation_tables(self):
+        """Строки до заголовка пропускаются, таблица без заголовка берет раскладку предыдущей"""
+        self.index.add_table([['Список'], HEADER, ['1', 'Иванов Иван', '01.02.1990', 'ОП-1', 'уч. 5']])
+        self.index.add_table([['2', 'Петров Петр', '03.04.1985', 'ОП-2', ''], ['3', 'Без даты', '', 'ОП-3', '']])
+
+        self.assertEqual(self.index.lookup('Иванов Иван', '01.02.1990'), ['ОП-1; уч. 5'])
+        self.assertEqual(self.index.lookup('ПЕТРОВ ПЁТР', '3.4.1985'), ['ОП-2'])
+        self.assertEqual(self.index.lookup('Без даты', ''), [])
+        self.assertEqual((self.index.rows_indexed, self.index.rows_skipped), (2, 3))
+
+    def test_table_before_any_header_is_skipped(self):
+        self.index.add_table([['1', 'Иванов Иван', '01.02.1990', 'ОП-1', '']])
+        self.assertEqual((self.index.rows_indexed, self.index.rows_skipped), (0, 1))
+
+    def test_header_columns_in_other_order(self):
+        self.index.add_table([['Дата рожд.', 'Отдел', 'Ф.И.О.'], ['01.02.1990', 'ОП-1', 'Иванов Иван']])
+        self.assertEqual(self.index.lookup('Иванов Иван', '01.02.1990'), ['ОП-1'])
+
+
+class MergeIntoWorkbookTest(unittest.TestCase):
+    """Объединение реестра с дислокацией и отчет"""
+
+    def setUp(self):
+        self.index = DislocationIndex()
+        self.index.add_table([
+            HEADER,
+            ['1', 'Иванов Иван Иванович', '01.02.1990', 'ОП-1', 'уч. 5'],
+            ['2', 'Петров Петр', '03.04.1985', 'ОП-2', ''],
+            ['3', 'Кузнецов Кузьма', '07.08.1980', 'ОП-5', ''],
+            ['4', 'Кузнецов Кузьма', '07.08.1980', 'ОП-6', ''],
+            ['5', 'Орлов Олег', '09.10.1970', 'ОП-7', ''],
+            ['6', 'Орлов Олег', '09.10.1970', 'ОП-7', ''],
+            ['7', 'Сидоров Сидор', '05.06.1975', 'ОП-3', ''],
+        ])
+
+    def test_report(self):
+        workbook = register(
+            ('ИВАНОВ ИВАН ИВАНОВИЧ', '1.2.90'),
+            ('Петров Петр Петрович', '03.04.1985'),
+            ('Кузнецов Кузьма', '07.08.1980'),
+            ('Орлов Олег', '09.10.1970'),
+            ('Никто', '01.01.2000'),
+            ('Петров Петр Петрович', '04.04.1985'),
+        )
+        report = self.index.merge_into_workbook(workbook)
+
+        self.assertEqual(report['matched'], 3)
+        self.assertEqual(dislocation(workbook, 1), 'ОП-1; уч. 5')
+
+        # Близкое ФИО с той же датой рождения
+        self.assertEqual(report['fuzzy'], [('Sheet', 2, 'Петров Петр Петрович', '03.04.1985', 'петров петр')])
+        self.assertEqual(dislocation(workbook, 2), 'ОП-2')
+
+        # Разные записи дислокации - неоднозначно, повторы одной записи - нет
+        self.assertEqual(report['ambiguous'], [('Sheet', 3, 'Кузнецов Кузьма', '07.08.1980', 'ОП-5 | ОП-6')])
+        self.assertIsNone(dislocation(workbook, 3))
+        self.assertEqual(dislocation(workbook, 4), 'ОП-7')
+
+        # Нечеткое сравнение только среди записей с той же датой рождения
+        self.assertEqual([record[1] for record in report['unmatched']], [5, 6])
+        self.assertEqual(report['unused'], [('сидоров сидор', '05.06.1975', 'ОП-3')])
+
+
+if __name__ == '__main__':
+    unittest.main()
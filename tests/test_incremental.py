@@ -0,0 +1,126 @@
+import ast
+import os
+import sys
+import tempfile
+import unittest
+import warnings
+
+from docx import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark
+from docx_to_database import process_document, process_document_incremental
+from docx_to_excel_processor import DocxToExcelProcessor
+from parse_cache import PIPELINE_MODULES, ParseCache, workbook_model
+from pipeline_metrics import PipelineMetrics
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули проекта, которые не влияют на сохраняемую в кэше книгу: метрики, профилирование,
+# запись в базу и сверка с дислокацией (выполняется после кэша)
+OUTPUT_NEUTRAL_MODULES = {'pipeline_metrics', 'profiling', 'database_manager', 'dislocation'}
+
+HEADER = ['№', 'Дата постановки', 'Отметка', 'ФИО, дата рождения', 'Адрес, телефон']
+ROWS = [
+    ['01.02.2020', 'а', 'Иванов Иван Иванович 01.01.1990 г.р.', 'ул. Бутлерова д. 11 кв. 45 89211234567'],
+    ['15.03.2021', 'б', 'Петров Петр Петрович 02.02.1985 г.р.', 'пр. Науки д. 30 кв. 85'],
+    ['20.04.2022', 'в', 'Сидоров Сидор Сидорович 03.03.1975 г.р.', 'тел. 8 (921) 765-43-21'],
+]
+
+
+def write_docx(path, rows, header=HEADER):
+    """Сохраняет таблицу реестра (заголовок и строки) в DOCX файл"""
+    document = Document()
+    table = document.add_table(rows=0, cols=len(header))
+    for values in [header] + rows:
+        cells = table.add_row().cells
+        for cell, value in zip(cells, values):
+            cell.text = value
+    document.save(path)
+
+
+class IncrementalProcessingTest(unittest.TestCase):
+    """Повторное использование обработанных строк между версиями документа"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.directory.name, 'cache.db'))
+        self.processor = DocxToExcelProcessor()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def process(self, rows, name, header=HEADER):
+        path = os.path.join(self.directory.name, name)
+        write_docx(path, rows, header)
+        workbook, _, _, reuse = process_document_incremental(path, self.processor, self.cache, PipelineMetrics())
+        return [model['rows'] for model in workbook_model(workbook)], reuse
+
+    def process_full(self, name):
+        workbook, _, _ = process_document(os.path.join(self.directory.name, name), self.processor, PipelineMetrics())
+        return [model['rows'] for model in workbook_model(workbook)]
+
+    def test_renumbered_rows_are_reused(self):
+        """Строки с другим номером по порядку (A) и отметкой (C) берутся из кэша"""
+        first, reuse = self.process([[str(number)] + row for number, row in enumerate(ROWS, 1)], 'first.docx')
+        self.assertEqual(reuse['rows_processed'], len(ROWS))
+
+        # Новая строка в начале сдвигает нумерацию остальных, отметки в столбце C изменены
+        rows = [['1', '05.05.2023', 'г', 'Кузнецов Кузьма Кузьмич 04.04.1995 г.р.', '']]
+        rows += [[str(number), row[0], 'новая', row[2], row[3]] for number, row in enumerate(ROWS, 2)]
+        second, reuse = self.process(rows, 'second.docx')
+
+        self.assertEqual(reuse['rows_total'], len(ROWS) + 1)
+        self.assertEqual(reuse['rows_reused'], len(ROWS))
+        self.assertEqual(reuse['rows_processed'], 1)
+        self.assertEqual(second[0][1:], first[0])
+
+    def test_matches_full_processing(self):
+        """
+        Правила обработки читают и меняют только ячейки своей строки, поэтому новые
+        строки обрабатываются отдельно от соседних. Результат инкрементальной обработки
+        измененного документа должен совпадать с полной обработкой этого документа
+        """
+        generator = benchmark.SyntheticRegisterGenerator(seed=5)
+        rows = generator.generate_rows(60)
+        self.process(rows, 'first.docx', benchmark.HEADER)
+
+        # Вставка, удаление, изменение, перестановка и повтор строк
+        changed = rows[:10] + generator.generate_rows(5) + rows[15:40] + rows[45:]
+        changed[20] = list(changed[20])
+        changed[20][3] += ' тел. 89110000000'
+        changed[30] = list(changed[30])
+        changed[30][5] = changed[31][5]
+        changed[40], changed[41] = changed[41], changed[40]
+        changed.append(rows[0])
+
+        incremental, reuse = self.process(changed, 'second.docx', benchmark.HEADER)
+        self.assertGreater(reuse['rows_reused'], 0)
+        self.assertGreater(reuse['rows_processed'], 0)
+        self.assertEqual(incremental, self.process_full('second.docx'))
+
+
+class PipelineModulesTest(unittest.TestCase):
+    """Версия кэша учитывает все модули проекта, от которых зависит результат"""
+
+    def test_imported_project_modules_are_listed(self):
+        project_modules = {name[:-3] for name in os.listdir(BASE_DIR) if name.endswith('.py')}
+        for module in PIPELINE_MODULES:
+            # Старые шаблоны без r-префикса дают DeprecationWarning при разборе
+            with open(os.path.join(BASE_DIR, f"{module}.py"), encoding='utf-8') as source, \
+                    warnings.catch_warnings():
+                warnings.simplefilter('ignore', DeprecationWarning)
+                tree = ast.parse(source.read())
+            imported = set()
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    imported.update(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module:
+                    imported.add(node.module)
+            missing = (imported & project_modules) - set(PIPELINE_MODULES) - OUTPUT_NEUTRAL_MODULES
+            self.assertEqual(missing, set(), module)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KEYWORD_MATCHER
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    """Категория ячейки: информация о суде важнее обязанностей"""
+
+    def test_court_info(self):
+        self.assertEqual(KEYWORD_MATCHER.classify('Осужден 12.03.2020 Невским р/с'), 'court')
+        self.assertEqual(KEYWORD_MATCHER.classify('приговор по ст. 158 ч. 2'), 'court')
+
+    def test_duties(self):
+        self.assertEqual(KEYWORD_MATCHER.classify('Не уходить из дома с 22 до 06'), 'duties')
+
+    def test_court_keyword_after_duties_keyword(self):
+        """Признак суда после ключевого слова обязанностей находится вторым поиском"""
+        self.assertEqual(KEYWORD_MATCHER.classify('не менять место жительства, осужденный'), 'court')
+
+    def test_case_insensitive(self):
+        self.assertEqual(KEYWORD_MATCHER.classify('ук рф'), 'court')
+        self.assertEqual(KEYWORD_MATCHER.classify('ПРЕДЕЛЫ района'), 'duties')
+
+    def test_no_keywords(self):
+        self.assertIsNone(KEYWORD_MATCHER.classify('Иванов Иван Иванович'))
+        self.assertIsNone(KEYWORD_MATCHER.classify(''))
+        self.assertIsNone(KEYWORD_MATCHER.classify(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
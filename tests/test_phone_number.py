@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phone_number import normalize_phone, phone_prefix_range
+
+
+class NormalizePhoneTest(unittest.TestCase):
+    """Приведение телефона к формату E.164"""
+
+    def test_country_code_forms(self):
+        for text in ("89211234567", "+7 (921) 123-45-67", "9211234567"):
+            self.assertEqual(normalize_phone(text), 79211234567)
+
+    def test_not_a_phone(self):
+        for text in (None, "", "нет", "12345", "123456789012"):
+            self.assertIsNone(normalize_phone(text))
+
+
+class PhonePrefixRangeTest(unittest.TestCase):
+    """Диапазон номеров для поиска по началу номера"""
+
+    def test_explicit_country_code_is_dropped(self):
+        expected = (79210000000, 79219999999)
+        for prefix in ("+7 921", "+7921", "8 921", "8(921)", "7-921", "921"):
+            self.assertEqual(phone_prefix_range(prefix), expected, prefix)
+
+    def test_joined_leading_digit_is_part_of_number(self):
+        """Слитные "812" и "8921" - начало номера, а не код страны"""
+        self.assertEqual(phone_prefix_range("812"), (78120000000, 78129999999))
+        self.assertEqual(phone_prefix_range("8921"), (78921000000, 78921999999))
+
+    def test_full_number(self):
+        self.assertEqual(phone_prefix_range("89211234567"), (79211234567, 79211234567))
+        self.assertEqual(phone_prefix_range("79211234567"), (79211234567, 79211234567))
+
+    def test_invalid_prefix(self):
+        self.assertIsNone(phone_prefix_range(""))
+        self.assertIsNone(phone_prefix_range("тел."))
+        self.assertIsNone(phone_prefix_range("92112345678"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from restriction_parser import RESTRICTION_TYPES, parse_restrictions
+
+
+class ParseRestrictionsTest(unittest.TestCase):
+    """Виды обязанностей в тексте столбца L"""
+
+    def test_several_types_in_one_clause(self):
+        text = 'Не менять место жительства и работы без уведомления УИИ; являться на регистрацию 1 раз в месяц'
+        self.assertEqual(parse_restrictions(text), ['residence', 'work', 'registration'])
+
+    def test_abbreviations(self):
+        self.assertEqual(parse_restrictions('рег. 2 р/мес; не уходить из дома с 22 до 06'), ['registration', 'curfew'])
+        self.assertEqual(parse_restrictions('с 23.00 до 6.00'), ['curfew'])
+
+    def test_clauses_are_checked_separately(self):
+        """"менять" и "жительства" в разных пунктах не дают обязанности residence"""
+        self.assertEqual(parse_restrictions('Не менять работу; место жительства'), ['work'])
+
+    def test_result_in_type_order(self):
+        text = 'возместить ущерб; запрет общения; не пользоваться интернетом; средства связи'
+        self.assertEqual(parse_restrictions(text), ['contact', 'internet', 'communication', 'damages'])
+        self.assertEqual(parse_restrictions('не выезжать за пределы СПб; трудоустроиться'), ['employment', 'travel'])
+        self.assertEqual(parse_restrictions('пройти курс лечения у нарколога; не посещать бары, кафе'),
+                         ['treatment', 'public_places'])
+
+    def test_empty(self):
+        self.assertEqual(parse_restrictions(''), [])
+        self.assertEqual(parse_restrictions(None), [])
+        self.assertEqual(parse_restrictions('без обязанностей'), [])
+
+    def test_unique_codes(self):
+        codes = [code for code, _, _ in RESTRICTION_TYPES]
+        self.assertEqual(len(codes), len(set(codes)))
+
+
+if __name__ == '__main__':
+    unittest.main()